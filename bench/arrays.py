@@ -0,0 +1,105 @@
+"""Array benchmark: per-element loops against vectorized array expressions.
+
+Runs the same pixel-style transform (scale, offset, threshold) over N
+values two ways, as a `循环` that reads and writes one element per
+iteration and as a single array expression, on each engine and on both
+array backends (NumPy and the array.array fallback). Times are per pass over
+the data and exclude building the input array, which is measured separately
+and subtracted; the vectorized form runs --passes times to rise above noise.
+
+    python bench/arrays.py [--size 100000] [--passes 50] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+import nl_array
+from lexer import Lexer
+from parser import Parser
+from py_executor import PyExecutor
+from suite import silenced
+
+try:
+    import novolang_core
+except ImportError:
+    novolang_core = None
+
+
+def programs(size, passes):
+    data = '[' + ', '.join(str(i % 256) for i in range(size)) + ']'
+    loop = f"""定义 a = {data}
+定义 out = a * 0
+循环 (i = 0; i < 长度(a); i = i + 1) {{
+    out[i] = (a[i] * 3 + 7 > 384) * 255
+}}
+打印 out[{size - 1}]
+"""
+    vectorized = f"""定义 a = {data}
+定义 out = a
+循环 (k = 0; k < {passes}; k = k + 1) {{
+    out = (a * 3 + 7 > 384) * 255
+}}
+打印 out[{size - 1}]
+"""
+    setup = f"""定义 a = {data}
+打印 a[{size - 1}]
+"""
+    return {name: Parser(Lexer(code).tokenize()).parse()
+            for name, code in (('setup', setup), ('element loop', loop), ('vectorized', vectorized))}
+
+
+def time_run(make_executor, ast, repeat=1):
+    best = None
+    with silenced():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            make_executor().execute(ast)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def use_numpy(enabled):
+    if enabled:
+        os.environ.pop('NOVOLANG_NO_NUMPY', None)
+    else:
+        os.environ['NOVOLANG_NO_NUMPY'] = '1'
+    nl_array.numpy.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=100000, help="number of array elements")
+    parser.add_argument('--passes', type=int, default=50, help="passes of the vectorized transform")
+    parser.add_argument('--repeat', type=int, default=3, help="best-of runs for setup and vectorized programs")
+    args = parser.parse_args()
+
+    asts = programs(args.size, args.passes)
+    engines = [('python', PyExecutor)]
+    if novolang_core:
+        engines.append(('c++', novolang_core.ASTExecutor))
+    backends = [('array.array', False)]
+    if nl_array.numpy() is not None:
+        backends.insert(0, ('numpy', True))
+
+    print(f"{args.size} elements")
+    print(f"{'engine':<8} {'backend':<12} {'element loop ms':>16} {'vectorized ms':>14} {'speedup':>8}")
+    for backend, enabled in backends:
+        use_numpy(enabled)
+        for name, make_executor in engines:
+            setup = time_run(make_executor, asts['setup'], args.repeat)
+            loop = time_run(make_executor, asts['element loop']) - setup
+            vectorized = max(time_run(make_executor, asts['vectorized'], args.repeat) - setup, 1e-6) / args.passes
+            print(f"{name:<8} {backend:<12} {loop * 1000:>16.1f} {vectorized * 1000:>14.2f} "
+                  f"{loop / vectorized:>7.1f}x")
+    use_numpy(True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""Stand-ins for automation modules, so AutoAPI dispatch can be benchmarked headless."""
+
+calls = 0
+
+
+def noop(*args):
+    global calls
+    calls += 1
+    return None
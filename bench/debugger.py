@@ -0,0 +1,170 @@
+"""Debugger benchmark: what the hooks cost when no debugger is attached.
+
+On each available engine, times (best of --repeat) a loop-heavy script
+run by a plain executor, by an executor whose debug hook was set and then
+cleared (novolang_core) or by DebuggingExecutor without a hook (Python),
+and under a debugger Session that only watches a breakpoint it never
+reaches. Then drives a scripted session
+(breakpoint, step into, step over, step out) and checks where it stops and
+what it sees. Exits with status 1 if a cleared hook leaves the executor
+more than --tolerance slower than a plain one, or if a session stops in the
+wrong place or shows wrong variables.
+
+    python bench/debugger.py [--n 5000] [--repeat 15] [--tolerance 0.15]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+from debugger import DebuggingExecutor, Session
+from lexer import tokenize
+from parser import Parser
+from py_executor import PyExecutor
+
+try:
+    import novolang_core
+except ImportError:
+    novolang_core = None
+
+LOOP = '''定义 total = 0
+定义 square(x) {
+    返回 x * x
+}
+循环 (i = 0; i < {n}; i = i + 1) {
+    如果 (i < {n} / 2) {
+        total = total + square(3)
+    } 否则 {
+        total = total - 1
+    }
+}
+打印 total
+'''
+
+SESSION = '''定义 total = 0
+定义 add(a, b) {
+    定义 s = a + b
+    返回 s
+}
+循环 (i = 0; i < 3; i = i + 1) {
+    total = add(total, i)
+    打印 total
+}
+打印 "done " + total
+'''
+
+# (expected stop: line, function, a variable and its value; command given there)
+SCRIPT = [((7, None, ('i', 0)), 'step'),          # breakpoint on line 7
+          ((3, 'add', ('a', 0)), 'next'),         # stepped into add()
+          ((4, 'add', ('s', 0)), 'out'),
+          ((8, None, ('total', 0)), 'continue'),  # out of add(): the print after the call
+          ((7, None, ('i', 1)), 'continue'),      # the breakpoint again, next iteration
+          ((7, None, ('i', 2)), 'continue')]
+
+
+def parse(source):
+    return Parser(tokenize(source)).parse()
+
+
+def run(configs, ast, repeat):
+    """Best time and output of each (make, attach) config, interleaving the repeats so drift hits all alike."""
+    best = [None] * len(configs)
+    outputs = [None] * len(configs)
+    for _ in range(repeat):
+        for index, (make, attach) in enumerate(configs):
+            executor = make()
+            executor.output = io.StringIO()
+            if attach:
+                attach(executor)
+            start = time.perf_counter()
+            executor.execute(ast)
+            elapsed = time.perf_counter() - start
+            best[index] = elapsed if best[index] is None else min(best[index], elapsed)
+            outputs[index] = executor.output.getvalue()
+    return list(zip(best, outputs))
+
+
+def watch(executor):
+    # Tracing cost: a hook on every statement, a breakpoint never reached
+    Session(executor, lambda session, pause: 'quit', breakpoints=[10 ** 6])
+
+
+def tree_walker(executor):
+    executor.tier_up = 0
+
+
+def set_and_clear(executor):
+    executor.debug_hook = lambda stmt, depth: None
+    executor.debug_hook = None
+
+
+def session_stops(make):
+    """(line, function, shown value) at each stop of SCRIPT, and the output."""
+    stops = []
+    answers = iter(SCRIPT)
+
+    def front_end(session, pause):
+        (_, _, (name, _)), command = next(answers)
+        value = next((variables[name] for _, variables in pause.scopes if name in variables), None)
+        stops.append((pause.line, pause.stack[-1][0] if pause.stack else None, (name, value)))
+        return command
+    executor = make()
+    executor.output = io.StringIO()
+    Session(executor, front_end, breakpoints=[7])
+    executor.execute(parse(SESSION))
+    return stops, executor.output.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=5000, help="loop iterations")
+    parser.add_argument('--repeat', type=int, default=15, help="best-of repeats")
+    # Both run the same code; the margin is for timing noise
+    parser.add_argument('--tolerance', type=float, default=0.15, help="allowed slowdown of a cleared hook")
+    args = parser.parse_args()
+
+    ast = parse(LOOP.replace('{n}', str(args.n)))
+    engines = [('python', PyExecutor, DebuggingExecutor)]
+    if novolang_core:
+        engines.append(('cpp', novolang_core.ASTExecutor, novolang_core.ASTExecutor))
+    failed = False
+    for name, plain, debuggable in engines:
+        if debuggable is plain:
+            labels = ['plain executor', 'hook set, cleared', 'session, no stops']
+            configs = [(plain, None), (plain, set_and_clear), (plain, watch)]
+        else:
+            # DebuggingExecutor does not compile hot loops; the tree walker row separates that from the hook
+            labels = ['plain executor', 'tree walker only', 'DebuggingExecutor', 'session, no stops']
+            configs = [(plain, None), (plain, tree_walker), (debuggable, None), (debuggable, watch)]
+        rows = [(label, *result) for label, result in zip(labels, run(configs, ast, args.repeat))]
+        plain_s, expected = rows[0][1], rows[0][2]
+        print(f"{name}: {args.n} iterations")
+        for label, seconds, output in rows:
+            print(f"  {label:18s} {seconds * 1000:9.2f} ms  ({seconds / plain_s:5.2f}x)")
+            if output != expected:
+                print(f"FAIL: {name}: {label} printed {output!r}, expected {expected!r}")
+                failed = True
+        if debuggable is plain and rows[1][1] > plain_s * (1 + args.tolerance):
+            print(f"FAIL: {name}: a cleared debug hook is more than {args.tolerance:.0%} slower")
+            failed = True
+
+        stops, output = session_stops(debuggable)
+        wanted = [stop for stop, _ in SCRIPT]
+        print(f"  session stops: {' '.join(str(line) for line, _, _ in stops)}")
+        if stops != wanted or output != "0\n1\n3\ndone 3\n":
+            print(f"FAIL: {name}: session stopped at {stops}, printed {output!r}; expected {wanted}")
+            failed = True
+    if failed:
+        print("FAIL")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
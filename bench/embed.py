@@ -0,0 +1,119 @@
+"""Embedding benchmark: per-request cost of compile-once Programs.
+
+Times --requests runs of a short request-handling script, each with its own
+bindings and captured output: lexing and parsing on every request, as
+main.py does, and through engine.Engine (compile() on every request,
+served from its cache, then Program.run()). Also runs the same Program
+from --threads threads at once and checks every result. Exits with status 1 if any output is wrong or if
+Program.run() is not faster per request than parsing every time.
+
+    python bench/embed.py [--requests 2000] [--threads 4] [--backend auto]
+"""
+import argparse
+import io
+import os
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+from engine import Engine
+from lexer import tokenize
+from nl_array import NLArray
+from parser import Parser
+
+# A typical request handler: validate, compute a price, format a reply
+SOURCE = '''定义 price = base
+如果 (quantity > 10) {
+    price = price * 9 / 10
+}
+定义 total = price * quantity
+定义 i = 0
+循环 (i = 0; i < len(items); i = i + 1) {
+    total = total + items[i]
+}
+如果 (total > limit) {
+    打印 "order " + order + " needs approval: " + total
+} 否则 {
+    打印 "order " + order + " accepted: " + total
+}
+'''
+
+
+def bindings(n):
+    return {'base': 100, 'quantity': n % 20, 'items': [n % 7, 3, 5], 'limit': 1000, 'order': f"#{n}"}
+
+
+def expected(n):
+    b = bindings(n)
+    price = b['base'] * 9 / 10 if b['quantity'] > 10 else b['base']
+    total = price * b['quantity'] + sum(b['items'])
+    total = int(total) if total == int(total) else total
+    verdict = "needs approval" if total > b['limit'] else "accepted"
+    return f"order {b['order']} {verdict}: {total}\n"
+
+
+def per_request_parse(engine, n):
+    # Without Engine: lex and parse on every request, then run the same way
+    ast = Parser(tokenize(SOURCE)).parse()
+    captured = io.StringIO()
+    executor = engine.executor(captured)
+    executor.set_global_variables({name: NLArray.from_list(value) if isinstance(value, list) else value
+                                   for name, value in bindings(n).items()})
+    executor.execute(ast)
+    return captured.getvalue()
+
+
+def per_request_program(engine, n):
+    return engine.compile(SOURCE).run(bindings=bindings(n)).output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000, help="requests to time")
+    parser.add_argument('--threads', type=int, default=4, help="threads sharing one Program")
+    parser.add_argument('--backend', default='auto', choices=('auto', 'python', 'cpp'))
+    args = parser.parse_args()
+
+    engine = Engine(args.backend)
+    print(f"backend {engine.backend}, {args.requests} requests")
+    timings = {}
+    for name, handle in (('lex + parse + execute', per_request_parse), ('Program.run', per_request_program)):
+        start = time.perf_counter()
+        for n in range(args.requests):
+            if handle(engine, n) != expected(n):
+                print(f"FAIL: {name} gave wrong output for request {n}")
+                return 1
+        timings[name] = (time.perf_counter() - start) / args.requests
+        print(f"  {name:22s} {timings[name] * 1e6:9.1f} us/request")
+
+    program = engine.compile(SOURCE)
+    errors = []
+
+    def worker(offset):
+        for n in range(offset, args.requests, args.threads):
+            if program.run(bindings=bindings(n)).output != expected(n):
+                errors.append(n)
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    print(f"  {args.threads} threads, one Program {elapsed / args.requests * 1e6:9.1f} us/request, "
+          f"{len(errors)} wrong results")
+    failed = bool(errors)
+
+    if timings['Program.run'] >= timings['lex + parse + execute']:
+        print("FAIL: Program.run is not faster than parsing every request")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
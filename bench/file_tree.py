@@ -0,0 +1,95 @@
+"""Project tree benchmark: opening a directory of 20k .nl files.
+
+Generates --files empty .nl files in a temporary directory and times the
+listing the project tree does on its scanner thread against the old
+listdir + isdir per entry. With a display available it also opens the
+directory in a real ProjectTree and reports the time to the first entries,
+the time to the full listing and the longest Tk loop slice meanwhile.
+Exits with status 1 if that slice exceeds --budget-ms.
+
+    python bench/file_tree.py [--files 20000] [--budget-ms 50]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+import editor
+
+
+def listdir_ms(path):
+    start = time.perf_counter()
+    for name in os.listdir(path):
+        os.path.isdir(os.path.join(path, name))
+    return (time.perf_counter() - start) * 1000
+
+
+def scan_ms(path):
+    start = time.perf_counter()
+    editor.scan_directory(path)
+    return (time.perf_counter() - start) * 1000
+
+
+def tree_ms(path, files):
+    """(first entries, full listing, longest slice) in a real ProjectTree, or None without a display."""
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    tree = editor.ProjectTree(root)
+    tree.pack(fill=tk.BOTH, expand=True)
+    root.update()
+    start = time.perf_counter()
+    tree.set_root(path)
+    first = None
+    longest = 0.0
+    while len(tree.get_children(path)) < files:
+        slice_start = time.perf_counter()
+        root.update()
+        longest = max(longest, time.perf_counter() - slice_start)
+        if first is None and tree.get_children(path):
+            first = time.perf_counter() - start
+    full = time.perf_counter() - start
+    root.destroy()
+    return first * 1000, full * 1000, longest * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=20000, help=".nl files in the generated directory")
+    parser.add_argument('--budget-ms', type=float, default=50.0, help="allowed longest Tk loop slice")
+    args = parser.parse_args()
+
+    path = tempfile.mkdtemp()
+    try:
+        for i in range(args.files):
+            open(os.path.join(path, f"script{i}.nl"), 'w').close()
+        print(f"{args.files} files")
+        print(f"  listdir + isdir (old, Tk thread):  {listdir_ms(path):8.1f} ms")
+        print(f"  scan_directory (scanner thread):  {scan_ms(path):8.1f} ms")
+        results = tree_ms(path, args.files)
+    finally:
+        shutil.rmtree(path)
+
+    if results is None:
+        print("  project tree:                     skipped (no display)")
+        return 0
+    first, full, longest = results
+    print(f"  first entries shown:              {first:8.1f} ms")
+    print(f"  whole directory listed:           {full:8.1f} ms")
+    print(f"  longest Tk loop slice:            {longest:8.1f} ms")
+    if longest > args.budget_ms:
+        print(f"FAIL: {longest:.1f} ms slice exceeds {args.budget_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
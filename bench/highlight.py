@@ -0,0 +1,121 @@
+"""Editor highlighting benchmark: keystroke latency on a 10k-line file.
+
+Generates a NovoLang file of --lines lines and times the highlighter's work
+per keystroke: the token scan of the visible region that each (debounced)
+highlight pass does, next to a scan of the whole file for scale. With a
+display available it also opens the file in a real CodeEditor, types
+--keys characters in the middle of it and times insert + highlight pass.
+Exits with status 1 if the median keystroke exceeds --budget-ms.
+
+    python bench/highlight.py [--lines 10000] [--keys 200] [--budget-ms 16]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+import editor
+from editor import highlight_spans
+
+VIEWPORT = 60  # lines visible in a typical editor window
+
+BLOCK = [
+    '// totals for row {n}',
+    '定义 total{n} = 0',
+    '循环 (i = 0; i < {n}; i = i + 1) {{',
+    '    如果 (i > 10) {{',
+    '        total{n} = total{n} + i * 2.5',
+    '    }}',
+    '}}',
+    '打印 "row {n}: " + total{n}',
+]
+
+
+def source(lines):
+    out = []
+    n = 0
+    while len(out) < lines:
+        out.extend(line.format(n=n) for line in BLOCK)
+        n += 1
+    return '\n'.join(out[:lines]) + '\n'
+
+
+def scan_ms(text, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in highlight_spans(text):
+            pass
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def keystroke_ms(code, keys):
+    """Per-keystroke insert + highlight pass in a real editor widget, or None without a display."""
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    root.geometry("900x900")
+    widget = editor.CodeEditor(root)
+    widget.pack(fill=tk.BOTH, expand=True)
+    text = widget.text_area
+    text.insert("1.0", code)
+    middle = code.count('\n') // 2
+    text.mark_set(tk.INSERT, f"{middle}.0")
+    text.see(tk.INSERT)
+    root.update()
+    widget.highlight_syntax()
+
+    times = []
+    for i in range(keys):
+        start = time.perf_counter()
+        text.insert(tk.INSERT, 'x' if i % 2 == 0 else ' ')
+        widget.highlight_syntax()
+        root.update_idletasks()
+        times.append((time.perf_counter() - start) * 1000)
+    root.destroy()
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=10000, help="lines in the generated file")
+    parser.add_argument('--keys', type=int, default=200, help="keystrokes to time in the editor widget")
+    parser.add_argument('--repeat', type=int, default=5, help="best-of repeats for the scans")
+    parser.add_argument('--budget-ms', type=float, default=16.0, help="allowed median keystroke latency")
+    args = parser.parse_args()
+
+    code = source(args.lines)
+    lines = code.splitlines(keepends=True)
+    middle = len(lines) // 2
+    viewport = ''.join(lines[middle:middle + VIEWPORT])
+
+    whole = scan_ms(code, args.repeat)
+    visible = scan_ms(viewport, args.repeat * 20)
+    print(f"{args.lines} lines, {len(code)} chars")
+    print(f"  scan whole file:        {whole:8.3f} ms")
+    print(f"  scan {VIEWPORT}-line viewport:  {visible:8.3f} ms")
+
+    times = keystroke_ms(code, args.keys)
+    if times is None:
+        print("  editor keystroke:       skipped (no display)")
+        latency = visible
+    else:
+        latency = statistics.median(times)
+        print(f"  editor keystroke:       {latency:8.3f} ms median, {max(times):.3f} ms max")
+
+    if latency > args.budget_ms:
+        print(f"FAIL: {latency:.3f} ms per keystroke exceeds {args.budget_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
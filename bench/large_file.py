@@ -0,0 +1,117 @@
+"""Large-file benchmark: open and scroll latency of the editor on 200k lines.
+
+Generates a NovoLang file of --lines lines and opens it in a real
+CodeEditor, timing how long until the first screenful is visible and until
+the whole file is in (large-file mode), against a single synchronous
+insert of the same text. Then jumps to --scrolls random positions and times
+each scroll including the gutter redraw and the highlight pass. Needs a
+display; without one it only reports how fast the loader thread reads.
+Exits with status 1 if the median scroll exceeds --budget-ms.
+
+    python bench/large_file.py [--lines 200000] [--scrolls 50] [--budget-ms 16]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+import editor
+from highlight import source
+
+
+def read_ms(path):
+    start = time.perf_counter()
+    with open(path, 'r', encoding='utf-8') as f:
+        while f.readlines(editor.LOAD_CHUNK_CHARS):
+            pass
+    return (time.perf_counter() - start) * 1000
+
+
+def measure(path, code, scrolls):
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    root.geometry("900x900")
+    results = {}
+
+    # Synchronous insert of the whole file, as before large-file mode
+    widget = editor.CodeEditor(root)
+    widget.pack(fill=tk.BOTH, expand=True)
+    root.update()
+    start = time.perf_counter()
+    widget.text_area.insert("1.0", code)
+    root.update()
+    results['sync_open'] = (time.perf_counter() - start) * 1000
+    widget.destroy()
+
+    widget = editor.CodeEditor(root)
+    widget.pack(fill=tk.BOTH, expand=True)
+    root.update()
+    start = time.perf_counter()
+    widget.load_file(path)
+    while widget.text_area.index("end-1c") == "1.0":
+        root.update()
+    root.update()
+    results['first_screen'] = (time.perf_counter() - start) * 1000
+    while widget.loading is not None:
+        root.update()
+    results['full_load'] = (time.perf_counter() - start) * 1000
+
+    times = []
+    rng = random.Random(0)
+    for _ in range(scrolls):
+        start = time.perf_counter()
+        widget.text_area.yview_moveto(rng.random())
+        root.update_idletasks()
+        widget.highlight_syntax()
+        root.update_idletasks()
+        times.append((time.perf_counter() - start) * 1000)
+    results['scroll'] = times
+    root.destroy()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=200000, help="lines in the generated file")
+    parser.add_argument('--scrolls', type=int, default=50, help="random scroll positions to time")
+    parser.add_argument('--budget-ms', type=float, default=16.0, help="allowed median scroll latency")
+    args = parser.parse_args()
+
+    code = source(args.lines)
+    with tempfile.NamedTemporaryFile('w', suffix='.nl', encoding='utf-8', delete=False) as f:
+        f.write(code)
+        path = f.name
+    try:
+        print(f"{args.lines} lines, {len(code.encode('utf-8'))} bytes "
+              f"(large-file mode above {editor.LARGE_FILE_BYTES} bytes)")
+        print(f"  loader thread read:     {read_ms(path):9.1f} ms")
+        results = measure(path, code, args.scrolls)
+    finally:
+        os.unlink(path)
+
+    if results is None:
+        print("  editor open/scroll:     skipped (no display)")
+        return 0
+    scroll = statistics.median(results['scroll'])
+    print(f"  synchronous open:       {results['sync_open']:9.1f} ms")
+    print(f"  first screen visible:   {results['first_screen']:9.1f} ms")
+    print(f"  whole file loaded:      {results['full_load']:9.1f} ms (UI responsive throughout)")
+    print(f"  scroll + gutter + tags: {scroll:9.3f} ms median, {max(results['scroll']):.3f} ms max")
+    if scroll > args.budget_ms:
+        print(f"FAIL: {scroll:.3f} ms per scroll exceeds {args.budget_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
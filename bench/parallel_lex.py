@@ -0,0 +1,73 @@
+"""Parallel lexing benchmark: lexer.tokenize on a large source, 1-16 workers.
+
+Generates a NovoLang source of about --mb megabytes (including multi-line
+strings and comments holding quotes, which the chunk splitter must not cut
+through), checks that the parallel token stream equals the sequential one,
+and reports the best of --repeat runs for each worker count with the
+speedup over the sequential Lexer. Exits with status 1 if any token stream
+differs. Speedups need as many CPUs as workers; os.cpu_count() is printed.
+
+    python bench/parallel_lex.py [--mb 16] [--workers 1 2 4 8 16] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+from highlight import source
+from lexer import Lexer, split_source, tokenize
+
+EXTRA = '定义 note = "spans\n// not a comment\nlines" // a "quote\n'
+
+
+def generate(mb):
+    block = source(800) + EXTRA
+    return block * max(1, (mb << 20) // len(block.encode('utf-8')))
+
+
+def best_s(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def same(a, b):
+    return len(a) == len(b) and all(
+        x.type == y.type and x.value == y.value and x.line == y.line for x, y in zip(a, b))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mb', type=int, default=16, help="approximate source size in MB")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16], help="worker counts to time")
+    parser.add_argument('--repeat', type=int, default=3, help="best-of repeats")
+    args = parser.parse_args()
+
+    code = generate(args.mb)
+    start = time.perf_counter()
+    split_source(code, 64)
+    split = (time.perf_counter() - start) * 1000
+    print(f"{len(code.encode('utf-8')) / (1 << 20):.1f} MB, {code.count(chr(10))} lines, "
+          f"{os.cpu_count()} CPUs; split into 64 chunks in {split:.1f} ms")
+
+    expected = Lexer(code).tokenize()
+    sequential = best_s(lambda: Lexer(code).tokenize(), args.repeat)
+    print(f"  Lexer.tokenize:    {sequential:7.2f} s  ({len(expected)} tokens)")
+    for workers in args.workers:
+        if not same(tokenize(code, workers), expected):
+            print(f"FAIL: {workers} workers produced a different token stream")
+            return 1
+        elapsed = best_s(lambda: tokenize(code, workers), args.repeat)
+        print(f"  {workers:2d} worker(s):      {elapsed:7.2f} s  {sequential / elapsed:5.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""Run-time parse reuse benchmark: lex + parse vs loading the editor's AST.
+
+When the editor's background parse already covers the buffer, Run sends the
+pickled AST to the worker instead of the source to re-parse. This times
+both for generated files of each --lines size (best of --repeat) and exits
+with status 1 if loading the AST is not faster than parsing at every size.
+
+    python bench/parse_reuse.py [--lines 1000 10000 50000] [--repeat 5]
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+from editor import analyze_source
+from highlight import source
+from lexer import Lexer
+from parser import Parser
+
+
+def best_ms(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, nargs='+', default=[1000, 10000, 50000],
+                        help="lines in each generated file")
+    parser.add_argument('--repeat', type=int, default=5, help="best-of repeats")
+    args = parser.parse_args()
+
+    failed = False
+    for lines in args.lines:
+        code = source(lines)
+        ast, error = analyze_source(code)
+        if error is not None:
+            print(f"{lines} lines: {error}")
+            return 1
+        parse = best_ms(lambda: Parser(Lexer(code).tokenize()).parse(), args.repeat)
+        load = best_ms(lambda: pickle.loads(ast), args.repeat)
+        print(f"{lines:6d} lines: lex + parse {parse:9.1f} ms, load AST {load:8.1f} ms "
+              f"({len(ast)} bytes), {parse / load:5.1f}x")
+        failed = failed or load >= parse
+    if failed:
+        print("FAIL: loading the AST is not faster than parsing")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
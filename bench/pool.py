@@ -0,0 +1,132 @@
+"""Executor pool benchmark: construction vs reset, pooled runs, isolation.
+
+On each available engine: times building an executor against reset() of
+a used one, and --requests runs of a short script through engine.Engine
+with a fresh executor per run and with a pool of --size executors (best
+of --repeat). Then runs the requests from --threads threads (more than
+--size, so leases wait) and prints the pool's metrics. Exits with status 1
+if any output is wrong, if more than --size executors were ever in use,
+or if a lease sees a variable or function an earlier lease defined.
+
+    python bench/pool.py [--requests 3000] [--size 2] [--threads 6] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+from engine import Engine, _core
+
+SOURCE = '''定义 total = base * quantity
+如果 (total > limit) {
+    打印 "order " + order + " needs approval"
+} 否则 {
+    打印 "order " + order + ": " + total
+}
+'''
+
+LEAKY = '''定义 secret = 42
+定义 helper(x) {
+    返回 x + secret
+}
+'''
+
+
+def bindings(n):
+    return {'base': 100, 'quantity': n % 20, 'limit': 1500, 'order': f"#{n}"}
+
+
+def expected(n):
+    total = 100 * (n % 20)
+    return f"order #{n} needs approval\n" if total > 1500 else f"order #{n}: {total}\n"
+
+
+def per_call(func, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count
+
+
+def isolated(engine):
+    """True if nothing LEAKY defines is visible to the next leases."""
+    engine.compile(LEAKY).run()
+    for probe in ('打印 secret\n', '打印 helper(1)\n'):
+        try:
+            engine.compile(probe).run()
+            return False
+        except RuntimeError:
+            pass
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=3000, help="requests to time")
+    parser.add_argument('--size', type=int, default=2, help="executors in the pool")
+    parser.add_argument('--threads', type=int, default=6, help="threads leasing from the pool")
+    parser.add_argument('--repeat', type=int, default=3, help="best-of repeats of the timed runs")
+    args = parser.parse_args()
+
+    backends = ['python'] + (['cpp'] if _core() else [])
+    failed = False
+    for backend in backends:
+        fresh = Engine(backend)
+        pooled = Engine(backend, pool_size=args.size)
+        used = fresh.executor()
+        used.execute(fresh.compile(LEAKY)._ast)
+        build_s = per_call(fresh.executor, args.requests)
+        reset_s = per_call(used.reset, args.requests)
+        print(f"{backend}: new executor {build_s * 1e6:6.2f} us, reset() {reset_s * 1e6:6.2f} us")
+
+        timings = {}
+        for _ in range(args.repeat):
+            for name, engine in (('fresh executor', fresh), (f'pool of {args.size}', pooled)):
+                program = engine.compile(SOURCE)
+                start = time.perf_counter()
+                for n in range(args.requests):
+                    if program.run(bindings=bindings(n)).output != expected(n):
+                        print(f"FAIL: {name} gave wrong output for request {n}")
+                        failed = True
+                        break
+                elapsed = (time.perf_counter() - start) / args.requests
+                timings[name] = min(timings.get(name, elapsed), elapsed)
+        for name, elapsed in timings.items():
+            print(f"  {name:16s} {elapsed * 1e6:8.1f} us/request")
+
+        engine = Engine(backend, pool_size=args.size)
+        program = engine.compile(SOURCE)
+        errors = []
+
+        def worker(offset):
+            for n in range(offset, args.requests, args.threads):
+                if program.run(bindings=bindings(n)).output != expected(n):
+                    errors.append(n)
+        threads = [threading.Thread(target=worker, args=(k,)) for k in range(args.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        metrics = engine.pool.metrics()
+        print(f"  {args.threads} threads: {metrics['leases']} leases, peak {metrics['peak_in_use']}/{metrics['size']} "
+              f"in use, {metrics['waited']} waited (mean {metrics['wait_seconds_mean'] * 1e6:.1f} us, "
+              f"max {metrics['wait_seconds_max'] * 1e3:.2f} ms), {len(errors)} wrong results")
+        if errors or metrics['peak_in_use'] > args.size or metrics['in_use']:
+            failed = True
+        if not isolated(engine):
+            print(f"FAIL: {backend}: a lease saw state from an earlier lease")
+            failed = True
+    if failed:
+        print("FAIL")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Snapshot benchmark: resuming at a checkpoint vs running the whole script.
+
+Generates a script whose preamble is --lines of setup statements (constants,
+a lookup table filled by a loop, helper functions) followed by a checkpoint
+and a short body, and times, best of --repeat, on each available engine:
+the full run (lex, parse, execute), taking and writing the snapshot at the
+checkpoint, and resuming (load, restore, run the body). Checks that the
+resumed run prints what the full run prints after the checkpoint and exits
+with status 1 if it does not, or if resuming is not faster than a full run.
+
+    python bench/snapshot.py [--lines 2000 20000] [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+import snapshot
+from lexer import tokenize
+from parser import Parser
+from py_executor import PyExecutor
+from suite import silenced
+
+try:
+    import novolang_core
+except ImportError:
+    novolang_core = None
+
+
+def script(lines):
+    out = ["定义 table = [0, 0, 0, 0, 0, 0, 0, 0]",
+           "循环 (i = 0; i < 2000; i = i + 1) {",
+           "    table[3] = table[3] + i * i",
+           "}",
+           "定义 scale(x) {",
+           "    返回 x * factor",
+           "}"]
+    for n in range(lines - len(out) - 1):
+        out.append(f"定义 setting{n} = {n} * 3 + {n % 7}")
+    out.append("定义 factor = setting1")
+    out.append("检查点 ready")
+    out.append("打印 table")
+    out.append("打印 scale(setting10)")
+    out.append('打印 "done " + factor')
+    return '\n'.join(out) + '\n'
+
+
+def output(func):
+    """What func prints (Python engine)."""
+    captured = io.StringIO()
+    with contextlib.redirect_stdout(captured):
+        func()
+    return captured.getvalue()
+
+
+def best(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, nargs='+', default=[2000, 20000], help="preamble sizes in lines")
+    parser.add_argument('--repeat', type=int, default=3, help="best-of repeats")
+    args = parser.parse_args()
+
+    engines = [('python', PyExecutor)]
+    if novolang_core:
+        engines.append(('c++', novolang_core.ASTExecutor))
+
+    failed = False
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'snapshot.nls')
+    for lines in args.lines:
+        code = script(lines)
+        digest = snapshot.source_digest(code)
+        for name, make in engines:
+            def full():
+                ast = Parser(tokenize(code)).parse()
+                make().execute(ast)
+
+            save_times = []
+
+            def take():
+                ast = Parser(tokenize(code)).parse()
+                executor = make()
+
+                def hook(stmt):
+                    # snapshot.recorder, timed
+                    executor.checkpoint_hook = None
+                    start = time.perf_counter()
+                    snapshot.save(snapshot.take(executor, ast, stmt, digest), path)
+                    save_times.append(time.perf_counter() - start)
+                executor.checkpoint_hook = hook
+                executor.execute(ast)
+
+            def resume():
+                executor = make()
+                executor.execute(snapshot.restore(executor, snapshot.load(path, digest)))
+
+            with silenced():
+                full_s = best(full, args.repeat)
+                best(take, args.repeat)
+                resume_s = best(resume, args.repeat)
+            if name == 'python':
+                expected = output(full)
+                resumed = output(resume)
+                if not expected.endswith(resumed):
+                    print(f"FAIL: {lines} lines: resumed output differs")
+                    failed = True
+            size = os.path.getsize(path)
+            print(f"{lines:6d} lines, {name:6s}: full run {full_s * 1000:8.1f} ms, "
+                  f"snapshot {min(save_times) * 1000:6.1f} ms ({size} bytes), "
+                  f"resume {resume_s * 1000:7.1f} ms, {full_s / resume_s:5.1f}x")
+            failed = failed or resume_s >= full_s
+    os.unlink(path)
+    os.rmdir(directory)
+    if failed:
+        print("FAIL")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
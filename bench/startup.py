@@ -0,0 +1,94 @@
+"""Cold-start benchmark for the NovoLang CLI and IDE.
+
+Measures the wall clock of `python main.py` on a one-line script, and uses
+`python -X importtime` to attribute import cost for the CLI and for importing
+editor.py. Exits with status 1 when any measurement exceeds its budget, so it
+can gate CI or a release build of NovoLangEditor.
+
+    python bench/startup.py [--runs 10] [--cli-budget 120] [--import-budget 50] [--editor-budget 100]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wall_clock(cmd, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return min(samples), statistics.median(samples)
+
+
+def import_profile(args):
+    """Run python -X importtime; return (total top-level import ms, [(self_us, module)])."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=ROOT,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    total_us = 0
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((int(self_us), name.strip()))
+        if not name[1:].startswith(' '):
+            # Top-level entries carry the cumulative cost of their whole subtree
+            total_us += int(cumulative_us)
+    return total_us / 1000, sorted(modules, reverse=True)
+
+
+def check(label, value, budget):
+    ok = value <= budget
+    print(f"  {label:<28} {value:8.1f} ms   budget {budget:6.1f} ms   {'ok' if ok else 'OVER BUDGET'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--cli-budget', type=float, default=120.0, help="max wall clock of `main.py tiny.nl` (ms)")
+    parser.add_argument('--import-budget', type=float, default=50.0, help="max import time of the CLI (ms)")
+    parser.add_argument('--editor-budget', type=float, default=100.0, help="max import time of editor.py (ms)")
+    parser.add_argument('--top', type=int, default=8, help="show the N most expensive imports")
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.nl', delete=False, encoding='utf-8') as f:
+        f.write('打印 "ok"\n')
+        script = f.name
+
+    ok = True
+    try:
+        print("NovoLang startup benchmark")
+        best, median = wall_clock([sys.executable, 'main.py', script], args.runs)
+        print(f"  main.py wall clock: best {best:.1f} ms, median {median:.1f} ms over {args.runs} runs")
+        ok &= check("main.py cold start (best)", best, args.cli_budget)
+
+        cli_imports, modules = import_profile(['main.py', script])
+        ok &= check("main.py imports", cli_imports, args.import_budget)
+        for self_us, name in modules[:args.top]:
+            print(f"      {self_us / 1000:7.2f} ms  {name}")
+
+        try:
+            import tkinter  # noqa: F401
+        except ImportError:
+            print("  editor.py imports: skipped (tkinter not available)")
+        else:
+            editor_imports, modules = import_profile(['-c', 'import editor'])
+            ok &= check("editor.py imports", editor_imports, args.editor_budget)
+            for self_us, name in modules[:args.top]:
+                print(f"      {self_us / 1000:7.2f} ms  {name}")
+    finally:
+        os.unlink(script)
+
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
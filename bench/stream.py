@@ -0,0 +1,87 @@
+"""Streaming front end benchmark: peak memory of long linear scripts.
+
+Generates straight-line scripts of each --lines size (assignments and
+conditionals over a handful of variables, like a long automation script)
+and runs each through main.py with and without --stream, reporting the
+child's wall time and peak RSS. With --stream the peak should stay flat as
+the script grows; exits with status 1 if the largest script's streamed peak
+exceeds the smallest one's by more than --slack-mb. Runs whichever engine
+main.py picks. POSIX only (os.wait4).
+
+    python bench/stream.py [--lines 50000 100000 200000] [--slack-mb 8]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, 'main.py')
+
+BLOCK = [
+    '定义 step = {n}',
+    'total = total + step * 2',
+    '如果 (total > 1000000) {{',
+    '    total = total - 1000000',
+    '}}',
+    'label = "step " + step',
+]
+
+
+def write_script(f, lines):
+    # Written a block at a time: the parent's peak RSS is inherited by the
+    # children it forks (ru_maxrss on Linux), so it must stay small
+    f.write('定义 total = 0\n')
+    for n in range((lines - 2) // len(BLOCK) + 1):
+        f.write('\n'.join(BLOCK).format(n=n) + '\n')
+    f.write('打印 total\n')
+
+
+def run(path, stream):
+    """(seconds, peak RSS in MB) of one main.py run."""
+    command = [sys.executable, MAIN, path] + (['--stream'] if stream else [])
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    if status:
+        raise RuntimeError(f"{' '.join(command)} failed with status {status}")
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    scale = 1 << 20 if sys.platform == 'darwin' else 1 << 10
+    return elapsed, usage.ru_maxrss / scale
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, nargs='+', default=[50000, 100000, 200000],
+                        help="script sizes in lines")
+    parser.add_argument('--slack-mb', type=float, default=8.0, help="allowed growth of the streamed peak")
+    args = parser.parse_args()
+
+    peaks = []
+    print(f"{'lines':>8} {'bytes':>10} {'whole s':>8} {'whole MB':>9} {'stream s':>9} {'stream MB':>10}")
+    for lines in args.lines:
+        with tempfile.NamedTemporaryFile('w', suffix='.nl', encoding='utf-8', delete=False) as f:
+            write_script(f, lines)
+            path = f.name
+        try:
+            size = os.path.getsize(path)
+            whole_s, whole_mb = run(path, False)
+            stream_s, stream_mb = run(path, True)
+        finally:
+            os.unlink(path)
+        peaks.append(stream_mb)
+        print(f"{lines:8d} {size:10d} "
+              f"{whole_s:8.2f} {whole_mb:9.1f} {stream_s:9.2f} {stream_mb:10.1f}")
+
+    growth = peaks[-1] - peaks[0]
+    if growth > args.slack_mb:
+        print(f"FAIL: streamed peak grew by {growth:.1f} MB")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""String-building benchmark: `s = s + chunk` in a loop up to 10 MB.
+
+Times each engine at doubling target sizes. With rope/string-builder values
+the time per MB should stay flat (linear scaling); a quadratic
+implementation roughly quadruples at every step. Exits with status 1 if
+going from the smallest to the largest size costs more than --max-ratio
+times the linear expectation.
+
+    python bench/string_build.py [--mb 10] [--steps 4] [--max-ratio 1.5]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+from lexer import Lexer
+from parser import Parser
+from py_executor import PyExecutor
+from suite import silenced
+
+try:
+    import novolang_core
+except ImportError:
+    novolang_core = None
+
+CHUNK = 'x' * 100
+
+
+def program(total_bytes):
+    iterations = total_bytes // len(CHUNK)
+    code = f"""定义 s = ""
+循环 (i = 0; i < {iterations}; i = i + 1) {{
+    s = s + "{CHUNK}"
+}}
+如果 (s == "") {{
+    打印 "empty"
+}}
+"""
+    return Parser(Lexer(code).tokenize()).parse()
+
+
+def time_engine(make_executor, ast):
+    with silenced():
+        start = time.perf_counter()
+        make_executor().execute(ast)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mb', type=float, default=10.0, help="largest string to build (MB)")
+    parser.add_argument('--steps', type=int, default=4, help="number of doubling sizes ending at --mb")
+    parser.add_argument('--max-ratio', type=float, default=1.5,
+                        help="allowed slowdown per MB of the largest size over the smallest")
+    args = parser.parse_args()
+
+    sizes = [int(args.mb * 1024 * 1024 / 2 ** (args.steps - 1 - i)) for i in range(args.steps)]
+    engines = [('python', PyExecutor)]
+    if novolang_core:
+        engines.append(('c++', novolang_core.ASTExecutor))
+
+    ok = True
+    for name, make_executor in engines:
+        print(f"{name} engine")
+        per_mb = []
+        for size in sizes:
+            seconds = time_engine(make_executor, program(size))
+            mb = size / (1024 * 1024)
+            per_mb.append(seconds / mb)
+            print(f"  {mb:7.2f} MB  {seconds * 1000:9.1f} ms  {seconds / mb * 1000:8.1f} ms/MB")
+        ratio = per_mb[-1] / per_mb[0]
+        linear = ratio <= args.max_ratio
+        ok &= linear
+        print(f"  ms/MB at largest vs smallest size: x{ratio:.2f} ({'linear' if linear else 'SUPERLINEAR'})")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""NovoLang benchmark suite with JSON baselines and regression gating.
+
+Every workload in bench/workloads.py is timed per stage: the lexer, the
+parser, the Python engine (PyExecutor) and, when built, the C++ engine
+(novolang_core). Results are the best and median of several repeats.
+
+    python bench/suite.py run [--scale 1] [--repeat 5] [--only counting_loop,...] [--save FILE]
+    python bench/suite.py compare BASELINE [CURRENT] [--threshold 0.10] [--noise-floor 1.0]
+
+`compare` runs the suite when CURRENT is omitted, and exits with status 1 if
+any stage is slower than its baseline by more than the threshold.
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+from lexer import Lexer
+from parser import Parser
+from py_executor import PyExecutor
+from workloads import WORKLOADS, STUB_MAPPING
+
+try:
+    import novolang_core
+except ImportError:
+    novolang_core = None
+
+STAGES = ('lex', 'parse', 'py_exec', 'cpp_exec')
+
+
+class _NullWriter:
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+@contextlib.contextmanager
+def silenced():
+    """Discard script output, including the C++ engine's std::cout."""
+    sys.stdout.flush()
+    saved_fd = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    saved_stdout = sys.stdout
+    sys.stdout = _NullWriter()
+    try:
+        yield
+    finally:
+        sys.stdout = saved_stdout
+        os.dup2(saved_fd, 1)
+        os.close(saved_fd)
+        os.close(devnull)
+
+
+@contextlib.contextmanager
+def stubbed_auto_api():
+    # The C++ engine imports python.auto_api, a separate module object from
+    # the auto_api the Python engine uses; stub both.
+    import auto_api
+    modules = [auto_api]
+    try:
+        import python.auto_api
+        modules.append(python.auto_api)
+    except ImportError:
+        pass
+    for module in modules:
+        module.AutoAPI.MAPPING.update(STUB_MAPPING)
+    try:
+        yield
+    finally:
+        for module in modules:
+            for name in STUB_MAPPING:
+                module.AutoAPI.MAPPING.pop(name, None)
+
+
+def measure(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {'min': min(samples), 'median': statistics.median(samples)}
+
+
+def run_workload(code, repeat):
+    result = {}
+    result['lex'] = measure(lambda: Lexer(code).tokenize(), repeat)
+    tokens = Lexer(code).tokenize()
+    result['parse'] = measure(lambda: Parser(tokens).parse(), repeat)
+    ast = Parser(tokens).parse()
+    with silenced():
+        result['py_exec'] = measure(lambda: PyExecutor().execute(ast), repeat)
+        if novolang_core:
+            result['cpp_exec'] = measure(lambda: novolang_core.ASTExecutor().execute(ast), repeat)
+    return result
+
+
+def run_suite(scale=1, repeat=5, only=None):
+    results = {}
+    with stubbed_auto_api():
+        for name, build in WORKLOADS.items():
+            if only and name not in only:
+                continue
+            code = build(scale)
+            results[name] = run_workload(code, repeat)
+            stages = ', '.join(f"{stage} {timing['min'] * 1000:.2f} ms"
+                               for stage, timing in results[name].items())
+            print(f"  {name:<16} {stages}", file=sys.stderr)
+    return {
+        'meta': {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpp_engine': novolang_core is not None,
+            'scale': scale,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold, noise_floor=0.001):
+    """Return a list of (workload, stage, base_s, now_s, ratio) over the threshold, printing a table.
+
+    Stages faster than noise_floor seconds in the baseline are shown but never flagged.
+    """
+    regressions = []
+    print(f"{'workload':<16} {'stage':<9} {'baseline ms':>12} {'current ms':>11} {'change':>8}")
+    for name, stages in baseline['results'].items():
+        for stage in STAGES:
+            if stage not in stages or stage not in current['results'].get(name, {}):
+                continue
+            base = stages[stage]['min']
+            now = current['results'][name][stage]['min']
+            ratio = now / base if base else 1.0
+            flag = ''
+            if base < noise_floor:
+                flag = '  (below noise floor)'
+            elif ratio > 1 + threshold:
+                flag = '  REGRESSION'
+                regressions.append((name, stage, base, now, ratio))
+            print(f"{name:<16} {stage:<9} {base * 1000:>12.2f} {now * 1000:>11.2f} {(ratio - 1) * 100:>+7.1f}%{flag}")
+    return regressions
+
+
+def load_results(parser, path):
+    """Saved results at path; a usage error (exit status 2) if it cannot be read."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        parser.error(f"cannot read results from {path}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NovoLang benchmark suite")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_cmd = sub.add_parser('run', help="run the suite and print or save results")
+    cmp_cmd = sub.add_parser('compare', help="compare results against a saved baseline")
+    for cmd in (run_cmd, cmp_cmd):
+        cmd.add_argument('--scale', type=int, default=1)
+        cmd.add_argument('--repeat', type=int, default=5)
+        cmd.add_argument('--only', help="comma-separated workload names")
+    run_cmd.add_argument('--save', metavar='FILE', help="write results as a JSON baseline")
+    cmp_cmd.add_argument('baseline')
+    cmp_cmd.add_argument('current', nargs='?', help="saved results to compare; runs the suite if omitted")
+    cmp_cmd.add_argument('--threshold', type=float, default=0.10, help="allowed slowdown, 0.10 = 10%%")
+    cmp_cmd.add_argument('--noise-floor', type=float, default=1.0, help="ignore stages faster than this many ms")
+    args = parser.parse_args()
+
+    only = set(args.only.split(',')) if args.only else None
+    if args.command == 'run':
+        results = run_suite(args.scale, args.repeat, only)
+        text = json.dumps(results, indent=2, ensure_ascii=False)
+        if args.save:
+            with open(args.save, 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+            print(f"Saved baseline to {args.save}", file=sys.stderr)
+        else:
+            print(text)
+        return 0
+
+    baseline = load_results(cmp_cmd, args.baseline)
+    if args.current:
+        current = load_results(cmp_cmd, args.current)
+    else:
+        meta = baseline.get('meta', {})
+        current = run_suite(meta.get('scale', args.scale), meta.get('repeat', args.repeat), only)
+    regressions = compare(baseline, current, args.threshold, args.noise_floor / 1000)
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Template matching benchmark: finding UI elements in 1080p and 4K frames.
+
+Draws a synthetic desktop (windows, buttons with text-like glyphs, icons,
+noise) at each --frames size, writes it and a few templates cut from it to
+PGM files, and times, best of --repeat, locate() on the files: loading the
+frame, and the match itself coarse to fine against a single full-resolution
+correlation. Also times preparing a template against fetching it from the
+cache, and runs find_image from a NovoLang script on each available engine.
+Exits with status 1 if a template is not found where it was cut, if a
+template absent from the frame is reported, if the pyramid is not faster
+than the single-level search, or if a script prints the wrong result.
+
+    python bench/template_match.py [--frames 1920x1080 3840x2160] [--repeat 3]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+import numpy as np
+
+from template_match import Template, TemplateCache, load_image, locate, match
+
+try:
+    import novolang_core
+except ImportError:
+    novolang_core = None
+
+# (name, top, left, height, width) as fractions of the frame, so both sizes
+# cut the same elements
+TEMPLATES = [('button', 0.42, 0.30, 0.030, 0.070),
+             ('icon', 0.10, 0.05, 0.030, 0.017),
+             ('dialog', 0.55, 0.60, 0.160, 0.140)]
+
+
+def desktop(height, width, seed):
+    """A gray desktop of overlapping windows with buttons and glyph rows."""
+    rng = np.random.default_rng(seed)
+    frame = np.tile(np.linspace(40, 90, width, dtype=np.float32), (height, 1))
+    for _ in range(60):
+        h, w = rng.integers(height // 12, height // 3), rng.integers(width // 12, width // 3)
+        y, x = rng.integers(0, height - h), rng.integers(0, width - w)
+        frame[y:y + h, x:x + w] = rng.integers(150, 250)
+        frame[y:y + height // 50, x:x + w] = rng.integers(60, 120)   # title bar
+        for _ in range(rng.integers(2, 8)):
+            bh, bw = rng.integers(height // 60, height // 25), rng.integers(width // 40, width // 12)
+            by, bx = rng.integers(y, y + h - bh), rng.integers(x, x + w - bw)
+            frame[by:by + bh, bx:bx + bw] = rng.integers(170, 230)
+            frame[by, bx:bx + bw] = frame[by + bh - 1, bx:bx + bw] = 80
+            # Glyphs: short dark strokes along the button's middle
+            glyph = max(2, bh // 3)
+            for gx in range(bx + glyph, bx + bw - 2 * glyph, 2 * glyph):
+                gy = by + bh // 2 - glyph // 2 + rng.integers(-1, 2)
+                frame[gy:gy + glyph, gx:gx + rng.integers(1, glyph + 1)] = rng.integers(10, 70)
+    frame += rng.normal(0, 3, frame.shape).astype(np.float32)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def save_pgm(path, pixels):
+    with open(path, 'wb') as f:
+        f.write(b'P5\n%d %d\n255\n' % (pixels.shape[1], pixels.shape[0]))
+        f.write(np.ascontiguousarray(pixels).tobytes())
+
+
+def best(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def single_level(template):
+    """template searched at full resolution only, for comparison."""
+    flat = Template.__new__(Template)
+    flat.width, flat.height, flat.levels = template.width, template.height, template.levels[:1]
+    return flat
+
+
+def run_script(directory, template, frame, engine):
+    script = os.path.join(directory, 'find.nl')
+    with open(script, 'w', encoding='utf-8') as f:
+        f.write(f'定义 hit = 自动 find_image("{template}", "{frame}")\n打印 hit\n'
+                f'打印 自动 查找图像("{template}", "{frame}", 0.99)[0]\n')
+    env = dict(os.environ)
+    if engine == 'python':
+        env['PYTHONPATH'] = ''
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'main.py'), script],
+                            capture_output=True, text=True, env=env)
+    return result.stdout.splitlines()[-2:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', nargs='+', default=['1920x1080', '3840x2160'], help="frame sizes, WxH")
+    parser.add_argument('--repeat', type=int, default=3, help="best-of repeats")
+    args = parser.parse_args()
+
+    failed = False
+    directory = tempfile.mkdtemp()
+    try:
+        for size in args.frames:
+            width, height = map(int, size.split('x'))
+            frame = desktop(height, width, seed=width)
+            frame_path = os.path.join(directory, f'frame{width}.pgm')
+            save_pgm(frame_path, frame)
+            load_s, pixels = best(lambda: load_image(frame_path), args.repeat)
+            print(f"{width}x{height}: load {load_s * 1000:6.1f} ms")
+
+            for name, top, left, h, w in TEMPLATES:
+                top, left, h, w = int(top * height), int(left * width), int(h * height), int(w * width)
+                path = os.path.join(directory, f'{name}{width}.pgm')
+                save_pgm(path, frame[top:top + h, left:left + w])
+                cache = TemplateCache()
+                prepare_s, template = best(lambda: Template(load_image(path)), 1)
+                cached_s, _ = best(lambda: (cache.get(path), cache.get(path)), args.repeat)
+                pyramid_s, found = best(lambda: match(pixels, template), args.repeat)
+                full_s, full = best(lambda: match(pixels, single_level(template)), 1)
+                ok = (found.left, found.top) == (left, top) and found.score > 0.99
+                print(f"  {name:7s} {w:4d}x{h:<4d} at ({left}, {top}): found ({found.left}, {found.top}) "
+                      f"score {found.score:.3f}, {len(template.levels)} levels {pyramid_s * 1000:7.1f} ms, "
+                      f"one level {full_s * 1000:7.1f} ms ({full_s / pyramid_s:4.1f}x); "
+                      f"prepare {prepare_s * 1000:5.1f} ms, cached {cached_s / 2 * 1e6:5.1f} us")
+                if not ok or (full.left, full.top) != (left, top):
+                    print(f"FAIL: {name} not found at ({left}, {top})")
+                    failed = True
+                if pyramid_s >= full_s:
+                    print(f"FAIL: {name}: the pyramid is not faster than one level")
+                    failed = True
+
+            # A texture the desktop does not have should not be found
+            rng = np.random.default_rng(width)
+            absent = np.kron(rng.integers(0, 255, (height // 120, width // 120)), np.ones((4, 4)))
+            if locate(absent, pixels) is not None:
+                print("FAIL: a template that is not in the frame was reported")
+                failed = True
+
+        # End to end from NovoLang, on the last frame
+        engines = ['python'] + (['cpp'] if novolang_core else [])
+        for engine in engines:
+            template_path = os.path.join(directory, f'button{width}.pgm')
+            lines = run_script(directory, template_path, frame_path, engine)
+            top, left, h, w = int(0.42 * height), int(0.30 * width), int(0.03 * height), int(0.07 * width)
+            # Arrays are all INT or all FLOAT, so the coordinates print as floats
+            expected = [f"[{left + w // 2}.0, {top + h // 2}.0, 1.0]", f"{left + w // 2}.0"]
+            print(f"  script ({engine}): {' / '.join(lines)}")
+            if lines != expected:
+                print(f"FAIL: {engine} script printed {lines}, expected {expected}")
+                failed = True
+    finally:
+        shutil.rmtree(directory)
+    if failed:
+        print("FAIL")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
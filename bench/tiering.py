@@ -0,0 +1,100 @@
+"""Tiered execution benchmark: PyExecutor with and without hot-loop compilation.
+
+Runs every workload in bench/workloads.py, plus a straight-line script of
+cold code, on a fresh parse each time with tiering off (NOVOLANG_TIER_UP=0
+behaviour) and on, checks both print the same output, and reports the best
+of --repeat runs with the loops promoted and their estimated saving. Exits
+with status 1 if any output differs, if the hottest workload is not at least
+--min-speedup times faster tiered, or if cold code is more than --slack
+slower.
+
+    python bench/tiering.py [--scale 1] [--repeat 3] [--min-speedup 1.5] [--slack 0.10]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+from lexer import Lexer
+from parser import Parser
+from py_executor import PyExecutor
+from suite import stubbed_auto_api
+from tiering import TIER_UP_ITERATIONS, format_tier_stats
+from workloads import WORKLOADS
+
+
+def cold_code(scale):
+    # Straight-line code and short loops that never reach the threshold
+    lines = ["定义 total = 0"]
+    for n in range(2000 * scale):
+        lines.append(f"total = total + {n} * 2")
+        lines.append("如果 (total > 1000000) {\n    total = total - 1000000\n}")
+    lines.append("循环 (i = 0; i < 10; i = i + 1) {\n    total = total + i\n}")
+    lines.append("打印 total")
+    return '\n'.join(lines) + '\n'
+
+
+def run(code, tier_up):
+    """(seconds, output, executor) of one run on a fresh AST."""
+    ast = Parser(Lexer(code).tokenize()).parse()
+    executor = PyExecutor(tier_up=tier_up)
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        executor.execute(ast)
+    return time.perf_counter() - start, output.getvalue(), executor
+
+
+def best(code, tier_up, repeat):
+    runs = [run(code, tier_up) for _ in range(repeat)]
+    return min(runs, key=lambda r: r[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, default=1, help="workload scale")
+    parser.add_argument('--repeat', type=int, default=3, help="best-of repeats")
+    parser.add_argument('--min-speedup', type=float, default=1.5, help="required speedup of the best workload")
+    parser.add_argument('--slack', type=float, default=0.10, help="allowed slowdown of cold code")
+    args = parser.parse_args()
+
+    workloads = dict(WORKLOADS, cold_code=cold_code)
+    failed = False
+    speedups = []
+    print(f"threshold {TIER_UP_ITERATIONS} iterations")
+    with stubbed_auto_api():
+        for name, make in workloads.items():
+            code = make(args.scale)
+            plain_s, plain_out, _ = best(code, 0, args.repeat)
+            tiered_s, tiered_out, executor = best(code, TIER_UP_ITERATIONS, args.repeat)
+            if plain_out != tiered_out:
+                print(f"FAIL: {name} prints different output when tiered")
+                failed = True
+            speedup = plain_s / tiered_s
+            print(f"  {name:16s} interpreted {plain_s * 1000:8.1f} ms, tiered {tiered_s * 1000:8.1f} ms, "
+                  f"{speedup:5.2f}x")
+            stats = executor.tier_stats()
+            if stats:
+                print('    ' + format_tier_stats(stats).replace('\n', '\n    '))
+            if name == 'cold_code':
+                if speedup < 1 / (1 + args.slack):
+                    print(f"FAIL: cold code is {1 / speedup - 1:.0%} slower when tiered")
+                    failed = True
+            else:
+                speedups.append(speedup)
+
+    if max(speedups) < args.min_speedup:
+        print(f"FAIL: best speedup {max(speedups):.2f}x is below {args.min_speedup}x")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
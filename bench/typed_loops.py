@@ -0,0 +1,163 @@
+"""Typed loops benchmark: novolang_core with and without unboxed locals.
+
+Times (best of --repeat, the two configurations interleaved) numeric,
+string and mixed-type loops on the C++ engine with typed_loops off (every
+value a boxed Value) and on (the variables python/type_inference.py proves
+run unboxed), and reports each executor's typed_loop_stats(). One workload
+overflows a long mid-loop, so it must deoptimize. Exits with status 1 if
+either configuration prints something other than the Python engine, if a
+numeric loop is not at least --min-speedup times faster typed, or if the
+overflow does not deoptimize.
+
+    python bench/typed_loops.py [--scale 1] [--repeat 3] [--min-speedup 5]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python'))
+
+from lexer import tokenize
+from parser import Parser
+from py_executor import PyExecutor
+
+try:
+    import novolang_core
+except ImportError:
+    novolang_core = None
+
+# (name, numeric: held to --min-speedup, source with {n})
+WORKLOADS = [
+    ('int_nested', True, '''定义 total = 0
+循环 (i = 0; i < {n} / 20; i = i + 1) {
+    循环 (j = 0; j < 20; j = j + 1) {
+        total = total + i * j - j
+    }
+}
+打印 total
+'''),
+    ('int_branches', True, '''定义 inside = 0
+定义 outside = 0
+定义 r = {n} / 100
+循环 (x = 0; x < 100; x = x + 1) {
+    循环 (y = 0; y < r; y = y + 1) {
+        定义 d = x * x + y * y
+        如果 (d < r * r) {
+            inside = inside + 1
+        } 否则 {
+            outside = outside + 1
+        }
+    }
+}
+打印 inside
+打印 outside
+'''),
+    ('double_sim', True, '''定义 pos = 1.0
+定义 vel = 0.0
+定义 dt = 0.001
+定义 energy = 0.0
+循环 (step = 0; step < {n}; step = step + 1) {
+    vel = vel - pos * dt
+    pos = pos + vel * dt
+    energy = energy + pos * pos + vel * vel
+}
+打印 pos
+打印 energy
+'''),
+    ('string_build', False, '''定义 s = ""
+循环 (i = 0; i < {n} / 10; i = i + 1) {
+    s = s + i + ","
+}
+打印 长度(s)
+'''),
+    ('mixed', False, '''定义 m = 0
+定义 half = {n} / 2
+定义 k = 0
+循环 (k < {n}) {
+    如果 (k == half) {
+        m = "half"
+    } 否则 {
+        m = k
+    }
+    k = k + 1
+}
+打印 m
+'''),
+    ('overflow', False, '''定义 p = 1
+定义 steps = 0
+循环 (i = 0; i < {n}; i = i + 1) {
+    如果 (i < 80) {
+        p = p * 3
+    }
+    steps = steps + 1
+}
+打印 p
+打印 steps
+'''),
+]
+
+
+def parse(source):
+    return Parser(tokenize(source)).parse()
+
+
+def run(make, ast):
+    executor = make()
+    executor.output = io.StringIO()
+    start = time.perf_counter()
+    executor.execute(ast)
+    return time.perf_counter() - start, executor.output.getvalue(), executor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, default=1, help="workload scale")
+    parser.add_argument('--repeat', type=int, default=3, help="best-of repeats")
+    parser.add_argument('--min-speedup', type=float, default=5.0, help="required speedup of numeric loops")
+    args = parser.parse_args()
+    if novolang_core is None:
+        print("novolang_core is not built: nothing to measure")
+        return 0
+
+    def boxed():
+        executor = novolang_core.ASTExecutor()
+        executor.typed_loops = False
+        return executor
+
+    n = 50000 * args.scale
+    failed = False
+    for name, numeric, source in WORKLOADS:
+        ast = parse(source.replace('{n}', str(n)))
+        _, expected, _ = run(PyExecutor, parse(source.replace('{n}', str(n))))
+        best = {}
+        for _ in range(args.repeat):
+            for label, make in (('boxed', boxed), ('typed', novolang_core.ASTExecutor)):
+                seconds, output, executor = run(make, ast)
+                if output != expected:
+                    print(f"FAIL: {name}: {label} printed {output!r}, the Python engine {expected!r}")
+                    failed = True
+                best[label] = min(best.get(label, seconds), seconds)
+        stats = executor.typed_loop_stats()
+        speedup = best['boxed'] / best['typed']
+        print(f"  {name:13s} boxed {best['boxed'] * 1000:8.2f} ms, typed {best['typed'] * 1000:8.2f} ms, "
+              f"{speedup:6.1f}x  ({stats['compiled']} compiled, {stats['rejected']} rejected, "
+              f"{stats['guard_failures']} guard failures, {stats['deopts']} deopts)")
+        if numeric and speedup < args.min_speedup:
+            print(f"FAIL: {name} is only {speedup:.1f}x faster typed (want {args.min_speedup}x)")
+            failed = True
+        if name == 'overflow' and not stats['deopts']:
+            print("FAIL: the overflowing loop did not deoptimize")
+            failed = True
+    if failed:
+        print("FAIL")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
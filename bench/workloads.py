@@ -0,0 +1,107 @@
+"""Representative NovoLang workloads for bench/suite.py.
+
+Each workload is a function scale -> source code. Scale 1 is sized so the
+whole suite runs in well under a minute on the Python engine.
+"""
+
+
+def counting_loop(scale):
+    n = 20000 * scale
+    return f"""// counting loop
+定义 总和 = 0
+循环 (i = 0; i < {n}; i = i + 1) {{
+    总和 = 总和 + i
+}}
+打印 总和
+"""
+
+
+def string_building(scale):
+    n = 5000 * scale
+    return f"""// string building
+定义 报告 = ""
+循环 (i = 0; i < {n}; i = i + 1) {{
+    报告 = 报告 + "line " + i + ";"
+}}
+打印 "done"
+"""
+
+
+def deep_nesting(scale, depth=12):
+    # A for loop wrapping `depth` nested ifs, each guarding the next
+    lines = ["// deep nesting", "定义 命中 = 0", f"循环 (i = 0; i < {2000 * scale}; i = i + 1) {{"]
+    for level in range(depth):
+        lines.append("    " * (level + 1) + f"如果 (i > {level}) {{")
+    lines.append("    " * (depth + 1) + "命中 = 命中 + 1")
+    for level in reversed(range(depth)):
+        lines.append("    " * (level + 1) + "}")
+    lines.append("}")
+    lines.append("打印 命中")
+    return '\n'.join(lines) + '\n'
+
+
+def large_file(scale):
+    # Generated straight-line code: stresses the lexer and parser more than execution
+    lines = ["// large generated file", "定义 x = 0"]
+    for i in range(5000 * scale):
+        lines.append(f"x = x + {i % 7} * 2 - 1 // step {i}")
+        if i % 50 == 0:
+            lines.append(f'如果 (x > {i}) {{ x = x - 1 }} 否则 {{ x = x + 1 }}')
+    lines.append("打印 x")
+    return '\n'.join(lines) + '\n'
+
+
+def auto_dispatch(scale):
+    # 'bench_noop' is mapped to bench_stubs.noop by the suite, so this measures
+    # dispatch through AutoAPI rather than any real automation
+    n = 5000 * scale
+    return f"""// AutoAPI dispatch with stubs
+循环 (i = 0; i < {n}; i = i + 1) {{
+    自动 bench_noop(i, "arg")
+}}
+打印 "done"
+"""
+
+
+def function_calls(scale):
+    # A small helper called in a loop, plain recursion and a memoized (pure) recursion
+    n = 5000 * scale
+    return f"""// function calls
+定义 平方(x) {{
+    返回 x * x
+}}
+定义 fib(n) {{
+    如果 (n < 2) {{
+        返回 n
+    }}
+    返回 fib(n - 1) + fib(n - 2)
+}}
+纯 定义 记忆fib(n) {{
+    如果 (n < 2) {{
+        返回 n
+    }}
+    返回 记忆fib(n - 1) + 记忆fib(n - 2)
+}}
+定义 总和 = 0
+循环 (i = 0; i < {n}; i = i + 1) {{
+    总和 = 总和 + 平方(i)
+}}
+打印 总和
+打印 fib({12 + scale})
+打印 记忆fib(90)
+"""
+
+
+WORKLOADS = {
+    'counting_loop': counting_loop,
+    'string_building': string_building,
+    'deep_nesting': deep_nesting,
+    'large_file': large_file,
+    'auto_dispatch': auto_dispatch,
+    'function_calls': function_calls,
+}
+
+# AutoAPI names the workloads rely on, mapped to stub functions
+STUB_MAPPING = {
+    'bench_noop': ('bench_stubs', 'noop'),
+}
@@ -0,0 +1,33 @@
+#pragma once
+#include <string>
+#include <pybind11/pybind11.h>
+#include "scope.h"
+
+namespace py = pybind11;
+
+namespace NovoLang {
+
+// Conversion between Values and Python objects (AutoAPI arguments, arrays)
+py::object toPython(const Value& v);
+Value fromPython(const py::handle& obj);
+
+// Array values are python/nl_array.py NLArray objects held by reference, so
+// both engines share one implementation and a vectorized expression costs a
+// single call into NumPy.
+namespace Array {
+
+Value wrap(const py::object& obj);
+py::object object(const Value& array);
+
+Value fromValues(const std::vector<Value>& values);
+Value get(const Value& array, const Value& index);
+void set(const Value& array, const Value& index, const Value& value);
+long long length(const Value& array);
+long nbytes(const Value& array);
+std::string toString(const Value& array);
+// left op right where either side is an ARRAY
+Value elementwise(const std::string& op, const Value& left, const Value& right);
+
+}
+
+}
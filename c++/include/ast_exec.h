@@ -16,10 +16,21 @@ namespace py = pybind11;
 #endif
 
 #include "scope.h"
+#include "profiler.h"
+#include "governor.h"
+#include "functions.h"
+#include <functional>
+#include <memory>
 #include <vector>
 
 namespace NovoLang {
 
+// Loops hand the GIL to other Python threads this often (iterations), so
+// readers of our output (daemon.run_captured, the IDE) are not starved
+const long GIL_YIELD_INTERVAL = 1024;
+
+class TypedLoop;
+
 class ASTExecutor {
 public:
     ASTExecutor();
@@ -27,25 +38,131 @@ public:
     // But since I'm writing source code for the user, I should use the correct types.
     // I will assume the user has pybind11.
     void execute(const py::dict& ast);
+    // Top-level statements one at a time from a Python iterable (Parser.statements());
+    // each is charged to the governor as it starts and released after it runs
+    void executeStream(const py::iterable& statements, const py::object& path);
+
+    // Per-statement profiling; off unless enabled before execute()
+    void enableProfiling();
+    py::dict profileData() const;
+
+    // Execution budget; a limit of 0 disables it. Exceeding one raises LimitError.
+    void setLimits(long maxSteps, double maxSeconds, long maxMemory);
+    py::dict usage() const;
+    // Hit/miss counts of every pure function's memo cache, by name
+    py::dict memoStats() const;
+    // Back to the state of a new executor (no variables, functions, limits or
+    // hooks), keeping its allocations and its AutoAPI bridge; for pools
+    void reset();
+    // Top-level variables as Python values, and replacing them from Python (python/snapshot.py)
+    py::dict globalVariables() const;
+    void setGlobalVariables(const py::dict& variables);
+    // Top-level function table, {name: (FUNCTION_DEF node, defining module's path or None)},
+    // and replacing it, loading those modules (python/snapshot.py)
+    py::dict globalFunctions() const;
+    void setGlobalFunctions(const py::dict& functions);
+    // Called with each CHECKPOINT statement executed; None to ignore them
+    py::object checkpointHook = py::none();
+    // File-like object print writes to; None for std::cout
+    py::object output = py::none();
+    // Raise runtime errors from execute() instead of reporting them on std::cerr
+    bool raiseErrors = false;
+    // Debugger (python/debugger.py): while set, hook(stmt, depth) is called
+    // before each statement. Setting it switches execStmt to the instrumented
+    // dispatch, as profiling does; None switches back.
+    py::object getDebugHook() const { return debugHook; }
+    void setDebugHook(const py::object& hook);
+    // Variables visible at the current statement, innermost first: [(label, {name: value})]
+    py::list debugScopes() const;
+    // Calls in progress while debugging, outermost first: [(function, line of the call)]
+    py::list debugStack() const;
+    // Run loops python/type_inference.py annotated on unboxed locals
+    // (typed_loop.h) when no limits, profiler or debugger are active
+    bool typedLoops = true;
+    // Counts of typed loops: compiled, rejected, runs, guard failures, deopts
+    py::dict typedLoopStats() const;
     
 private:
+    friend class TypedLoop;
+
+    struct Function;
+    typedef std::unordered_map<std::string, std::shared_ptr<Function>> FunctionTable;
+
+    struct Function {
+        std::string name;
+        py::dict node;                   // the FUNCTION_DEF
+        py::list body;
+        size_t params;
+        size_t slots;
+        std::vector<std::string> locals; // slot names, for the debugger
+        std::unique_ptr<MemoCache> memo; // pure functions only
+        std::shared_ptr<Scope> globals;  // top level of the defining file
+        FunctionTable* table;            // functions visible in that file
+    };
+
+    // A module's top level as this engine binds it (see python/modules.py)
+    struct Namespace {
+        double mtime;
+        std::shared_ptr<Scope> globals;
+        std::shared_ptr<FunctionTable> functions;
+    };
+
     std::shared_ptr<Scope> globalScope;
     std::shared_ptr<Scope> currentScope;
+    std::unique_ptr<Profiler> profiler;
+    std::unique_ptr<Governor> governor;
+    long currentLine = 0;
+    FunctionTable topFunctions;
+    FunctionTable* functions = &topFunctions; // table of the running file
+    std::unordered_map<std::string, Namespace> modules; // by absolute path
+    std::string moduleDir; // directory imports are resolved against; empty for the cwd
+    std::vector<Value>* frame = nullptr; // slots of the running call; null at top level
+    Frames frames; // every call's slots, for the governor's memory check
+    int callDepth = 0;
+    // Profiling or debugging: execStmt takes execStmtInstrumented
+    bool instrumented = false;
+    py::object debugHook = py::none();
+    long debugDepth = 0;
+    std::vector<std::pair<const Function*, long>> debugCalls;
+    py::object autoApi; // python.auto_api.AutoAPI, created on the first automation call
+    // Compiled LOOP nodes (null if not typable), holding a reference to the node
+    std::unordered_map<PyObject*, std::pair<py::object, std::shared_ptr<TypedLoop>>> compiledLoops;
+    struct TypedLoopCounts {
+        long compiled = 0, rejected = 0, runs = 0, guardFailures = 0, deopts = 0;
+    } typedCounts;
     
-    // Helper to extract value from py::object
-    Value pyToValue(const py::object& obj);
-
+    void enterScope(const py::handle& body, const py::dict& stmt); // new scope, charged to the governor
     void execBlock(const py::list& stmts);
+    void inferTypes(const py::dict& ast); // python/type_inference.py's annotations for typed loops
+    void execBody(const py::handle& body); // list of statements or a single statement/BLOCK dict
     void execStmt(const py::dict& stmt);
+    void dispatchStmt(const py::dict& stmt);
+    // Runs body as a top-level execution: governor, error reporting, profiler wall time
+    void run(const std::function<void()>& body);
+    void execStmtInstrumented(const py::dict& stmt);
+    void enterCall(const Function& func, long line);
+    void leaveCall(Profiler::Clock::time_point start);
     Value evalExpr(const py::dict& expr);
     
     void execIf(const py::dict& stmt);
     void execLoop(const py::dict& stmt);
+    void execLoopBoxed(const py::dict& stmt);
+    bool execLoopTyped(const py::dict& stmt); // false if the loop has to run boxed
     void execPrint(const py::dict& stmt);
+    void printLine(const std::string& text);
     void execAssign(const py::dict& stmt);
-    void execAuto(const py::dict& stmt); // Calls back to Python
+    void execIndexAssign(const py::dict& stmt);
+    py::object execAuto(const py::dict& stmt); // Calls back to Python; returns the result
+    Value evalAuto(const py::dict& expr);      // execAuto as an expression
+    void defineFunction(const py::dict& stmt, const std::shared_ptr<Scope>& globals, FunctionTable& table);
+    void execImport(const py::dict& stmt);
+    py::dict runModule(const py::object& module); // ModuleLoader callback
+    Namespace& moduleNamespace(const py::object& module);
+    Value call(const py::dict& node); // CALL expression or CALL_STMT
+    Value invoke(Function& func, std::vector<Value>& args, long line);
     
     Value evalBinOp(const py::dict& expr);
+    static Value binaryOp(const std::string& op, const Value& left, const Value& right);
 };
 
 }
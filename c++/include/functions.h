@@ -0,0 +1,43 @@
+#pragma once
+#include <list>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+#include "scope.h"
+
+namespace NovoLang {
+
+// User-defined functions; python/functions.py documents the semantics
+// (slot frames, globals, memoization) shared by both engines.
+const size_t MEMO_SIZE = 1024;
+const int MAX_CALL_DEPTH = 1000;
+
+// Thrown by `return` and caught by the call that runs the function body
+struct ReturnSignal {
+    Value value;
+};
+
+// LRU cache of one pure function's results, keyed by argument types and values
+class MemoCache {
+public:
+    explicit MemoCache(size_t maxSize = MEMO_SIZE) : maxSize(maxSize) {}
+
+    // Builds the key for args; false when an argument cannot be cached (arrays)
+    static bool makeKey(const std::vector<Value>& args, std::string& key);
+    bool get(const std::string& key, Value& out);
+    void put(const std::string& key, const Value& value);
+    size_t size() const { return index.size(); }
+
+    long hits = 0;
+    long misses = 0;
+    long evictions = 0;
+
+private:
+    typedef std::list<std::pair<std::string, Value>> Entries;
+    size_t maxSize;
+    Entries entries; // most recently used first
+    std::unordered_map<std::string, Entries::iterator> index;
+};
+
+}
@@ -0,0 +1,58 @@
+#pragma once
+#include <chrono>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace NovoLang {
+
+class Scope;
+struct Value;
+
+// Slot lists of the calls in progress, outermost first
+typedef std::vector<std::vector<Value>*> Frames;
+
+// Thrown when a script exceeds a Governor limit; surfaces in Python as
+// novolang_core.LimitExceeded (a RuntimeError subclass).
+class LimitError : public std::runtime_error {
+public:
+    LimitError(const std::string& resource, long line, const std::string& detail)
+        : std::runtime_error("Error: " + resource + " limit exceeded at line " + std::to_string(line) + " (" + detail + ")"),
+          line(line) {}
+    long line;
+};
+
+// Execution budget mirroring python/governor.py: statements, wall-clock seconds
+// and variable memory (of the scope chain and of the calls' slots). A limit of
+// 0 disables that check. tick() is called at loop back-edges and on scope
+// creation; time and memory are sampled every checkInterval ticks, and memory
+// on every tick once past half its limit.
+class Governor {
+public:
+    typedef std::chrono::steady_clock Clock;
+
+    Governor(long maxSteps, double maxSeconds, long maxMemory, long checkInterval = 64);
+
+    void reset();
+    void stop();
+    void tick(long steps, long line, const Scope& scope, const Frames& frames);
+    void check(long line, const Scope& scope, const Frames& frames);
+    double elapsed() const;
+
+    long maxSteps;
+    double maxSeconds;
+    long maxMemory;
+    long checkInterval;
+
+    long steps = 0;
+    long ticks = 0;
+    long peakMemory = 0;
+
+private:
+    long countdown = 0;
+    bool finished = false;
+    Clock::time_point started;
+    Clock::time_point stopped;
+};
+
+}
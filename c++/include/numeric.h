@@ -0,0 +1,64 @@
+#pragma once
+#include <climits>
+#include <string>
+#include "scope.h"
+
+namespace NovoLang {
+
+// Numeric tower. python/numeric.py is the specification shared by both
+// engines; these functions implement the same rules:
+//   LONG op LONG stays LONG unless it leaves the 64-bit range (then DOUBLE),
+//   any DOUBLE operand gives DOUBLE, `/` is LONG only when exact, x / 0 is 0,
+//   and DOUBLE prints as %.15g with ".0" kept when integral.
+namespace Numeric {
+
+// Operands of arithmetic: LONG, DOUBLE, and BOOL counting as 0/1
+inline bool isNumeric(const Value& v) {
+    return v.type == Value::LONG || v.type == Value::DOUBLE || v.type == Value::BOOL;
+}
+double toDouble(const Value& v);
+
+// Checked 64-bit arithmetic; true when the exact result does not fit
+inline bool addOverflows(long long l, long long r, long long* out) {
+#if defined(__GNUC__) || defined(__clang__)
+    return __builtin_add_overflow(l, r, out);
+#else
+    if ((r > 0 && l > LLONG_MAX - r) || (r < 0 && l < LLONG_MIN - r)) return true;
+    *out = l + r;
+    return false;
+#endif
+}
+
+inline bool subOverflows(long long l, long long r, long long* out) {
+#if defined(__GNUC__) || defined(__clang__)
+    return __builtin_sub_overflow(l, r, out);
+#else
+    if ((r < 0 && l > LLONG_MAX + r) || (r > 0 && l < LLONG_MIN + r)) return true;
+    *out = l - r;
+    return false;
+#endif
+}
+
+inline bool mulOverflows(long long l, long long r, long long* out) {
+#if defined(__GNUC__) || defined(__clang__)
+    return __builtin_mul_overflow(l, r, out);
+#else
+    if (l == 0 || r == 0) { *out = 0; return false; }
+    if ((l == -1 && r == LLONG_MIN) || (r == -1 && l == LLONG_MIN)) return true;
+    if (l > 0 ? (r > 0 ? l > LLONG_MAX / r : r < LLONG_MIN / l)
+              : (r > 0 ? l < LLONG_MIN / r : l < LLONG_MAX / r)) return true;
+    *out = l * r;
+    return false;
+#endif
+}
+
+// + - * / on two numeric values
+Value arith(char op, const Value& left, const Value& right);
+// < > <= >= == != <> on two numeric values; NONE for an unknown operator
+Value compare(const std::string& op, const Value& left, const Value& right);
+
+std::string formatDouble(double d);
+
+}
+
+}
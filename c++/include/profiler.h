@@ -0,0 +1,39 @@
+#pragma once
+#include <chrono>
+#include <map>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+namespace NovoLang {
+
+// Aggregated timings of one statement, keyed by (line, kind)
+struct StmtStat {
+    long count = 0;
+    double total = 0.0;     // inclusive seconds, recursion counted once
+    double selfTime = 0.0;  // exclusive seconds
+};
+
+// Per-statement profiler. Only allocated when profiling is enabled, so the
+// executor's normal path pays a single null check per statement.
+class Profiler {
+public:
+    typedef std::chrono::steady_clock Clock;
+    typedef std::pair<long, std::string> Key;
+
+    void enter(long line, const std::string& kind);
+    void leave(double elapsed);
+
+    std::map<Key, StmtStat> stats;
+    std::unordered_map<std::string, double> stacks; // folded stack -> self seconds
+    double wall = 0.0;
+
+private:
+    std::vector<Key> keys;
+    std::vector<std::string> labels;
+    std::vector<double> childTime{0.0};
+    std::map<Key, int> active;
+};
+
+}
@@ -1,5 +1,6 @@
 #pragma once
 #include <string>
+#include <string_view>
 #include <unordered_map>
 #include <memory>
 #include <vector>
@@ -7,23 +8,54 @@
 #include <variant>
 #include <stdexcept>
 
+struct _object; // PyObject
+
 namespace NovoLang {
 
-// Value type supporting Long, Double, String, Bool, Null
+// String storage: the first `length` bytes of a buffer that may be shared
+// with other values. Copying a Value copies the pointer, not the text, and
+// `s = s + "..."` appends to the buffer in place (see Value::concat).
+struct StrRef {
+    std::shared_ptr<std::string> buf;
+    size_t length;
+
+    std::string_view view() const { return std::string_view(buf->data(), length); }
+};
+
+// Array storage: a reference to a Python nl_array.NLArray (see array.h)
+struct ArrayRef {
+    std::shared_ptr<_object> obj;
+};
+
+// Value type supporting Long, Double, String, Bool, Null, Array
 // Corresponds to Requirement 47: Type Mapping
+// LONG is always 64-bit (see numeric.h for the arithmetic rules)
 struct Value {
-    enum Type { LONG, DOUBLE, STRING, BOOL, NONE };
+    enum Type { LONG, DOUBLE, STRING, BOOL, NONE, ARRAY };
     Type type;
-    std::variant<long, double, std::string, bool, std::nullptr_t> data;
+    std::variant<long long, double, StrRef, bool, std::nullptr_t, ArrayRef> data;
 
     Value() : type(NONE), data(nullptr) {}
-    Value(long v) : type(LONG), data(v) {}
+    Value(long long v) : type(LONG), data(v) {}
+    Value(long v) : Value((long long)v) {}
+    Value(int v) : Value((long long)v) {}
     Value(double v) : type(DOUBLE), data(v) {}
-    Value(std::string v) : type(STRING), data(v) {}
+    Value(std::string v) : type(STRING), data(StrRef{nullptr, v.size()}) {
+        std::get<StrRef>(data).buf = std::make_shared<std::string>(std::move(v));
+    }
     Value(bool v) : type(BOOL), data(v) {}
     Value(std::nullptr_t) : type(NONE), data(nullptr) {}
+    Value(ArrayRef v) : type(ARRAY), data(std::move(v)) {}
 
     std::string toString() const;
+    // Condition value: null, false, 0, 0.0, "" and [] are false
+    bool truthy() const;
+    // Text of a STRING value; valid until the next concat on the same buffer
+    std::string_view text() const { return std::get<StrRef>(data).view(); }
+
+    // left + right where left is a STRING. Appends in place when left ends at
+    // the end of its buffer (the common `s = s + x` case), else copies left.
+    static Value concat(const Value& left, std::string_view right);
 };
 
 class Scope {
@@ -34,6 +66,16 @@ public:
     void assign(const std::string& name, Value value);
     Value get(const std::string& name);
     bool existsLocal(const std::string& name);
+    // The nearest definition of name, or null
+    Value* find(const std::string& name);
+    // Approximate bytes held by variables in this scope and its parents
+    long memoryUsage() const;
+    // Approximate bytes held by a call's slot values
+    static long memoryUsage(const std::vector<Value>& slots);
+    // This scope's own variables (module exports)
+    const std::unordered_map<std::string, Value>& locals() const { return variables; }
+    Scope* parentScope() const { return parent.get(); }
+    void clear() { variables.clear(); }
     
 private:
     std::unordered_map<std::string, Value> variables;
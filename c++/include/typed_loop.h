@@ -0,0 +1,62 @@
+#pragma once
+#include "ast_exec.h"
+#include <memory>
+#include <string>
+#include <vector>
+
+namespace NovoLang {
+
+// A LOOP run on unboxed native locals.
+//
+// python/type_inference.py proves, per file, which variables are always
+// long, double, bool, string or a number (long or double, not known which)
+// and puts those a loop uses in its 'types'.
+// compile() turns the loop, with its nested ifs, loops and blocks, into a
+// tree whose nodes know their result kind: a long variable is a long long,
+// `i < n` on longs is a native comparison, `x + 1` a checked add, and nothing
+// is looked up by name or dispatched on a type string. Numbers stay boxed
+// but skip the type dispatch; variables of other kinds stay boxed Values,
+// with the operators of ASTExecutor::binaryOp.
+// compile() re-checks every assignment in the loop against the annotation
+// and gives up (null) on calls, returns, imports, function definitions,
+// checkpoints and automation, which can see or change variables behind
+// the loop's back.
+//
+// run() loads the variables when the loop starts, after checking that each
+// holds its kind: imports, snapshots and earlier runs can bind a name to
+// anything. A variable that does not exist yet must be assigned, at the top
+// level of one block, before the loop reads it; it then lives only as long
+// as the tree walker's block scope would keep it. When the loop ends the
+// variables are written back to their scopes or slots.
+//
+// A long result that leaves the 64-bit range becomes a double, which the
+// typed code cannot hold. It deoptimizes instead: the variables are written
+// back, the tree walker's scopes rebuilt for the blocks in progress, and
+// ASTExecutor runs the rest of the loop boxed from the statement being
+// evaluated, with nothing executed twice. A loop that deoptimized stays boxed.
+class TypedLoop {
+public:
+    ~TypedLoop();
+    // The loop compiled, or null if it has something typed loops do not run
+    static std::shared_ptr<TypedLoop> compile(const py::dict& loop);
+    // Runs the LOOP statement; false, having run nothing, if a variable
+    // does not hold its compiled kind
+    bool run(ASTExecutor& executor);
+    bool disabled = false; // deoptimized: run boxed from now on
+
+    enum class Kind : unsigned char { LONG, DOUBLE, NUMBER, BOOL, STRING, BOXED };
+    struct Var;
+    struct Expr;
+    struct Block;
+    struct Stmt;
+
+private:
+    class Compiler;
+    class Run;
+
+    py::dict node;
+    std::vector<Var> vars;
+    std::unique_ptr<Stmt> loop;
+};
+
+}
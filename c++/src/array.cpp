@@ -0,0 +1,113 @@
+#include "../include/array.h"
+
+namespace NovoLang {
+
+py::object toPython(const Value& v) {
+    switch (v.type) {
+        case Value::LONG: return py::int_(std::get<long long>(v.data));
+        case Value::DOUBLE: return py::float_(std::get<double>(v.data));
+        case Value::STRING: return py::str(v.text().data(), v.text().size());
+        case Value::BOOL: return py::bool_(std::get<bool>(v.data));
+        case Value::ARRAY: return Array::object(v);
+        case Value::NONE: break;
+    }
+    return py::none();
+}
+
+Value fromPython(const py::handle& obj) {
+    PyObject* p = obj.ptr();
+    if (PyBool_Check(p)) return Value(p == Py_True);
+    if (PyLong_Check(p)) return Value((long long)PyLong_AsLongLong(p));
+    if (PyFloat_Check(p)) return Value(PyFloat_AsDouble(p));
+    if (PyUnicode_Check(p)) return Value(obj.cast<std::string>());
+    if (p == Py_None) return Value(nullptr);
+    return Array::wrap(py::reinterpret_borrow<py::object>(obj));
+}
+
+namespace Array {
+
+// nl_array lives in python/, which the entry points put on sys.path
+static py::module_ module() {
+    try {
+        return py::module_::import("nl_array");
+    } catch (py::error_already_set&) {
+        return py::module_::import("python.nl_array");
+    }
+}
+
+Value wrap(const py::object& obj) {
+    PyObject* p = obj.ptr();
+    Py_INCREF(p);
+    return Value(ArrayRef{std::shared_ptr<PyObject>(p, [](PyObject* o) { Py_DECREF(o); })});
+}
+
+py::object object(const Value& array) {
+    return py::reinterpret_borrow<py::object>(std::get<ArrayRef>(array.data).obj.get());
+}
+
+Value fromValues(const std::vector<Value>& values) {
+    py::list items;
+    for (const Value& v : values) items.append(toPython(v));
+    return wrap(module().attr("NLArray").attr("from_list")(items));
+}
+
+// Element storage (numpy.ndarray or array.array) through the buffer
+// protocol; element reads and writes in a loop skip the Python call
+static bool elementAt(const py::object& obj, const Value& index, py::buffer_info& info, char*& at) {
+    if (index.type != Value::LONG) return false;
+    info = py::reinterpret_borrow<py::buffer>(obj.attr("data")).request(true);
+    long long i = std::get<long long>(index.data);
+    if (info.ndim != 1 || info.itemsize != 8 || i < 0 || i >= (long long)info.size) return false;
+    at = (char*)info.ptr + i * info.strides[0];
+    return true;
+}
+
+Value get(const Value& array, const Value& index) {
+    py::object obj = object(array);
+    py::buffer_info info;
+    char* at;
+    if (elementAt(obj, index, info, at)) {
+        if (info.format == "d") return Value(*(double*)at);
+        return Value(*(long long*)at);
+    }
+    // Bad index: NLArray.get raises the error message
+    return fromPython(obj.attr("get")(toPython(index)));
+}
+
+void set(const Value& array, const Value& index, const Value& value) {
+    py::object obj = object(array);
+    py::buffer_info info;
+    char* at;
+    if ((value.type == Value::LONG || value.type == Value::DOUBLE) && elementAt(obj, index, info, at)) {
+        if (info.format == "d") {
+            *(double*)at = value.type == Value::LONG ? (double)std::get<long long>(value.data) : std::get<double>(value.data);
+            return;
+        }
+        if (value.type == Value::LONG) {
+            *(long long*)at = std::get<long long>(value.data);
+            return;
+        }
+    }
+    // Errors and FLOAT into an INT array (which converts it) go through Python
+    obj.attr("set")(toPython(index), toPython(value));
+}
+
+long long length(const Value& array) {
+    return (long long)py::len(object(array));
+}
+
+long nbytes(const Value& array) {
+    return py::module_::import("sys").attr("getsizeof")(object(array)).cast<long>();
+}
+
+std::string toString(const Value& array) {
+    return py::str(object(array)).cast<std::string>();
+}
+
+Value elementwise(const std::string& op, const Value& left, const Value& right) {
+    return fromPython(module().attr("elementwise")(op, toPython(left), toPython(right)));
+}
+
+}
+
+}
@@ -1,5 +1,8 @@
 #include "../include/ast_exec.h"
 #include "../include/io.h"
+#include "../include/numeric.h"
+#include "../include/array.h"
+#include "../include/typed_loop.h"
 #include <iostream>
 #include <string>
 
@@ -15,14 +18,176 @@ ASTExecutor::ASTExecutor() {
     currentScope = globalScope;
 }
 
-void ASTExecutor::execute(const py::dict& ast) {
+// python/modules.py holds the process-wide module loader shared with the Python engine
+static py::module_ modulesModule() {
+    try {
+        return py::module_::import("modules");
+    } catch (py::error_already_set&) {
+        return py::module_::import("python.modules");
+    }
+}
+
+static py::module_ typeInferenceModule() {
     try {
+        return py::module_::import("type_inference");
+    } catch (py::error_already_set&) {
+        return py::module_::import("python.type_inference");
+    }
+}
+
+static std::string baseDir(const py::dict& ast) {
+    py::object dir = modulesModule().attr("base_dir")(ast);
+    return dir.is_none() ? std::string() : dir.cast<std::string>();
+}
+
+void ASTExecutor::inferTypes(const py::dict& ast) {
+    // Once per AST, and only for runs that can use typed loops. This writes
+    // into the AST: shared ones come annotated (Engine.compile(), and modules,
+    // which run under the loader's lock before they are published).
+    if (!typedLoops || instrumented || governor || ast.contains("inferred")) return;
+    typeInferenceModule().attr("infer")(ast);
+}
+
+void ASTExecutor::execute(const py::dict& ast) {
+    moduleDir = baseDir(ast);
+    run([&]() {
+        inferTypes(ast);
         if (ast.contains("type") && ast["type"].cast<std::string>() == "BLOCK") {
-            execBlock(ast["statements"].cast<py::list>());
+            py::list stmts = ast["statements"].cast<py::list>();
+            if (governor) governor->tick((long)py::len(stmts), 0, *currentScope, frames);
+            execBlock(stmts);
+        }
+    });
+}
+
+void ASTExecutor::executeStream(const py::iterable& statements, const py::object& path) {
+    py::dict script;
+    script["file"] = path;
+    moduleDir = baseDir(script);
+    run([&]() {
+        for (auto item : statements) {
+            py::dict stmt = item.cast<py::dict>();
+            if (governor) {
+                long line = stmt.contains("line") ? stmt["line"].cast<long>() : 0;
+                governor->tick(1, line, *currentScope, frames);
+            }
+            execStmt(stmt);
+        }
+    });
+}
+
+void ASTExecutor::run(const std::function<void()>& body) {
+    Profiler::Clock::time_point start = Profiler::Clock::now();
+    if (governor) governor->reset();
+    try {
+        body();
+    } catch (const LimitError&) {
+        // Budget violations propagate to the caller as novolang_core.LimitExceeded
+        if (governor) governor->stop();
+        throw;
+    } catch (py::error_already_set& e) {
+        // A budget violation inside an imported module's top level comes back
+        // through the loader as a Python exception
+        if (raiseErrors || e.matches(py::module_::import("novolang_core").attr("LimitExceeded"))) {
+            if (governor) governor->stop();
+            throw;
         }
+        // Raised by the Python side (arrays, imports): report the message, not the traceback
+        std::cerr << "Runtime Error: " << py::str(e.value()).cast<std::string>() << std::endl;
     } catch (const std::exception& e) {
+        if (raiseErrors) {
+            if (governor) governor->stop();
+            throw;
+        }
         std::cerr << "Runtime Error: " << e.what() << std::endl;
     }
+    if (governor) governor->stop();
+    if (profiler) {
+        profiler->wall += std::chrono::duration<double>(Profiler::Clock::now() - start).count();
+    }
+}
+
+void ASTExecutor::enableProfiling() {
+    if (!profiler) profiler.reset(new Profiler());
+    instrumented = true;
+}
+
+void ASTExecutor::setDebugHook(const py::object& hook) {
+    debugHook = hook;
+    debugDepth = 0;
+    debugCalls.clear();
+    instrumented = profiler || !hook.is_none();
+}
+
+py::list ASTExecutor::debugScopes() const {
+    auto variables = [](const Scope& scope) {
+        py::dict values;
+        for (const auto& item : scope.locals()) values[py::str(item.first)] = toPython(item.second);
+        return values;
+    };
+    py::list scopes;
+    if (frame && !debugCalls.empty()) {
+        // A function sees its slots and its file's top level, not its caller's blocks
+        const Function& func = *debugCalls.back().first;
+        py::dict locals;
+        for (size_t i = 0; i < func.locals.size() && i < frame->size(); i++)
+            locals[py::str(func.locals[i])] = toPython((*frame)[i]);
+        scopes.append(py::make_tuple(func.name + "()", locals));
+        scopes.append(py::make_tuple("globals", variables(*globalScope)));
+        return scopes;
+    }
+    for (const Scope* scope = currentScope.get(); scope; scope = scope->parentScope())
+        scopes.append(py::make_tuple(scope == globalScope.get() ? "globals" : "block", variables(*scope)));
+    return scopes;
+}
+
+py::list ASTExecutor::debugStack() const {
+    py::list stack;
+    for (const auto& call : debugCalls) stack.append(py::make_tuple(call.first->name, call.second));
+    return stack;
+}
+
+void ASTExecutor::setLimits(long maxSteps, double maxSeconds, long maxMemory) {
+    governor.reset(new Governor(maxSteps, maxSeconds, maxMemory));
+}
+
+py::dict ASTExecutor::usage() const {
+    py::dict data;
+    if (governor) {
+        data["statements"] = governor->steps;
+        data["seconds"] = governor->elapsed();
+        data["peak_memory"] = governor->peakMemory;
+        data["checks"] = governor->ticks;
+    }
+    return data;
+}
+
+void ASTExecutor::enterScope(const py::handle& body, const py::dict& stmt) {
+    if (governor) {
+        long count = py::isinstance<py::list>(body) ? (long)py::len(body) : 1;
+        long line = stmt.contains("line") ? stmt["line"].cast<long>() : 0;
+        governor->tick(count, line, *currentScope, frames);
+    }
+    currentScope = std::make_shared<Scope>(currentScope);
+}
+
+py::dict ASTExecutor::profileData() const {
+    py::dict data;
+    py::list stats;
+    py::dict stacks;
+    if (profiler) {
+        for (const auto& item : profiler->stats) {
+            const StmtStat& s = item.second;
+            stats.append(py::make_tuple(item.first.first, item.first.second, s.count, s.total, s.selfTime));
+        }
+        for (const auto& item : profiler->stacks) {
+            stacks[py::str(item.first)] = item.second;
+        }
+        data["wall"] = profiler->wall;
+    }
+    data["stats"] = stats;
+    data["stacks"] = stacks;
+    return data;
 }
 
 void ASTExecutor::execBlock(const py::list& stmts) {
@@ -31,7 +196,61 @@ void ASTExecutor::execBlock(const py::list& stmts) {
     }
 }
 
+void ASTExecutor::execBody(const py::handle& body) {
+    // The parser emits statement lists for braces; older ASTs used BLOCK dicts
+    if (py::isinstance<py::list>(body)) {
+        execBlock(body.cast<py::list>());
+        return;
+    }
+    py::dict stmt = body.cast<py::dict>();
+    if (stmt["type"].cast<std::string>() == "BLOCK") {
+        execBlock(stmt["statements"].cast<py::list>());
+    } else {
+        execStmt(stmt);
+    }
+}
+
 void ASTExecutor::execStmt(const py::dict& stmt) {
+    // The only check plain runs pay for profiling and debugging
+    if (instrumented) {
+        execStmtInstrumented(stmt);
+        return;
+    }
+    dispatchStmt(stmt);
+}
+
+void ASTExecutor::execStmtInstrumented(const py::dict& stmt) {
+    long line = stmt.contains("line") ? stmt["line"].cast<long>() : 0;
+    long outerLine = currentLine;
+    currentLine = line;
+    if (!debugHook.is_none()) debugHook(stmt, debugDepth);
+    if (profiler) profiler->enter(line, stmt["type"].cast<std::string>());
+    Profiler::Clock::time_point start = Profiler::Clock::now();
+    debugDepth++;
+    try {
+        dispatchStmt(stmt);
+    } catch (...) {
+        if (profiler) profiler->leave(std::chrono::duration<double>(Profiler::Clock::now() - start).count());
+        debugDepth--;
+        currentLine = outerLine;
+        throw;
+    }
+    if (profiler) profiler->leave(std::chrono::duration<double>(Profiler::Clock::now() - start).count());
+    debugDepth--;
+    currentLine = outerLine;
+}
+
+void ASTExecutor::enterCall(const Function& func, long line) {
+    if (profiler) profiler->enter(currentLine, "call:" + func.name);
+    if (!debugHook.is_none()) debugCalls.emplace_back(&func, line);
+}
+
+void ASTExecutor::leaveCall(Profiler::Clock::time_point start) {
+    if (profiler) profiler->leave(std::chrono::duration<double>(Profiler::Clock::now() - start).count());
+    if (!debugHook.is_none() && !debugCalls.empty()) debugCalls.pop_back();
+}
+
+void ASTExecutor::dispatchStmt(const py::dict& stmt) {
     std::string type = stmt["type"].cast<std::string>();
     
     if (type == "IF") execIf(stmt);
@@ -39,66 +258,101 @@ void ASTExecutor::execStmt(const py::dict& stmt) {
     else if (type == "PRINT") execPrint(stmt);
     else if (type == "ASSIGNMENT") execAssign(stmt);
     else if (type == "AUTO_CALL") execAuto(stmt);
+    else if (type == "SLOT_ASSIGNMENT") {
+        Value val = evalExpr(stmt["value"].cast<py::dict>());
+        (*frame)[stmt["slot"].cast<size_t>()] = val;
+    }
+    else if (type == "RETURN") {
+        py::object value = stmt["value"];
+        throw ReturnSignal{value.is_none() ? Value(nullptr) : evalExpr(value.cast<py::dict>())};
+    }
+    else if (type == "CALL_STMT") call(stmt);
+    else if (type == "FUNCTION_DEF") defineFunction(stmt, globalScope, *functions);
+    else if (type == "IMPORT") execImport(stmt);
+    else if (type == "INDEX_ASSIGNMENT") execIndexAssign(stmt);
+    else if (type == "CHECKPOINT") {
+        if (!checkpointHook.is_none()) checkpointHook(stmt);
+    }
     else if (type == "BLOCK") {
         // Create new scope
         auto oldScope = currentScope;
-        currentScope = std::make_shared<Scope>(oldScope);
-        execBlock(stmt["statements"].cast<py::list>());
+        py::list stmts = stmt["statements"].cast<py::list>();
+        enterScope(stmts, stmt);
+        execBlock(stmts);
         currentScope = oldScope;
     }
 }
 
 void ASTExecutor::execIf(const py::dict& stmt) {
     Value cond = evalExpr(stmt["condition"].cast<py::dict>());
-    bool isTrue = false;
-    if (cond.type == Value::BOOL) isTrue = std::get<bool>(cond.data);
     
-    if (isTrue) {
+    if (cond.truthy()) {
         // Create scope for if block? Usually yes.
         auto oldScope = currentScope;
-        currentScope = std::make_shared<Scope>(oldScope);
+        enterScope(stmt["body"], stmt);
         
-        // Body can be a block or single stmt. Assuming Block from AST builder
-        py::dict body = stmt["body"].cast<py::dict>();
-        if (body["type"].cast<std::string>() == "BLOCK") {
-             execBlock(body["statements"].cast<py::list>());
-        } else {
-             execStmt(body);
-        }
+        // Body can be a statement list, a block or a single stmt
+        execBody(stmt["body"]);
         
         currentScope = oldScope;
     } else if (stmt.contains("else_body") && !stmt["else_body"].is_none()) {
         auto oldScope = currentScope;
-        currentScope = std::make_shared<Scope>(oldScope);
+        enterScope(stmt["else_body"], stmt);
         
-        py::dict elseBody = stmt["else_body"].cast<py::dict>();
-         if (elseBody["type"].cast<std::string>() == "BLOCK") {
-             execBlock(elseBody["statements"].cast<py::list>());
-        } else {
-             execStmt(elseBody);
-        }
+        execBody(stmt["else_body"]);
         
         currentScope = oldScope;
     }
 }
 
 void ASTExecutor::execLoop(const py::dict& stmt) {
+    // Limits, the profiler and the debugger need every statement to go through execStmt
+    if (typedLoops && !instrumented && !governor && stmt.contains("types") && execLoopTyped(stmt)) return;
+    execLoopBoxed(stmt);
+}
+
+bool ASTExecutor::execLoopTyped(const py::dict& stmt) {
+    auto found = compiledLoops.find(stmt.ptr());
+    if (found == compiledLoops.end()) {
+        std::shared_ptr<TypedLoop> loop = TypedLoop::compile(stmt);
+        if (loop) typedCounts.compiled++;
+        else typedCounts.rejected++;
+        found = compiledLoops.emplace(stmt.ptr(), std::make_pair(py::object(stmt), loop)).first;
+    }
+    TypedLoop* loop = found->second.second.get();
+    if (!loop || loop->disabled) return false;
+    if (!loop->run(*this)) {
+        typedCounts.guardFailures++;
+        return false;
+    }
+    return true;
+}
+
+py::dict ASTExecutor::typedLoopStats() const {
+    py::dict stats;
+    stats["compiled"] = typedCounts.compiled;
+    stats["rejected"] = typedCounts.rejected;
+    stats["runs"] = typedCounts.runs;
+    stats["guard_failures"] = typedCounts.guardFailures;
+    stats["deopts"] = typedCounts.deopts;
+    return stats;
+}
+
+void ASTExecutor::execLoopBoxed(const py::dict& stmt) {
+    long iterations = 0;
     while (true) {
         Value cond = evalExpr(stmt["condition"].cast<py::dict>());
-        bool isTrue = false;
-        if (cond.type == Value::BOOL) isTrue = std::get<bool>(cond.data);
         
-        if (!isTrue) break;
+        if (!cond.truthy()) break;
+        if (++iterations % GIL_YIELD_INTERVAL == 0) {
+            py::gil_scoped_release yield;
+        }
         
+        // Loop back-edge: every iteration gets a fresh scope
         auto oldScope = currentScope;
-        currentScope = std::make_shared<Scope>(oldScope);
+        enterScope(stmt["body"], stmt);
         
-        py::dict body = stmt["body"].cast<py::dict>();
-        if (body["type"].cast<std::string>() == "BLOCK") {
-             execBlock(body["statements"].cast<py::list>());
-        } else {
-             execStmt(body);
-        }
+        execBody(stmt["body"]);
         
         currentScope = oldScope;
     }
@@ -106,7 +360,15 @@ void ASTExecutor::execLoop(const py::dict& stmt) {
 
 void ASTExecutor::execPrint(const py::dict& stmt) {
     Value val = evalExpr(stmt["expr"].cast<py::dict>());
-    IO::print(val.toString());
+    printLine(val.toString());
+}
+
+void ASTExecutor::printLine(const std::string& text) {
+    if (output.is_none()) {
+        IO::print(text);
+    } else {
+        output.attr("write")(py::str(text + "\n"));
+    }
 }
 
 void ASTExecutor::execAssign(const py::dict& stmt) {
@@ -129,37 +391,309 @@ void ASTExecutor::execAssign(const py::dict& stmt) {
     }
 }
 
-void ASTExecutor::execAuto(const py::dict& stmt) {
+void ASTExecutor::execIndexAssign(const py::dict& stmt) {
+    std::string name = stmt["target"].cast<std::string>();
+    Value target;
+    if (stmt.contains("slot")) target = (*frame)[stmt["slot"].cast<size_t>()];
+    else if (stmt.contains("global")) target = globalScope->get(name);
+    else target = currentScope->get(name);
+    if (target.type != Value::ARRAY) throw std::runtime_error("Error: '" + name + "' is not an array");
+    Value index = evalExpr(stmt["index"].cast<py::dict>());
+    Array::set(target, index, evalExpr(stmt["value"].cast<py::dict>()));
+}
+
+void ASTExecutor::defineFunction(const py::dict& stmt, const std::shared_ptr<Scope>& globals, FunctionTable& table) {
+    auto func = std::make_shared<Function>();
+    func->name = stmt["name"].cast<std::string>();
+    func->node = stmt;
+    func->body = stmt["body"].cast<py::list>();
+    func->params = py::len(stmt["params"]);
+    func->slots = stmt["slots"].cast<size_t>();
+    for (auto name : stmt["locals"].cast<py::list>()) func->locals.push_back(name.cast<std::string>());
+    if (stmt.contains("pure") && stmt["pure"].cast<bool>()) func->memo.reset(new MemoCache());
+    func->globals = globals;
+    func->table = &table;
+    table[func->name] = func;
+}
+
+static bool exported(const std::string& name) {
+    return name.empty() || name[0] != '_';
+}
+
+void ASTExecutor::execImport(const py::dict& stmt) {
+    py::object loader = modulesModule().attr("loader")();
+    py::object dir = moduleDir.empty() ? py::object(py::none()) : py::object(py::str(moduleDir));
+    py::cpp_function run([this](const py::object& module) { return runModule(module); });
+    py::object module = loader.attr("load")(stmt["module"], dir, run);
+    Namespace& ns = moduleNamespace(module);
+    for (const auto& item : ns.globals->locals()) {
+        if (exported(item.first)) currentScope->define(item.first, item.second);
+    }
+    for (const auto& item : *ns.functions) {
+        if (exported(item.first)) (*functions)[item.first] = item.second;
+    }
+}
+
+py::dict ASTExecutor::runModule(const py::object& module) {
+    py::dict ast = module.attr("ast").cast<py::dict>();
+    py::list stmts = ast["statements"].cast<py::list>();
+    inferTypes(ast);
+    Namespace ns{module.attr("mtime").cast<double>(), std::make_shared<Scope>(), std::make_shared<FunctionTable>()};
+
+    auto outerGlobal = globalScope;
+    auto outerCurrent = currentScope;
+    FunctionTable* outerFunctions = functions;
+    std::string outerDir = moduleDir;
+    globalScope = currentScope = ns.globals;
+    functions = ns.functions.get();
+    moduleDir = baseDir(ast);
+    try {
+        if (governor) governor->tick((long)py::len(stmts), 0, *currentScope, frames);
+        execBlock(stmts);
+    } catch (...) {
+        globalScope = outerGlobal;
+        currentScope = outerCurrent;
+        functions = outerFunctions;
+        moduleDir = outerDir;
+        throw;
+    }
+    globalScope = outerGlobal;
+    currentScope = outerCurrent;
+    functions = outerFunctions;
+    moduleDir = outerDir;
+
+    py::dict variables;
+    for (const auto& item : ns.globals->locals()) variables[py::str(item.first)] = toPython(item.second);
+    modules[module.attr("path").cast<std::string>()] = ns;
+    return variables;
+}
+
+ASTExecutor::Namespace& ASTExecutor::moduleNamespace(const py::object& module) {
+    std::string path = module.attr("path").cast<std::string>();
+    double mtime = module.attr("mtime").cast<double>();
+    auto found = modules.find(path);
+    if (found != modules.end() && found->second.mtime == mtime) return found->second;
+
+    // Run by the other engine or by an earlier executor: rebuild from the record
+    Namespace ns{mtime, std::make_shared<Scope>(), std::make_shared<FunctionTable>()};
+    for (auto item : module.attr("variables").cast<py::dict>()) {
+        ns.globals->define(item.first.cast<std::string>(), fromPython(item.second));
+    }
+    py::dict loaded = modulesModule().attr("loader")().attr("modules");
+    for (auto imported : module.attr("imports").cast<py::list>()) {
+        Namespace& dep = moduleNamespace(loaded[imported]);
+        for (const auto& item : *dep.functions) {
+            if (exported(item.first)) (*ns.functions)[item.first] = item.second;
+        }
+    }
+    for (auto item : module.attr("functions").cast<py::dict>()) {
+        defineFunction(item.second.cast<py::dict>(), ns.globals, *ns.functions);
+    }
+    return modules[path] = ns;
+}
+
+Value ASTExecutor::call(const py::dict& node) {
+    std::string name = node["name"].cast<std::string>();
+    auto found = functions->find(name);
+    if (found == functions->end()) throw std::runtime_error("Error: function '" + name + "' not defined");
+    std::shared_ptr<Function> func = found->second; // keeps it alive if redefined during the call
+
+    std::vector<Value> args;
+    for (auto arg : node["args"].cast<py::list>()) args.push_back(evalExpr(arg.cast<py::dict>()));
+    if (args.size() != func->params) {
+        throw std::runtime_error("Error: " + name + "() takes " + std::to_string(func->params) +
+                                 " arguments, got " + std::to_string(args.size()));
+    }
+    long line = node.contains("line") ? node["line"].cast<long>() : 0;
+
+    std::string key;
+    bool cacheable = func->memo && MemoCache::makeKey(args, key);
+    if (cacheable) {
+        Value cached;
+        if (func->memo->get(key, cached)) return cached;
+    }
+    Value result = invoke(*func, args, line);
+    if (cacheable && result.type != Value::ARRAY) func->memo->put(key, result);
+    return result;
+}
+
+Value ASTExecutor::invoke(Function& func, std::vector<Value>& args, long line) {
+    if (callDepth >= MAX_CALL_DEPTH) {
+        throw std::runtime_error("Error: maximum call depth (" + std::to_string(MAX_CALL_DEPTH) +
+                                 ") exceeded in " + func.name + "()");
+    }
+    if (governor) governor->tick((long)py::len(func.body), line, *currentScope, frames);
+    if (instrumented) enterCall(func, line);
+    Profiler::Clock::time_point start = Profiler::Clock::now();
+
+    std::vector<Value> slots(std::move(args));
+    slots.resize(func.slots);
+    std::vector<Value>* outerFrame = frame;
+    auto outerGlobal = globalScope;
+    FunctionTable* outerFunctions = functions;
+    frame = &slots;
+    frames.push_back(frame);
+    globalScope = func.globals;
+    functions = func.table;
+    callDepth++;
+    Value result;
+    try {
+        execBlock(func.body);
+    } catch (ReturnSignal& ret) {
+        result = ret.value;
+    } catch (...) {
+        frames.pop_back();
+        frame = outerFrame;
+        globalScope = outerGlobal;
+        functions = outerFunctions;
+        callDepth--;
+        if (instrumented) leaveCall(start);
+        throw;
+    }
+    frames.pop_back();
+    frame = outerFrame;
+    globalScope = outerGlobal;
+    functions = outerFunctions;
+    callDepth--;
+    if (instrumented) leaveCall(start);
+    return result;
+}
+
+void ASTExecutor::reset() {
+    globalScope->clear();
+    currentScope = globalScope;
+    topFunctions.clear();
+    functions = &topFunctions;
+    frame = nullptr;
+    frames.clear();
+    callDepth = 0;
+    currentLine = 0;
+    moduleDir.clear();
+    governor.reset();
+    profiler.reset();
+    setDebugHook(py::none());
+    checkpointHook = py::none();
+    output = py::none();
+    typedLoops = true;
+    compiledLoops.clear();
+    typedCounts = TypedLoopCounts();
+}
+
+py::dict ASTExecutor::globalVariables() const {
+    py::dict variables;
+    for (const auto& item : globalScope->locals()) variables[py::str(item.first)] = toPython(item.second);
+    return variables;
+}
+
+void ASTExecutor::setGlobalVariables(const py::dict& variables) {
+    globalScope->clear();
+    for (auto item : variables) {
+        globalScope->define(item.first.cast<std::string>(), fromPython(item.second));
+    }
+}
+
+py::dict ASTExecutor::globalFunctions() const {
+    py::dict table;
+    for (const auto& item : topFunctions) {
+        py::object path = py::none();
+        if (item.second->globals != globalScope) {
+            // Imported: bound to the top level of the module that defined it
+            for (const auto& module : modules) {
+                if (module.second.globals == item.second->globals) path = py::str(module.first);
+            }
+        }
+        table[py::str(item.first)] = py::make_tuple(item.second->node, path);
+    }
+    return table;
+}
+
+void ASTExecutor::setGlobalFunctions(const py::dict& table) {
+    topFunctions.clear();
+    py::object loader = modulesModule().attr("loader")();
+    py::cpp_function run([this](const py::object& module) { return runModule(module); });
+    for (auto item : table) {
+        std::string name = item.first.cast<std::string>();
+        py::tuple entry = item.second.cast<py::tuple>();
+        py::dict node = entry[0].cast<py::dict>();
+        if (entry[1].is_none()) {
+            defineFunction(node, globalScope, topFunctions);
+            continue;
+        }
+        Namespace& ns = moduleNamespace(loader.attr("load")(entry[1], py::none(), run));
+        auto found = ns.functions->find(node["name"].cast<std::string>());
+        if (found == ns.functions->end()) {
+            throw std::runtime_error("Error: function '" + name + "' not defined");
+        }
+        topFunctions[name] = found->second;
+    }
+}
+
+py::dict ASTExecutor::memoStats() const {
+    py::dict stats;
+    for (const auto& item : *functions) {
+        const MemoCache* memo = item.second->memo.get();
+        if (!memo) continue;
+        py::dict s;
+        s["hits"] = memo->hits;
+        s["misses"] = memo->misses;
+        s["evictions"] = memo->evictions;
+        s["size"] = memo->size();
+        stats[py::str(item.first)] = s;
+    }
+    return stats;
+}
+
+py::object ASTExecutor::execAuto(const py::dict& stmt) {
     std::string funcName = stmt["function"].cast<std::string>();
     py::list argsAst = stmt["args"].cast<py::list>();
     py::list args;
     for (auto arg : argsAst) {
-        Value v = evalExpr(arg.cast<py::dict>());
-        if (v.type == Value::LONG) args.append(std::get<long>(v.data));
-        else if (v.type == Value::DOUBLE) args.append(std::get<double>(v.data));
-        else if (v.type == Value::STRING) args.append(std::get<std::string>(v.data));
-        else if (v.type == Value::BOOL) args.append(std::get<bool>(v.data));
-        else args.append(py::none());
+        args.append(toPython(evalExpr(arg.cast<py::dict>())));
     }
     
+    if (profiler) profiler->enter(currentLine, "auto:" + funcName);
+    Profiler::Clock::time_point start = Profiler::Clock::now();
+    py::object result = py::none();
     try {
-        // Need to ensure python path is correct
-        py::object auto_module = py::module::import("python.auto_api");
-        py::object api = auto_module.attr("AutoAPI")();
-        api.attr("execute")(funcName, args);
+        // The bridge is built on first use and kept, across reset() too
+        if (!autoApi) autoApi = py::module::import("python.auto_api").attr("AutoAPI")();
+        result = autoApi.attr("execute")(funcName, args);
     } catch (py::error_already_set& e) {
         std::cerr << "Python Error: " << e.what() << std::endl;
     }
+    if (profiler) profiler->leave(std::chrono::duration<double>(Profiler::Clock::now() - start).count());
+    return result;
+}
+
+Value ASTExecutor::evalAuto(const py::dict& expr) {
+    // Same conversion as auto_api.value(): numbers, strings, booleans and
+    // sequences of numbers; anything else is null
+    py::object result = execAuto(expr);
+    PyObject* p = result.ptr();
+    if (p == Py_None || PyBool_Check(p) || PyLong_Check(p) || PyFloat_Check(p) || PyUnicode_Check(p))
+        return fromPython(result);
+    if (PyList_Check(p) || PyTuple_Check(p)) {
+        std::vector<Value> elements;
+        for (auto item : result) {
+            PyObject* e = item.ptr();
+            if (PyBool_Check(e) || !(PyLong_Check(e) || PyFloat_Check(e))) return Value(nullptr);
+            elements.push_back(fromPython(item));
+        }
+        return Array::fromValues(elements);
+    }
+    return Value(nullptr);
 }
 
 Value ASTExecutor::evalExpr(const py::dict& expr) {
     std::string type = expr["type"].cast<std::string>();
     
-    if (type == "NUMBER") {
-        double d = expr["value"].cast<double>();
-        // Check if it's integer
-        if (d == (long)d) return Value((long)d);
-        return Value(d);
+    if (type == "SLOT") {
+        return (*frame)[expr["slot"].cast<size_t>()];
+    } else if (type == "NUMBER") {
+        // The lexer already typed the literal: int -> LONG, float -> DOUBLE
+        PyObject* v = expr["value"].ptr();
+        if (PyLong_Check(v)) return Value((long long)PyLong_AsLongLong(v));
+        return Value(PyFloat_AsDouble(v));
     } else if (type == "STRING") {
         return Value(expr["value"].cast<std::string>());
     } else if (type == "BOOL") {
@@ -170,6 +704,30 @@ Value ASTExecutor::evalExpr(const py::dict& expr) {
         return currentScope->get(expr["name"].cast<std::string>());
     } else if (type == "BINARY_OP") {
         return evalBinOp(expr);
+    } else if (type == "CALL") {
+        return call(expr);
+    } else if (type == "AUTO_CALL") {
+        return evalAuto(expr);
+    } else if (type == "GLOBAL") {
+        return globalScope->get(expr["name"].cast<std::string>());
+    } else if (type == "INDEX") {
+        Value target = evalExpr(expr["target"].cast<py::dict>());
+        if (target.type != Value::ARRAY) throw std::runtime_error("Error: only arrays can be indexed");
+        return Array::get(target, evalExpr(expr["index"].cast<py::dict>()));
+    } else if (type == "ARRAY") {
+        std::vector<Value> elements;
+        for (auto e : expr["elements"].cast<py::list>()) elements.push_back(evalExpr(e.cast<py::dict>()));
+        return Array::fromValues(elements);
+    } else if (type == "LEN") {
+        Value v = evalExpr(expr["expr"].cast<py::dict>());
+        if (v.type == Value::ARRAY) return Value(Array::length(v));
+        if (v.type == Value::STRING) {
+            // Characters, not bytes: count UTF-8 lead bytes
+            long long count = 0;
+            for (unsigned char c : v.text()) count += (c & 0xC0) != 0x80;
+            return Value(count);
+        }
+        throw std::runtime_error("Error: len() expects an array or a string");
     }
     
     return Value(nullptr);
@@ -178,21 +736,53 @@ Value ASTExecutor::evalExpr(const py::dict& expr) {
 Value ASTExecutor::evalBinOp(const py::dict& expr) {
     Value left = evalExpr(expr["left"].cast<py::dict>());
     Value right = evalExpr(expr["right"].cast<py::dict>());
-    std::string op = expr["op"].cast<std::string>();
-    
-    // Simplified implementation for numeric operations
-    if (left.type == Value::LONG && right.type == Value::LONG) {
-        long l = std::get<long>(left.data);
-        long r = std::get<long>(right.data);
-        if (op == "+") return Value(l + r);
-        if (op == "-") return Value(l - r);
-        if (op == "*") return Value(l * r);
-        if (op == "/") return Value(r == 0 ? 0 : l / r); // Handle div by zero
-        if (op == ">") return Value(l > r);
-        if (op == "<") return Value(l < r);
+    return binaryOp(expr["op"].cast<std::string>(), left, right);
+}
+
+Value ASTExecutor::binaryOp(const std::string& op, const Value& left, const Value& right) {
+    // String concatenation builds on the shared buffer, so loops that grow a
+    // string with `s = s + ...` stay linear
+    if (op == "+" && (left.type == Value::STRING || right.type == Value::STRING)) {
+        if (left.type == Value::STRING) {
+            if (right.type == Value::STRING) return Value::concat(left, right.text());
+            std::string rightText = right.toString();
+            return Value::concat(left, rightText);
+        }
+        std::string leftText = left.toString();
+        leftText.append(right.text().data(), right.text().size());
+        return Value(leftText);
+    }
+    if (left.type == Value::STRING && right.type == Value::STRING) {
+        std::string_view l = left.text();
+        std::string_view r = right.text();
         if (op == "==") return Value(l == r);
+        if (op == "!=" || op == "<>") return Value(l != r);
+        if (op == "<") return Value(l < r);
+        if (op == ">") return Value(l > r);
+        if (op == "<=") return Value(l <= r);
+        if (op == ">=") return Value(l >= r);
+    }
+
+    if (left.type == Value::ARRAY || right.type == Value::ARRAY) {
+        // Against null, == and != ask whether the value is null: an array never is
+        if ((left.type == Value::NONE || right.type == Value::NONE) && (op == "==" || op == "!=" || op == "<>"))
+            return Value(op != "==");
+        // One vectorized call for the whole array
+        return Array::elementwise(op, left, right);
+    }
+
+    if (Numeric::isNumeric(left) && Numeric::isNumeric(right)) {
+        if (op.size() == 1 && (op[0] == '+' || op[0] == '-' || op[0] == '*' || op[0] == '/')) {
+            return Numeric::arith(op[0], left, right);
+        }
+        return Numeric::compare(op, left, right);
+    }
+
+    // Equality across other types: null equals null, mismatched types differ
+    if (op == "==" || op == "!=" || op == "<>") {
+        bool equal = left.type == Value::NONE && right.type == Value::NONE;
+        return Value(op == "==" ? equal : !equal);
     }
-    // Add more types/ops support...
     
     return Value(nullptr);
 }
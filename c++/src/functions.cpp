@@ -0,0 +1,67 @@
+#include "../include/functions.h"
+
+namespace NovoLang {
+
+bool MemoCache::makeKey(const std::vector<Value>& args, std::string& key) {
+    key.clear();
+    for (const Value& v : args) {
+        key.push_back((char)v.type);
+        switch (v.type) {
+            case Value::LONG: {
+                long long n = std::get<long long>(v.data);
+                key.append((const char*)&n, sizeof(n));
+                break;
+            }
+            case Value::DOUBLE: {
+                double d = std::get<double>(v.data);
+                key.append((const char*)&d, sizeof(d));
+                break;
+            }
+            case Value::STRING: {
+                std::string_view text = v.text();
+                size_t length = text.size();
+                key.append((const char*)&length, sizeof(length));
+                key.append(text.data(), text.size());
+                break;
+            }
+            case Value::BOOL:
+                key.push_back(std::get<bool>(v.data) ? 1 : 0);
+                break;
+            case Value::NONE:
+                break;
+            case Value::ARRAY:
+                return false;
+        }
+    }
+    return true;
+}
+
+bool MemoCache::get(const std::string& key, Value& out) {
+    auto found = index.find(key);
+    if (found == index.end()) {
+        misses++;
+        return false;
+    }
+    hits++;
+    entries.splice(entries.begin(), entries, found->second);
+    out = found->second->second;
+    return true;
+}
+
+void MemoCache::put(const std::string& key, const Value& value) {
+    auto found = index.find(key);
+    if (found != index.end()) {
+        found->second->second = value;
+        entries.splice(entries.begin(), entries, found->second);
+        return;
+    }
+    entries.emplace_front(key, value);
+    index[key] = entries.begin();
+    if (index.size() > maxSize) {
+        index.erase(entries.back().first);
+        entries.pop_back();
+        evictions++;
+    }
+}
+
+}
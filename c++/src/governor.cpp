@@ -0,0 +1,60 @@
+#include "../include/governor.h"
+#include "../include/scope.h"
+
+namespace NovoLang {
+
+Governor::Governor(long maxSteps, double maxSeconds, long maxMemory, long checkInterval)
+    : maxSteps(maxSteps), maxSeconds(maxSeconds), maxMemory(maxMemory), checkInterval(checkInterval) {
+    reset();
+}
+
+void Governor::reset() {
+    steps = 0;
+    ticks = 0;
+    peakMemory = 0;
+    countdown = checkInterval;
+    finished = false;
+    started = Clock::now();
+}
+
+void Governor::stop() {
+    stopped = Clock::now();
+    finished = true;
+}
+
+double Governor::elapsed() const {
+    Clock::time_point end = finished ? stopped : Clock::now();
+    return std::chrono::duration<double>(end - started).count();
+}
+
+void Governor::tick(long count, long line, const Scope& scope, const Frames& frames) {
+    steps += count;
+    ticks += 1;
+    if (maxSteps > 0 && steps > maxSteps) {
+        throw LimitError("statement", line, std::to_string(steps) + " > " + std::to_string(maxSteps));
+    }
+    if (--countdown <= 0) {
+        countdown = checkInterval;
+        check(line, scope, frames);
+    }
+}
+
+void Governor::check(long line, const Scope& scope, const Frames& frames) {
+    if (maxSeconds > 0) {
+        double seconds = elapsed();
+        if (seconds > maxSeconds) {
+            throw LimitError("time", line, std::to_string(seconds) + "s > " + std::to_string(maxSeconds) + "s");
+        }
+    }
+    long memory = scope.memoryUsage();
+    for (const std::vector<Value>* slots : frames) memory += Scope::memoryUsage(*slots);
+    if (memory > peakMemory) peakMemory = memory;
+    if (maxMemory > 0) {
+        if (memory > maxMemory) {
+            throw LimitError("memory", line, std::to_string(memory) + " bytes > " + std::to_string(maxMemory) + " bytes");
+        }
+        if (memory * 2 > maxMemory) countdown = 1;
+    }
+}
+
+}
@@ -1,15 +1,22 @@
 #include "../include/io.h"
 #include <iostream>
+#include <pybind11/pybind11.h>
+
+namespace py = pybind11;
 
 namespace NovoLang {
 
+// Writes may block on a full pipe whose reader is a Python thread in this
+// process (daemon.run_captured), so they happen without the GIL.
 void IO::print(const std::string& msg) {
+    py::gil_scoped_release release;
     std::cout << msg << std::endl;
 }
 
 std::string IO::input(const std::string& prompt) {
+    py::gil_scoped_release release;
     if (!prompt.empty()) {
-        std::cout << prompt;
+        std::cout << prompt << std::flush;
     }
     std::string line;
     std::getline(std::cin, line);
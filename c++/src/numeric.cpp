@@ -0,0 +1,74 @@
+#include "../include/numeric.h"
+#include <climits>
+#include <cstdio>
+
+namespace NovoLang {
+namespace Numeric {
+
+static bool isIntegral(const Value& v) { return v.type == Value::LONG || v.type == Value::BOOL; }
+
+static long long toLong(const Value& v) {
+    if (v.type == Value::BOOL) return std::get<bool>(v.data) ? 1 : 0;
+    return std::get<long long>(v.data);
+}
+
+double toDouble(const Value& v) {
+    if (v.type == Value::DOUBLE) return std::get<double>(v.data);
+    return (double)toLong(v);
+}
+
+Value arith(char op, const Value& left, const Value& right) {
+    if (isIntegral(left) && isIntegral(right)) {
+        long long l = toLong(left);
+        long long r = toLong(right);
+        long long out;
+        switch (op) {
+            case '+': if (!addOverflows(l, r, &out)) return Value(out); break;
+            case '-': if (!subOverflows(l, r, &out)) return Value(out); break;
+            case '*': if (!mulOverflows(l, r, &out)) return Value(out); break;
+            case '/':
+                if (r == 0) return Value(0LL);
+                if (!(l == LLONG_MIN && r == -1) && l % r == 0) return Value(l / r);
+                break;
+        }
+        // Not representable as LONG: fall through to DOUBLE
+    }
+    double l = toDouble(left);
+    double r = toDouble(right);
+    switch (op) {
+        case '+': return Value(l + r);
+        case '-': return Value(l - r);
+        case '*': return Value(l * r);
+        case '/': return r == 0 ? Value(0LL) : Value(l / r);
+    }
+    return Value(nullptr);
+}
+
+template <typename T>
+static Value compareAs(const std::string& op, T l, T r) {
+    if (op == "<") return Value(l < r);
+    if (op == ">") return Value(l > r);
+    if (op == "<=") return Value(l <= r);
+    if (op == ">=") return Value(l >= r);
+    if (op == "==") return Value(l == r);
+    if (op == "!=" || op == "<>") return Value(l != r);
+    return Value(nullptr);
+}
+
+Value compare(const std::string& op, const Value& left, const Value& right) {
+    if (isIntegral(left) && isIntegral(right)) {
+        return compareAs(op, toLong(left), toLong(right));
+    }
+    return compareAs(op, toDouble(left), toDouble(right));
+}
+
+std::string formatDouble(double d) {
+    char buf[32];
+    std::snprintf(buf, sizeof(buf), "%.15g", d);
+    std::string text(buf);
+    if (text.find_first_of(".en") == std::string::npos) text += ".0";
+    return text;
+}
+
+}
+}
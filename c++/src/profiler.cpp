@@ -0,0 +1,35 @@
+#include "../include/profiler.h"
+
+namespace NovoLang {
+
+void Profiler::enter(long line, const std::string& kind) {
+    Key key(line, kind);
+    keys.push_back(key);
+    labels.push_back(kind + "@" + std::to_string(line));
+    childTime.push_back(0.0);
+    active[key] += 1;
+}
+
+void Profiler::leave(double elapsed) {
+    Key key = keys.back();
+    keys.pop_back();
+    double child = childTime.back();
+    childTime.pop_back();
+    childTime.back() += elapsed;
+    double selfTime = elapsed - child;
+
+    StmtStat& stat = stats[key];
+    stat.count += 1;
+    stat.selfTime += selfTime;
+    if (--active[key] == 0) stat.total += elapsed;
+
+    std::string stack;
+    for (size_t i = 0; i < labels.size(); ++i) {
+        if (i) stack += ";";
+        stack += labels[i];
+    }
+    stacks[stack] += selfTime;
+    labels.pop_back();
+}
+
+}
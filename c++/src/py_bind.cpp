@@ -29,9 +29,38 @@ namespace NovoLang {
 PYBIND11_MODULE(novolang_core, m) {
     // m.doc() = "NovoLang C++ Execution Engine"; // doc() might not be in mock
 
+    py::register_exception<LimitError>(m, "LimitExceeded", PyExc_RuntimeError);
+
     py::class_<ASTExecutor>(m, "ASTExecutor")
         .def(py::init<>())
-        .def("execute", &ASTExecutor::execute, "Execute AST");
+        .def("execute", &ASTExecutor::execute, "Execute AST")
+        .def("execute_stream", &ASTExecutor::executeStream,
+             "Execute top-level statements as an iterable yields them; path is the script file or None",
+             py::arg("statements"), py::arg("path") = py::none())
+        .def("enable_profiling", &ASTExecutor::enableProfiling, "Record per-statement timings on the next execute()")
+        .def("profile_data", &ASTExecutor::profileData, "Profiling results: {'stats': [(line, kind, count, total, self)], 'stacks': {...}, 'wall': s}")
+        .def("set_limits", &ASTExecutor::setLimits, "Statement, time (s) and memory (bytes) budget; 0 disables a limit",
+             py::arg("max_steps") = 0, py::arg("max_seconds") = 0.0, py::arg("max_memory") = 0)
+        .def("usage", &ASTExecutor::usage, "Resource usage of the last execute() under set_limits()")
+        .def("memo_stats", &ASTExecutor::memoStats, "Memo cache stats of pure functions: {name: {'hits', 'misses', 'evictions', 'size'}}")
+        .def("reset", &ASTExecutor::reset, "Back to a new executor's state, keeping its allocations")
+        .def("global_variables", &ASTExecutor::globalVariables, "Top-level variables as Python values")
+        .def("set_global_variables", &ASTExecutor::setGlobalVariables, "Replace the top-level variables with Python values")
+        .def("global_functions", &ASTExecutor::globalFunctions,
+             "Top-level functions: {name: (FUNCTION_DEF node, defining module's path or None)}")
+        .def("set_global_functions", &ASTExecutor::setGlobalFunctions,
+             "Replace the top-level functions, loading the modules that define imported ones")
+        .def_readwrite("checkpoint_hook", &ASTExecutor::checkpointHook, "Called with each CHECKPOINT statement executed; None to ignore them")
+        .def_readwrite("output", &ASTExecutor::output, "File-like object print writes to; None for stdout")
+        .def_readwrite("raise_errors", &ASTExecutor::raiseErrors, "Raise runtime errors instead of printing them")
+        .def_property("debug_hook", &ASTExecutor::getDebugHook, &ASTExecutor::setDebugHook,
+                      "Called as hook(stmt, depth) before each statement; None for the uninstrumented dispatch")
+        .def("debug_scopes", &ASTExecutor::debugScopes, "Variables visible at the current statement, innermost first: [(label, {name: value})]")
+        .def("debug_stack", &ASTExecutor::debugStack, "Calls in progress while debugging, outermost first: [(function, call line)]")
+        .def_readwrite("typed_loops", &ASTExecutor::typedLoops,
+                       "Run loops annotated by python/type_inference.py on unboxed locals (default True)")
+        .def("typed_loop_stats", &ASTExecutor::typedLoopStats,
+             "Typed loops: {'compiled', 'rejected', 'runs', 'guard_failures', 'deopts'}");
 }
 
 }
@@ -1,18 +1,56 @@
 #include "../include/scope.h"
+#include "../include/numeric.h"
+#include "../include/array.h"
 
 namespace NovoLang {
 
 std::string Value::toString() const {
     switch (type) {
-        case LONG: return std::to_string(std::get<long>(data));
-        case DOUBLE: return std::to_string(std::get<double>(data));
-        case STRING: return std::get<std::string>(data);
+        case LONG: return std::to_string(std::get<long long>(data));
+        case DOUBLE: return Numeric::formatDouble(std::get<double>(data));
+        case STRING: return std::string(text());
         case BOOL: return std::get<bool>(data) ? "真" : "假"; // Requirement 47
         case NONE: return "空";
+        case ARRAY: return Array::toString(*this);
     }
     return "";
 }
 
+bool Value::truthy() const {
+    switch (type) {
+        case LONG: return std::get<long long>(data) != 0;
+        case DOUBLE: return std::get<double>(data) != 0.0;
+        case STRING: return std::get<StrRef>(data).length > 0;
+        case BOOL: return std::get<bool>(data);
+        case NONE: return false;
+        case ARRAY: return Array::length(*this) > 0;
+    }
+    return false;
+}
+
+Value Value::concat(const Value& left, std::string_view right) {
+    const StrRef& l = std::get<StrRef>(left.data);
+    std::string& buf = *l.buf;
+    Value result;
+    result.type = STRING;
+    if (l.length == buf.size()) {
+        // right may point into buf itself (s + s); copy it before growing buf
+        if (right.data() >= buf.data() && right.data() < buf.data() + buf.size()) {
+            std::string copy(right);
+            buf.append(copy);
+        } else {
+            buf.append(right.data(), right.size());
+        }
+        result.data = StrRef{l.buf, l.length + right.size()};
+    } else {
+        std::string text(l.view());
+        text.append(right.data(), right.size());
+        size_t length = text.size();
+        result.data = StrRef{std::make_shared<std::string>(std::move(text)), length};
+    }
+    return result;
+}
+
 Scope::Scope(std::shared_ptr<Scope> parent) : parent(parent) {}
 
 void Scope::define(const std::string& name, Value value) {
@@ -39,8 +77,37 @@ Value Scope::get(const std::string& name) {
     }
 }
 
+Value* Scope::find(const std::string& name) {
+    for (Scope* scope = this; scope; scope = scope->parent.get()) {
+        auto found = scope->variables.find(name);
+        if (found != scope->variables.end()) return &found->second;
+    }
+    return nullptr;
+}
+
 bool Scope::existsLocal(const std::string& name) {
     return variables.find(name) != variables.end();
 }
 
+static long valueMemory(const Value& value) {
+    if (value.type == Value::STRING) return (long)std::get<StrRef>(value.data).length;
+    if (value.type == Value::ARRAY) return Array::nbytes(value);
+    return 0;
+}
+
+long Scope::memoryUsage() const {
+    long total = 0;
+    for (const auto& item : variables) {
+        total += (long)(sizeof(item) + item.first.capacity()) + valueMemory(item.second);
+    }
+    if (parent) total += parent->memoryUsage();
+    return total;
+}
+
+long Scope::memoryUsage(const std::vector<Value>& slots) {
+    long total = 0;
+    for (const Value& value : slots) total += (long)sizeof(value) + valueMemory(value);
+    return total;
+}
+
 }
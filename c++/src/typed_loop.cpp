@@ -0,0 +1,659 @@
+#include "../include/typed_loop.h"
+#include "../include/numeric.h"
+#include "../include/array.h"
+#include <algorithm>
+#include <stdexcept>
+#include <unordered_map>
+
+namespace NovoLang {
+
+typedef TypedLoop::Kind Kind;
+
+namespace {
+
+// Thrown by a long operation whose result does not fit in 64 bits
+struct Deopt {
+    bool resumed = false; // the statement that threw has been finished boxed
+};
+
+enum class Compare : unsigned char { LT, GT, LE, GE, EQ, NE };
+
+template <typename T>
+bool compare(Compare op, T l, T r) {
+    switch (op) {
+        case Compare::LT: return l < r;
+        case Compare::GT: return l > r;
+        case Compare::LE: return l <= r;
+        case Compare::GE: return l >= r;
+        case Compare::EQ: return l == r;
+        case Compare::NE: return l != r;
+    }
+    return false;
+}
+
+bool numeric(Kind kind) {
+    return kind == Kind::LONG || kind == Kind::DOUBLE || kind == Kind::NUMBER || kind == Kind::BOOL;
+}
+
+bool isIntegral(const Value& v) {
+    return v.type == Value::LONG || v.type == Value::BOOL;
+}
+
+long long asLong(const Value& v) {
+    return v.type == Value::BOOL ? (std::get<bool>(v.data) ? 1 : 0) : std::get<long long>(v.data);
+}
+
+// A value of kind `from` can be stored in a variable of kind `to`
+bool fits(Kind from, Kind to) {
+    if (to == Kind::BOXED || to == from) return true;
+    return to == Kind::NUMBER && (from == Kind::LONG || from == Kind::DOUBLE);
+}
+
+bool holds(Kind kind, const Value& value) {
+    switch (kind) {
+        case Kind::LONG: return value.type == Value::LONG;
+        case Kind::DOUBLE: return value.type == Value::DOUBLE;
+        case Kind::NUMBER: return value.type == Value::LONG || value.type == Value::DOUBLE;
+        case Kind::BOOL: return value.type == Value::BOOL;
+        case Kind::STRING: return value.type == Value::STRING;
+        case Kind::BOXED: return true;
+    }
+    return false;
+}
+
+}
+
+struct TypedLoop::Var {
+    enum Storage { SCOPE, SLOT, GLOBAL } storage;
+    std::string name;
+    size_t slot = 0;
+    Kind kind = Kind::BOXED;
+    bool assigned = false; // the loop assigns it
+    // May be missing when the loop starts: its first use is an assignment at
+    // the top level of `owner` and every other use is inside owner
+    bool local = false;
+    const Block* owner = nullptr;
+};
+
+struct TypedLoop::Expr {
+    enum Op : unsigned char { CONST, VAR, ARITH, CONCAT, COMPARE, BOXED_ARITH, BINARY, INDEX, ARRAY, LEN } op;
+    Kind kind = Kind::BOXED;
+    Kind operands = Kind::BOXED;  // COMPARE: compared as LONG, DOUBLE, NUMBER or STRING
+    char arith = 0;               // ARITH, BOXED_ARITH: + - * /
+    Compare compare = Compare::EQ;
+    std::string binary;           // BINARY: the operator, for ASTExecutor::binaryOp
+    int var = -1;
+    long long l = 0;
+    double d = 0.0;
+    bool b = false;
+    Value constant;
+    std::unique_ptr<Expr> left, right;
+    std::vector<std::unique_ptr<Expr>> elements;
+};
+
+struct TypedLoop::Block {
+    std::vector<Stmt> stmts;
+    std::vector<int> locals; // scope variables that may live in this block's scope
+};
+
+struct TypedLoop::Stmt {
+    enum Type : unsigned char { ASSIGN, INDEX_ASSIGN, PRINT, IF, LOOP, BLOCK } type;
+    py::dict node;                       // run boxed after a deoptimization
+    int var = -1;
+    std::unique_ptr<Expr> value, index;  // value is the condition of IF and LOOP
+    std::unique_ptr<Block> body, elseBody;
+};
+
+TypedLoop::~TypedLoop() {}
+
+class TypedLoop::Compiler {
+public:
+    Compiler(TypedLoop& loop, const py::dict& types) : loop(loop), types(types) {}
+
+    // Null if node is not something typed loops run
+    std::unique_ptr<Stmt> stmt(const py::dict& node) {
+        std::string type = node["type"].cast<std::string>();
+        auto s = std::make_unique<Stmt>();
+        s->node = node;
+        if (type == "ASSIGNMENT" || type == "SLOT_ASSIGNMENT") {
+            s->type = Stmt::ASSIGN;
+            if (!(s->value = expr(node["value"].cast<py::dict>()))) return nullptr;
+            bool slot = type == "SLOT_ASSIGNMENT";
+            s->var = variable(slot ? Var::SLOT : Var::SCOPE, node["target"].cast<std::string>(),
+                              slot ? node["slot"].cast<size_t>() : 0, true);
+            if (!fits(s->value->kind, loop.vars[s->var].kind)) return nullptr;
+        } else if (type == "INDEX_ASSIGNMENT") {
+            s->type = Stmt::INDEX_ASSIGN;
+            Var::Storage storage = node.contains("slot") ? Var::SLOT : node.contains("global") ? Var::GLOBAL : Var::SCOPE;
+            s->var = variable(storage, node["target"].cast<std::string>(),
+                              storage == Var::SLOT ? node["slot"].cast<size_t>() : 0, false);
+            if (loop.vars[s->var].kind != Kind::BOXED) return nullptr; // never an array
+            if (!(s->index = expr(node["index"].cast<py::dict>()))) return nullptr;
+            if (!(s->value = expr(node["value"].cast<py::dict>()))) return nullptr;
+        } else if (type == "PRINT") {
+            s->type = Stmt::PRINT;
+            if (!(s->value = expr(node["expr"].cast<py::dict>()))) return nullptr;
+        } else if (type == "IF") {
+            s->type = Stmt::IF;
+            if (!(s->value = expr(node["condition"].cast<py::dict>()))) return nullptr;
+            if (!(s->body = block(node["body"]))) return nullptr;
+            if (node.contains("else_body") && !node["else_body"].is_none()) {
+                if (!(s->elseBody = block(node["else_body"]))) return nullptr;
+            }
+        } else if (type == "LOOP") {
+            s->type = Stmt::LOOP;
+            if (!(s->value = expr(node["condition"].cast<py::dict>()))) return nullptr;
+            if (!(s->body = block(node["body"]))) return nullptr;
+        } else if (type == "BLOCK") {
+            s->type = Stmt::BLOCK;
+            if (!(s->body = block(node["statements"]))) return nullptr;
+        } else {
+            return nullptr;
+        }
+        return s;
+    }
+
+private:
+    TypedLoop& loop;
+    py::dict types;
+    std::unordered_map<std::string, int> indexes; // storage letter + name -> vars index
+    std::vector<Block*> open;                     // blocks being compiled, outermost first
+
+    // Statements of a body: a list, a BLOCK dict or one statement (as execBody takes them)
+    std::unique_ptr<Block> block(const py::handle& body) {
+        auto b = std::make_unique<Block>();
+        py::list stmts;
+        if (py::isinstance<py::list>(body)) {
+            stmts = body.cast<py::list>();
+        } else {
+            py::dict stmt = body.cast<py::dict>();
+            if (stmt["type"].cast<std::string>() == "BLOCK") stmts = stmt["statements"].cast<py::list>();
+            else stmts.append(stmt);
+        }
+        open.push_back(b.get());
+        for (auto item : stmts) {
+            std::unique_ptr<Stmt> s = stmt(item.cast<py::dict>());
+            if (!s) return nullptr;
+            b->stmts.push_back(std::move(*s));
+        }
+        open.pop_back();
+        return b;
+    }
+
+    // Index of a variable in loop.vars, recording this use of it
+    int variable(Var::Storage storage, const std::string& name, size_t slot, bool assignment) {
+        std::string key = "cst"[storage] + name;
+        auto found = indexes.find(key);
+        if (found == indexes.end()) {
+            Var var;
+            var.storage = storage;
+            var.name = name;
+            var.slot = slot;
+            if (types.contains(name.c_str())) {
+                std::string kind = types[name.c_str()].cast<std::string>();
+                if (kind == "long") var.kind = Kind::LONG;
+                else if (kind == "double") var.kind = Kind::DOUBLE;
+                else if (kind == "number") var.kind = Kind::NUMBER;
+                else if (kind == "bool") var.kind = Kind::BOOL;
+                else if (kind == "string") var.kind = Kind::STRING;
+            }
+            if (assignment && storage != Var::GLOBAL && !open.empty()) {
+                var.local = true;
+                var.owner = open.back();
+                if (storage == Var::SCOPE) open.back()->locals.push_back((int)loop.vars.size());
+            }
+            loop.vars.push_back(var);
+            found = indexes.emplace(key, (int)loop.vars.size() - 1).first;
+        } else {
+            Var& var = loop.vars[found->second];
+            if (var.local && std::find(open.begin(), open.end(), var.owner) == open.end()) var.local = false;
+        }
+        if (assignment) loop.vars[found->second].assigned = true;
+        return found->second;
+    }
+
+    std::unique_ptr<Expr> expr(const py::dict& node) {
+        std::string type = node["type"].cast<std::string>();
+        auto e = std::make_unique<Expr>();
+        if (type == "NUMBER") {
+            e->op = Expr::CONST;
+            PyObject* v = node["value"].ptr();
+            if (PyLong_Check(v)) {
+                e->kind = Kind::LONG;
+                e->l = PyLong_AsLongLong(v);
+            } else {
+                e->kind = Kind::DOUBLE;
+                e->d = PyFloat_AsDouble(v);
+            }
+        } else if (type == "STRING") {
+            e->op = Expr::CONST;
+            e->kind = Kind::STRING;
+            e->constant = Value(node["value"].cast<std::string>());
+        } else if (type == "BOOL") {
+            e->op = Expr::CONST;
+            e->kind = Kind::BOOL;
+            e->b = node["value"].cast<bool>();
+        } else if (type == "NULL") {
+            e->op = Expr::CONST;
+        } else if (type == "IDENTIFIER" || type == "SLOT" || type == "GLOBAL") {
+            e->op = Expr::VAR;
+            Var::Storage storage = type == "SLOT" ? Var::SLOT : type == "GLOBAL" ? Var::GLOBAL : Var::SCOPE;
+            e->var = variable(storage, node["name"].cast<std::string>(),
+                              storage == Var::SLOT ? node["slot"].cast<size_t>() : 0, false);
+            e->kind = loop.vars[e->var].kind;
+        } else if (type == "BINARY_OP") {
+            if (!(e->left = expr(node["left"].cast<py::dict>()))) return nullptr;
+            if (!(e->right = expr(node["right"].cast<py::dict>()))) return nullptr;
+            binary(*e, node["op"].cast<std::string>());
+        } else if (type == "INDEX") {
+            e->op = Expr::INDEX;
+            if (!(e->left = expr(node["target"].cast<py::dict>()))) return nullptr;
+            if (!(e->right = expr(node["index"].cast<py::dict>()))) return nullptr;
+        } else if (type == "ARRAY") {
+            e->op = Expr::ARRAY;
+            for (auto element : node["elements"].cast<py::list>()) {
+                e->elements.push_back(expr(element.cast<py::dict>()));
+                if (!e->elements.back()) return nullptr;
+            }
+        } else if (type == "LEN") {
+            e->op = Expr::LEN;
+            e->kind = Kind::LONG;
+            if (!(e->left = expr(node["expr"].cast<py::dict>()))) return nullptr;
+        } else {
+            return nullptr; // CALL and AUTO_CALL
+        }
+        return e;
+    }
+
+    // The same rules as numeric.h and ASTExecutor::binaryOp, decided once
+    static void binary(Expr& e, const std::string& op) {
+        Kind l = e.left->kind, r = e.right->kind;
+        e.binary = op;
+        if (op == "+" && (l == Kind::STRING || (r == Kind::STRING && l != Kind::BOXED))) {
+            e.op = Expr::CONCAT;
+            e.kind = Kind::STRING;
+        } else if (op.size() == 1 && (op[0] == '+' || op[0] == '-' || op[0] == '*' || op[0] == '/') &&
+                   numeric(l) && numeric(r)) {
+            e.arith = op[0];
+            if (op[0] != '/' && (l == Kind::DOUBLE || r == Kind::DOUBLE)) {
+                e.op = Expr::ARITH;
+                e.kind = Kind::DOUBLE;
+            } else if (op[0] != '/' && l != Kind::NUMBER && r != Kind::NUMBER) {
+                e.op = Expr::ARITH;
+                e.kind = Kind::LONG;
+            } else {
+                e.op = Expr::BOXED_ARITH; // `/` is LONG only when exact, and x / 0 is LONG 0
+                e.kind = Kind::NUMBER;
+            }
+        } else if ((numeric(l) && numeric(r)) || (l == Kind::STRING && r == Kind::STRING)) {
+            if (op == "<") e.compare = Compare::LT;
+            else if (op == ">") e.compare = Compare::GT;
+            else if (op == "<=") e.compare = Compare::LE;
+            else if (op == ">=") e.compare = Compare::GE;
+            else if (op == "==") e.compare = Compare::EQ;
+            else if (op == "!=" || op == "<>") e.compare = Compare::NE;
+            else {
+                e.op = Expr::BINARY;
+                return;
+            }
+            e.op = Expr::COMPARE;
+            e.kind = Kind::BOOL;
+            e.operands = l == Kind::STRING ? Kind::STRING
+                       : l == Kind::DOUBLE || r == Kind::DOUBLE ? Kind::DOUBLE
+                       : l == Kind::NUMBER || r == Kind::NUMBER ? Kind::NUMBER : Kind::LONG;
+        } else {
+            e.op = Expr::BINARY;
+        }
+    }
+};
+
+std::shared_ptr<TypedLoop> TypedLoop::compile(const py::dict& node) {
+    auto loop = std::make_shared<TypedLoop>();
+    loop->node = node;
+    Compiler compiler(*loop, node["types"].cast<py::dict>());
+    loop->loop = compiler.stmt(node);
+    if (!loop->loop) return nullptr;
+    return loop;
+}
+
+class TypedLoop::Run {
+public:
+    Run(TypedLoop& loop, ASTExecutor& ex)
+        : entry(ex.currentScope), vars(loop.vars), ex(ex),
+          cells(vars.size()), set(vars.size(), 0), inner(vars.size(), 0) {}
+
+    bool materialized = false;
+    std::shared_ptr<Scope> entry;
+
+    // Unboxes the variables; false if one is missing or not of its kind
+    bool load() {
+        for (size_t v = 0; v < vars.size(); v++) {
+            const Var& var = vars[v];
+            Value* value = nullptr;
+            if (var.storage == Var::SLOT) {
+                value = &(*ex.frame)[var.slot];
+                // An unassigned slot holds null
+                if (value->type == Value::NONE && var.kind != Kind::BOXED) value = nullptr;
+            } else {
+                value = (var.storage == Var::GLOBAL ? ex.globalScope : entry)->find(var.name);
+            }
+            if (value) {
+                if (!holds(var.kind, *value)) return false;
+                Cell& cell = cells[v];
+                switch (var.kind) {
+                    case Kind::LONG: cell.l = std::get<long long>(value->data); break;
+                    case Kind::DOUBLE: cell.d = std::get<double>(value->data); break;
+                    case Kind::BOOL: cell.b = std::get<bool>(value->data); break;
+                    default: cell.v = *value; break;
+                }
+                set[v] = 1;
+            } else if (var.local) {
+                inner[v] = 1;
+            } else {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    // Writes assigned variables back to their scopes and slots
+    void store() {
+        for (size_t v = 0; v < vars.size(); v++) {
+            const Var& var = vars[v];
+            if (!var.assigned || !set[v]) continue;
+            if (var.storage == Var::SLOT) (*ex.frame)[var.slot] = boxed(v);
+            else if (var.storage == Var::SCOPE && !inner[v]) entry->assign(var.name, boxed(v));
+        }
+    }
+
+    // Puts the tree walker's state back as it would be here: variables in
+    // place and a scope for each block in progress, holding its locals
+    void materialize() {
+        store();
+        materialized = true;
+        for (const Block* b : active) {
+            ex.currentScope = std::make_shared<Scope>(ex.currentScope);
+            scopes.push_back(ex.currentScope);
+            for (int v : b->locals) {
+                if (inner[v] && set[v]) ex.currentScope->define(vars[v].name, boxed(v));
+            }
+        }
+    }
+
+    void runLoop(const Stmt& s) {
+        long iterations = 0;
+        while (truthy(*s.value)) {
+            if (++iterations % GIL_YIELD_INTERVAL == 0) {
+                py::gil_scoped_release yield;
+            }
+            block(*s.body);
+        }
+    }
+
+private:
+    struct Cell {
+        long long l = 0;
+        double d = 0.0;
+        bool b = false;
+        Value v;
+    };
+
+    const std::vector<Var>& vars;
+    ASTExecutor& ex;
+    std::vector<Cell> cells;
+    std::vector<char> set;    // holds a value (locals: assigned in this run of their block)
+    std::vector<char> inner;  // missing when the loop started
+    std::vector<const Block*> active;              // blocks in progress, outermost first
+    std::vector<std::shared_ptr<Scope>> scopes;    // their scopes, once materialized
+
+    Value boxed(size_t v) const {
+        switch (vars[v].kind) {
+            case Kind::LONG: return Value(cells[v].l);
+            case Kind::DOUBLE: return Value(cells[v].d);
+            case Kind::BOOL: return Value(cells[v].b);
+            default: return cells[v].v;
+        }
+    }
+
+    void block(const Block& b) {
+        // A fresh scope each time for the tree walker: its locals start unset
+        for (int v : b.locals) {
+            if (inner[v]) set[v] = 0;
+        }
+        active.push_back(&b);
+        size_t i = 0;
+        try {
+            for (; i < b.stmts.size(); i++) stmt(b.stmts[i]);
+        } catch (Deopt& deopt) {
+            resume(b, i, deopt);
+            throw;
+        }
+        active.pop_back();
+    }
+
+    // After a Deopt from statement i of b (or from a block inside it): the
+    // tree walker finishes b, then its caller resumes the enclosing block
+    void resume(const Block& b, size_t i, Deopt& deopt) {
+        size_t depth = active.size() - 1;
+        const Stmt& s = b.stmts[i];
+        if (!deopt.resumed) {
+            // s threw before doing anything: run it again, boxed
+            materialize();
+            deopt.resumed = true;
+            if (s.type == Stmt::LOOP) ex.execLoopBoxed(s.node);
+            else ex.execStmt(s.node);
+        } else if (s.type == Stmt::LOOP) {
+            // Its body finished the iteration: back to the condition
+            ex.execLoopBoxed(s.node);
+        }
+        for (i++; i < b.stmts.size(); i++) ex.execStmt(b.stmts[i].node);
+        ex.currentScope = depth ? scopes[depth - 1] : entry;
+        active.pop_back();
+    }
+
+    void stmt(const Stmt& s) {
+        switch (s.type) {
+            case Stmt::ASSIGN: {
+                Cell& cell = cells[s.var];
+                switch (vars[s.var].kind) {
+                    case Kind::LONG: cell.l = evalLong(*s.value); break;
+                    case Kind::DOUBLE: cell.d = evalDouble(*s.value); break;
+                    case Kind::BOOL: cell.b = evalBool(*s.value); break;
+                    default: cell.v = box(*s.value); break;
+                }
+                set[s.var] = 1;
+                break;
+            }
+            case Stmt::INDEX_ASSIGN: {
+                Value target = cells[s.var].v;
+                if (target.type != Value::ARRAY) throw std::runtime_error("Error: '" + vars[s.var].name + "' is not an array");
+                Value index = box(*s.index);
+                Array::set(target, index, box(*s.value));
+                break;
+            }
+            case Stmt::PRINT:
+                ex.printLine(box(*s.value).toString());
+                break;
+            case Stmt::IF:
+                if (truthy(*s.value)) block(*s.body);
+                else if (s.elseBody) block(*s.elseBody);
+                break;
+            case Stmt::LOOP:
+                runLoop(s);
+                break;
+            case Stmt::BLOCK:
+                block(*s.body);
+                break;
+        }
+    }
+
+    bool truthy(const Expr& e) {
+        switch (e.kind) {
+            case Kind::LONG: return evalLong(e) != 0;
+            case Kind::DOUBLE: return evalDouble(e) != 0.0;
+            case Kind::BOOL: return evalBool(e);
+            default: return evalValue(e).truthy();
+        }
+    }
+
+    Value box(const Expr& e) {
+        switch (e.kind) {
+            case Kind::LONG: return Value(evalLong(e));
+            case Kind::DOUBLE: return Value(evalDouble(e));
+            case Kind::BOOL: return Value(evalBool(e));
+            default: return evalValue(e);
+        }
+    }
+
+    // A LONG or BOOL operand as a long
+    long long integral(const Expr& e) {
+        return e.kind == Kind::BOOL ? (evalBool(e) ? 1 : 0) : evalLong(e);
+    }
+
+    double number(const Expr& e) {
+        if (e.kind == Kind::DOUBLE) return evalDouble(e);
+        if (e.kind == Kind::NUMBER) return Numeric::toDouble(evalValue(e));
+        return (double)integral(e);
+    }
+
+    long long evalLong(const Expr& e) {
+        switch (e.op) {
+            case Expr::CONST: return e.l;
+            case Expr::VAR: return cells[e.var].l;
+            case Expr::ARITH: {
+                long long l = integral(*e.left);
+                long long r = integral(*e.right);
+                long long out;
+                bool overflow = e.arith == '+' ? Numeric::addOverflows(l, r, &out)
+                              : e.arith == '-' ? Numeric::subOverflows(l, r, &out)
+                              : Numeric::mulOverflows(l, r, &out);
+                if (overflow) throw Deopt();
+                return out;
+            }
+            case Expr::LEN: {
+                Value v = box(*e.left);
+                if (v.type == Value::ARRAY) return Array::length(v);
+                if (v.type == Value::STRING) {
+                    // Characters, not bytes: count UTF-8 lead bytes
+                    long long count = 0;
+                    for (unsigned char c : v.text()) count += (c & 0xC0) != 0x80;
+                    return count;
+                }
+                throw std::runtime_error("Error: len() expects an array or a string");
+            }
+            default: return 0;
+        }
+    }
+
+    double evalDouble(const Expr& e) {
+        switch (e.op) {
+            case Expr::CONST: return e.d;
+            case Expr::VAR: return cells[e.var].d;
+            case Expr::ARITH: {
+                double l = number(*e.left);
+                double r = number(*e.right);
+                return e.arith == '+' ? l + r : e.arith == '-' ? l - r : l * r;
+            }
+            default: return 0.0;
+        }
+    }
+
+    bool evalBool(const Expr& e) {
+        switch (e.op) {
+            case Expr::CONST: return e.b;
+            case Expr::VAR: return cells[e.var].b;
+            case Expr::COMPARE:
+                if (e.operands == Kind::LONG) {
+                    long long l = integral(*e.left);
+                    return compare(e.compare, l, integral(*e.right));
+                }
+                if (e.operands == Kind::DOUBLE) {
+                    double l = number(*e.left);
+                    return compare(e.compare, l, number(*e.right));
+                }
+                if (e.operands == Kind::NUMBER) {
+                    // As Numeric::compare: longs exactly, anything else as doubles
+                    Value l = box(*e.left);
+                    Value r = box(*e.right);
+                    if (isIntegral(l) && isIntegral(r)) return compare(e.compare, asLong(l), asLong(r));
+                    return compare(e.compare, Numeric::toDouble(l), Numeric::toDouble(r));
+                }
+                {
+                    Value l = evalValue(*e.left);
+                    Value r = evalValue(*e.right);
+                    return compare(e.compare, l.text(), r.text());
+                }
+            default: return false;
+        }
+    }
+
+    // Expressions of kind STRING or BOXED
+    Value evalValue(const Expr& e) {
+        switch (e.op) {
+            case Expr::CONST: return e.constant;
+            case Expr::VAR: return cells[e.var].v;
+            case Expr::CONCAT: {
+                if (e.left->kind == Kind::STRING) {
+                    Value l = evalValue(*e.left);
+                    if (e.right->kind == Kind::STRING) {
+                        Value r = evalValue(*e.right);
+                        return Value::concat(l, r.text());
+                    }
+                    std::string text = box(*e.right).toString();
+                    return Value::concat(l, text);
+                }
+                std::string text = box(*e.left).toString();
+                Value r = evalValue(*e.right);
+                text.append(r.text().data(), r.text().size());
+                return Value(text);
+            }
+            case Expr::BOXED_ARITH: {
+                Value l = box(*e.left);
+                Value r = box(*e.right);
+                return Numeric::arith(e.arith, l, r);
+            }
+            case Expr::BINARY: {
+                Value l = box(*e.left);
+                Value r = box(*e.right);
+                return ASTExecutor::binaryOp(e.binary, l, r);
+            }
+            case Expr::INDEX: {
+                Value target = box(*e.left);
+                if (target.type != Value::ARRAY) throw std::runtime_error("Error: only arrays can be indexed");
+                Value index = box(*e.right);
+                return Array::get(target, index);
+            }
+            case Expr::ARRAY: {
+                std::vector<Value> elements;
+                for (const auto& element : e.elements) elements.push_back(box(*element));
+                return Array::fromValues(elements);
+            }
+            default: return Value(nullptr);
+        }
+    }
+};
+
+bool TypedLoop::run(ASTExecutor& ex) {
+    Run run(*this, ex);
+    if (!run.load()) return false;
+    ex.typedCounts.runs++;
+    try {
+        run.runLoop(*loop);
+    } catch (Deopt& deopt) {
+        // From the loop's own condition, or after its body finished the iteration
+        if (!deopt.resumed) run.materialize();
+        ex.currentScope = run.entry;
+        disabled = true;
+        ex.typedCounts.deopts++;
+        ex.execLoopBoxed(node);
+        return true;
+    } catch (...) {
+        if (!run.materialized) run.store();
+        ex.currentScope = run.entry;
+        throw;
+    }
+    run.store();
+    return true;
+}
+
+}
@@ -1,68 +1,458 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk
 import sys
-import io
 import os
-import threading
-import re
+import time
+import collections
+import queue
 
 # Import NovoLang core
 sys.path.append(os.path.join(os.path.dirname(__file__), 'python'))
 
-try:
-    from lexer import Lexer
+# Dialogs, threads, the run workers and the Windows-only helpers are
+# imported where they are first used, so the IDE window appears sooner.
+# Scripts run in worker processes (python/worker.py), never in the IDE.
+
+def worker_command():
+    """Command line that starts a run worker: this program with --nl-worker."""
+    from worker import WORKER_FLAG
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, WORKER_FLAG]
+    return [sys.executable, os.path.abspath(__file__), WORKER_FLAG]
+
+class Run:
+    """A script run in progress for one editor tab.
+
+    A debug run's thread waits in pause() while the script is stopped:
+    the Tk loop sees `paused` and answers with resume().
+    """
+
+    def __init__(self, debug=False):
+        self.worker = None
+        self.stopped = False
+        self.debug = debug
+        self.paused = None
+        self.commands = queue.Queue()
+
+    def pause(self, pause):
+        """Worker.run's on_pause: wait for the IDE's answer. Run thread only."""
+        self.paused = pause
+        return self.commands.get()
+
+    def resume(self, command, breakpoints):
+        self.paused = None
+        self.commands.put({'command': command, 'breakpoints': breakpoints})
+
+    def stop(self):
+        self.stopped = True
+        if self.worker is not None:
+            self.worker.kill()
+        if self.debug:
+            # Wakes the run thread if it is waiting in pause()
+            self.resume('quit', None)
+
+# The console keeps at most this many lines; older ones scroll off the top
+CONSOLE_MAX_LINES = 5000
+# How often the Tk loop moves queued script output into the console
+OUTPUT_INTERVAL_MS = 50
+
+class OutputPump:
+    """Script output channel between the run thread and the Tk console.
+
+    write() may be called from any thread and never touches Tk: it appends
+    to a bounded deque. While any run has the pump open, the Tk loop drains
+    the deque every OUTPUT_INTERVAL_MS and inserts everything queued in one
+    batch, trimming the widget to max_lines. If a script outruns the
+    console, the oldest queued chunks are dropped; they would have scrolled
+    off anyway.
+    """
+
+    def __init__(self, widget, max_lines=CONSOLE_MAX_LINES, interval_ms=OUTPUT_INTERVAL_MS):
+        self.widget = widget
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms
+        # print() writes the text and the newline as separate chunks
+        self.pending = collections.deque(maxlen=2 * max_lines)
+        self._writers = 0
+        self._lock = None  # created with the first run, like the run thread
+        self._job = None
+
+    def write(self, text):
+        if text:
+            self.pending.append(text)
+
+    def open(self):
+        """Start draining on the Tk loop for one more writer (main thread)."""
+        if self._lock is None:
+            import threading
+            self._lock = threading.Lock()
+        with self._lock:
+            self._writers += 1
+        if self._job is None:
+            self._job = self.widget.after(self.interval_ms, self._drain)
+
+    def close(self):
+        """Writer done; draining stops once all writers are and the queue is empty. Any thread."""
+        with self._lock:
+            self._writers -= 1
+
+    def clear(self):
+        self.pending.clear()
+        self.widget.configure(state='normal')
+        self.widget.delete('1.0', 'end')
+        self.widget.configure(state='disabled')
+
+    def _drain(self):
+        chunks = []
+        pending = self.pending
+        while pending:
+            chunks.append(pending.popleft())
+        if chunks:
+            self._append(''.join(chunks))
+        with self._lock:
+            idle = self._writers == 0
+        if idle and not pending:
+            self._job = None
+        else:
+            self._job = self.widget.after(self.interval_ms, self._drain)
+
+    def _append(self, text):
+        if text.count('\n') > self.max_lines:
+            text = '\n'.join(text.split('\n')[-self.max_lines - 1:])
+        widget = self.widget
+        widget.configure(state='normal')
+        widget.insert('end', text)
+        excess = int(widget.index('end-1c').split('.')[0]) - self.max_lines
+        if excess > 0:
+            widget.delete('1.0', f'{excess + 1}.0')
+        widget.see('end')
+        widget.configure(state='disabled')
+
+# Files larger than this (bytes) open in large-file mode: loaded in chunks
+# by a background thread, with highlighting (and other whole-buffer work)
+# deferred until the load completes
+LARGE_FILE_BYTES = int(os.environ.get('NOVOLANG_LARGE_FILE', 1 << 20))
+# Characters read per chunk, and how long each Tk loop slice may spend inserting
+LOAD_CHUNK_CHARS = 1 << 18
+LOAD_SLICE_SECONDS = 0.02
+
+# Syntax highlighting runs this long after the last keystroke or scroll
+HIGHLIGHT_DELAY_MS = 30
+HIGHLIGHT_TAGS = ("KEYWORD", "STRING", "COMMENT", "NUMBER")
+_syntax = None
+_string_scan = None
+
+# The buffer is parsed in the background this long after the last edit, and
+# the finished parse is picked up by polling the Tk loop at this interval
+ANALYSIS_DELAY_MS = 500
+ANALYSIS_POLL_MS = 20
+
+def analyze_source(code):
+    """Parse code; (pickled AST, None) if it parses, else (None, NovoSyntaxError)."""
+    import pickle
+    from lexer import NovoSyntaxError, Lexer
     from parser import Parser
-    from py_executor import PyExecutor
     try:
-        import novolang_core
-        HAS_CPP = True
-    except ImportError:
-        HAS_CPP = False
-except ImportError as e:
-    # Fallback for UI testing if core not found
-    print(f"Core import error: {e}")
-    HAS_CPP = False
-
-class RedirectText(io.StringIO):
-    def __init__(self, text_widget):
-        super().__init__()
-        self.text_widget = text_widget
+        ast = Parser(Lexer(code).tokenize()).parse()
+    except NovoSyntaxError as e:
+        return None, e
+    except Exception as e:
+        # Parser bugs on odd input must not kill the analysis thread
+        return None, NovoSyntaxError(f"Syntax Error: {e}")
+    return pickle.dumps(ast, pickle.HIGHEST_PROTOCOL), None
+
+def highlight_spans(code, first_line=1):
+    """Yield (tag, start, end) Tk text indices for code starting at first_line.
+
+    One pass of the lexer's own token pattern, so colours match what the
+    lexer accepts: identifiers in its keyword table are keywords.
+    """
+    global _syntax
+    if _syntax is None:
+        from lexer import KEYWORDS, token_regex
+        _syntax = (token_regex(), KEYWORDS)
+    regex, keywords = _syntax
+    line, line_start = first_line, 0
+    for mo in regex.finditer(code):
+        kind = mo.lastgroup
+        if kind == 'NEWLINE':
+            line += 1
+            line_start = mo.end()
+            continue
+        if kind == 'ID':
+            if mo.group() not in keywords:
+                continue
+            kind = 'KEYWORD'
+        elif kind not in HIGHLIGHT_TAGS:
+            continue
+        start = f"{line}.{mo.start() - line_start}"
+        breaks = mo.group().count('\n')  # strings may span lines
+        if breaks:
+            line += breaks
+            line_start = code.rindex('\n', mo.start(), mo.end()) + 1
+        yield kind, start, f"{line}.{mo.end() - line_start}"
+
+def open_string(code):
+    """Offset of the last '"' in code that no later '"' in code closes, else None.
+
+    Strings may span lines and comments may hold quotes, so whether a line
+    starts inside a string depends on all the text above it; this scans it
+    the way the lexer does.
+    """
+    global _string_scan
+    if _string_scan is None:
+        import re
+        _string_scan = re.compile(r'//.*|"[^"]*"|"')
+    for mo in _string_scan.finditer(code):
+        if mo.group() == '"':
+            # No '"' follows, so whatever follows (comments too) is in the string
+            return mo.start()
+    return None
+
+# Project tree: directories are listed on a background thread, results are
+# picked up by polling the Tk loop, and open directories are re-checked
+# (one stat each, on the scanner thread) this often
+TREE_POLL_MS = 50
+TREE_WATCH_MS = 2000
+
+def scan_directory(path):
+    """Sorted (name, is_dir) of the subdirectories and .nl files in path, directories first."""
+    with os.scandir(path) as it:
+        entries = [(entry.name, entry.is_dir()) for entry in it]
+    entries = [(name, is_dir) for name, is_dir in entries if is_dir or name.endswith(".nl")]
+    entries.sort(key=lambda entry: (not entry[1], entry[0].casefold()))
+    return entries
+
+class DirectoryScanner:
+    """Lists directories on a background thread for ProjectTree.
+
+    request(path) queues a listing; results() yields (path, entries) for each
+    finished request, entries being None when path has not changed (same
+    mtime) since the scanner last listed it, and [] when it cannot be read.
+    """
+
+    def __init__(self):
+        import queue
+        import threading
+        self.requests = queue.Queue()
+        self.done = collections.deque()
+        self.mtimes = {}  # scanner thread only
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def request(self, path, force=False):
+        self.requests.put((path, force))
 
-    def write(self, string):
-        self.text_widget.configure(state='normal')
-        self.text_widget.insert('end', string)
-        self.text_widget.see('end')
-        self.text_widget.configure(state='disabled')
+    def results(self):
+        while self.done:
+            yield self.done.popleft()
+
+    def stop(self):
+        self.requests.put(None)
+
+    def _run(self):
+        while True:
+            item = self.requests.get()
+            if item is None:
+                return
+            path, force = item
+            try:
+                # Taken before listing, so a change made during it is seen next time
+                mtime = os.stat(path).st_mtime_ns
+                if not force and self.mtimes.get(path) == mtime:
+                    self.done.append((path, None))
+                    continue
+                entries = scan_directory(path)
+                self.mtimes[path] = mtime
+            except OSError:
+                self.mtimes.pop(path, None)
+                entries = []
+            self.done.append((path, entries))
+
+class ProjectTree(ttk.Treeview):
+    """Project explorer that lists directories lazily and follows changes.
+
+    Item ids are full paths; files carry the "file" tag and directories the
+    "dir" tag. A directory is listed only when it is first opened (until then
+    a placeholder child makes it expandable), and the directories on screen
+    are re-checked every TREE_WATCH_MS and updated in place. Listings are
+    applied a slice at a time, so a directory of tens of thousands of files
+    never blocks the Tk loop.
+    """
+    PLACEHOLDER = "\0"
 
-    def flush(self):
-        pass
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scanner = None
+        self.listed = set()  # directories whose children are real entries
+        self.outstanding = 0  # scanner requests not yet picked up
+        self.updates = collections.deque()  # generators applying listings
+        self._poll_job = None
+        self._watch_job = None
+        self.bind("<<TreeviewOpen>>", self._on_open)
+
+    def set_root(self, path):
+        path = os.path.abspath(path)
+        self.delete(*self.get_children())
+        self.listed.clear()
+        self.updates.clear()
+        self.insert("", "end", iid=path, text=path, open=True, tags=("dir",))
+        if self.scanner is None:
+            self.scanner = DirectoryScanner()
+            self._watch_job = self.after(TREE_WATCH_MS, self._watch)
+        self._list(path, force=True)
+
+    def destroy(self):
+        for job in (self._poll_job, self._watch_job):
+            if job is not None:
+                self.after_cancel(job)
+        self._poll_job = self._watch_job = None
+        if self.scanner is not None:
+            self.scanner.stop()
+        super().destroy()
+
+    def _list(self, path, force=False):
+        self.scanner.request(path, force)
+        self.outstanding += 1
+        if self._poll_job is None:
+            self._poll_job = self.after(TREE_POLL_MS, self._poll)
+
+    def _on_open(self, event=None):
+        item = self.focus()
+        if item and self.tag_has("dir", item):
+            # First open lists the directory; reopening just checks it for changes
+            self._list(item, force=item not in self.listed)
+
+    def _poll(self):
+        for path, entries in self.scanner.results():
+            self.outstanding -= 1
+            if entries is not None and self.exists(path):
+                self.updates.append(self._update(path, entries))
+        deadline = time.perf_counter() + LOAD_SLICE_SECONDS
+        while self.updates and time.perf_counter() < deadline:
+            try:
+                next(self.updates[0])
+            except StopIteration:
+                self.updates.popleft()
+        busy = self.outstanding or self.updates
+        self._poll_job = self.after(TREE_POLL_MS, self._poll) if busy else None
+
+    def _update(self, path, entries):
+        """Make path's children match entries, yielding after each insert."""
+        first = path not in self.listed
+        self.listed.add(path)
+        wanted = [os.path.join(path, name) for name, is_dir in entries]
+        keep = set(wanted)
+        stale = [child for child in self.get_children(path) if child not in keep]
+        if stale:
+            self.delete(*stale)
+            removed = set(stale)
+            gone = tuple(child + os.sep for child in stale)
+            self.listed = {p for p in self.listed if p not in removed and not p.startswith(gone)}
+        for index, ((name, is_dir), child) in enumerate(zip(entries, wanted)):
+            if self.exists(child):
+                continue
+            # Survivors keep their sorted order, so index is the final position
+            self.insert(path, "end" if first else index, iid=child, text=name,
+                        tags=("dir",) if is_dir else ("file",))
+            if is_dir:
+                self.insert(child, "end", iid=child + self.PLACEHOLDER, text="")
+            yield
+
+    def _visible(self, item):
+        while item:
+            if not self.item(item, "open"):
+                return False
+            item = self.parent(item)
+        return True
+
+    def _watch(self):
+        # Skipped while a listing is in flight, so one path never has two updates
+        if not self.outstanding and not self.updates:
+            for path in self.listed:
+                if self.exists(path) and self._visible(path):
+                    self._list(path)
+        self._watch_job = self.after(TREE_WATCH_MS, self._watch)
 
 class LineNumberCanvas(tk.Canvas):
+    """Line-number gutter that keeps one canvas label per visible row.
+
+    redraw() reuses the labels and only reconfigures those whose number or
+    position changed, so its cost depends on the window height and what
+    moved, not on the file.
+    """
+
     def __init__(self, *args, **kwargs):
         tk.Canvas.__init__(self, *args, **kwargs)
         self.text_widget = None
+        self.items = []  # canvas text item per row
+        self.shown = []  # (line number, y) each item displays, None if hidden
+        self.digits = 0
 
     def attach(self, text_widget):
         self.text_widget = text_widget
 
     def redraw(self, *args):
         '''Redraw line numbers'''
-        self.delete("all")
-
-        i = self.text_widget.index("@0,0")
-        while True :
-            dline= self.text_widget.dlineinfo(i)
-            if dline is None: break
-            y = dline[1]
-            linenum = str(i).split(".")[0]
-            self.create_text(2, y, anchor="nw", text=linenum, fill="#666666", font=("Consolas", 10))
-            i = self.text_widget.index("%s+1line" % i)
+        text = self.text_widget
+        rows = []
+        i = text.index("@0,0")
+        while True:
+            dline = text.dlineinfo(i)
+            if dline is None:
+                break
+            rows.append((i.split(".")[0], dline[1]))
+            following = text.index("%s+1line" % i)
+            if following == i:
+                break
+            i = following
+
+        digits = len(text.index("end-1c").split(".")[0])
+        if digits != self.digits:
+            self.digits = digits
+            self.configure(width=max(40, 8 * digits + 12))
+
+        for row, (label, y) in enumerate(rows):
+            if row == len(self.items):
+                self.items.append(self.create_text(2, y, anchor="nw", text=label, fill="#666666", font=("Consolas", 10)))
+                self.shown.append((label, y))
+                continue
+            shown = self.shown[row]
+            if shown == (label, y):
+                continue
+            item = self.items[row]
+            if shown is None:
+                self.itemconfigure(item, text=label, state="normal")
+                self.coords(item, 2, y)
+            else:
+                if shown[0] != label:
+                    self.itemconfigure(item, text=label)
+                if shown[1] != y:
+                    self.coords(item, 2, y)
+            self.shown[row] = (label, y)
+        for row in range(len(rows), len(self.items)):
+            if self.shown[row] is not None:
+                self.itemconfigure(self.items[row], state="hidden")
+                self.shown[row] = None
 
 class CodeEditor(tk.Frame):
     def __init__(self, parent, file_path=None):
         super().__init__(parent)
         self.file_path = file_path
         self.is_modified = False
+        # Pending debounced highlight pass, and the (first, last) lines it last tagged
+        self._highlight_job = None
+        self._highlighted_view = None
+        # Files over LARGE_FILE_BYTES load in chunks; deque of pending chunks meanwhile
+        self.large_file = False
+        self.loading = None
+        self._load_job = None
+        # Background parse: pending job, generation (bumped on every edit so
+        # results for older text are dropped), the syntax error in the buffer
+        # if any, and (code, pickled AST) of the latest buffer that parsed
+        self._analysis_job = None
+        self._analysis_generation = 0
+        self.diagnostic = None
+        self.analysis = None
 
         # Scrollbar
         self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL)
@@ -70,7 +460,7 @@ class CodeEditor(tk.Frame):
 
         # Text Area
         self.text_area = tk.Text(self, wrap=tk.NONE, undo=True, font=("Consolas", 12),
-                                yscrollcommand=self.scrollbar.set)
+                                yscrollcommand=self._on_yscroll)
         self.text_area.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
         self.scrollbar.config(command=self.text_area.yview)
 
@@ -98,90 +488,141 @@ class CodeEditor(tk.Frame):
         self.text_area.tag_configure("COMMENT", foreground="#008000", font=("Consolas", 12, "italic")) # Green
         self.text_area.tag_configure("NUMBER", foreground="#800080") # Purple
         self.text_area.tag_configure("FUNCTION", foreground="#000000", font=("Consolas", 12, "bold")) 
+        self.text_area.tag_configure("ERROR", background="#FFE0E0", underline=True)
+        # Debugging: breakpoint lines, and the line a paused script stopped at
+        self.text_area.tag_configure("BREAKPOINT", background="#F4B8B8")
+        self.text_area.tag_configure("PAUSED", background="#FFF3A0")
+        self.text_area.tag_raise("PAUSED")
+
+    def toggle_breakpoint(self):
+        """Set or clear a breakpoint on the cursor's line."""
+        line = self.text_area.index(tk.INSERT).split(".")[0]
+        start, end = f"{line}.0", f"{line}.0 +1 lines"
+        if "BREAKPOINT" in self.text_area.tag_names(start):
+            self.text_area.tag_remove("BREAKPOINT", start, end)
+        else:
+            self.text_area.tag_add("BREAKPOINT", start, end)
+
+    def breakpoints(self):
+        """Lines with a breakpoint; the tag moves with its line as the text is edited."""
+        ranges = self.text_area.tag_ranges("BREAKPOINT")
+        return sorted({int(str(first).split(".")[0]) for first in ranges[::2]})
+
+    def show_paused(self, line):
+        """Mark the line a debugged script is stopped at; None clears the mark."""
+        self.text_area.tag_remove("PAUSED", "1.0", tk.END)
+        if line:
+            self.text_area.tag_add("PAUSED", f"{line}.0", f"{line}.0 +1 lines")
+            self.text_area.see(f"{line}.0")
 
     def highlight_syntax(self):
-        content = self.text_area.get("1.0", tk.END)
-        
-        # Clear existing tags
-        for tag in ["KEYWORD", "STRING", "COMMENT", "NUMBER", "FUNCTION"]:
-            self.text_area.tag_remove(tag, "1.0", tk.END)
-
-        # Keywords
-        keywords = [
-            # Chinese
-            "如果", "否则", "循环", "打印", "定义", "返回", "当", "自动", "真", "假", "空",
-            # English
-            "if", "else", "loop", "for", "print", "def", "var", "return", "while", "auto", "true", "false", "null",
-            # Japanese
-            "もし", "その他", "繰り返し", "表示", "定義", "戻る", "間", "自動", "真", "偽", "無",
-            # Korean
-            "만약", "아니면", "반복", "출력", "정의", "반환", "동안", "참", "거짓", "비어",
-            # Russian
-            "если", "иначе", "цикл", "печать", "определить", "вернуть", "пока", "авто", "истина", "ложь", "ноль"
-        ]
-        for kw in keywords:
-            start = "1.0"
-            while True:
-                pos = self.text_area.search(kw, start, stopindex=tk.END)
-                if not pos: break
-                end = f"{pos}+{len(kw)}c"
-                self.text_area.tag_add("KEYWORD", pos, end)
-                start = end
-
-        # Strings
-        start = "1.0"
-        while True:
-            # Simple regex for strings
-            pos = self.text_area.search(r'"[^"]*"', start, stopindex=tk.END, regexp=True)
-            if not pos: break
-            # Calculate length match
-            match_len = 0
-            # Tkinter search doesn't return match length easily with regex, 
-            # so we might need to verify or use a different approach.
-            # Simplified: Find next quote
-            end_quote = self.text_area.search('"', f"{pos}+1c", stopindex=tk.END)
-            if end_quote:
-                end = f"{end_quote}+1c"
-                self.text_area.tag_add("STRING", pos, end)
-                start = end
-            else:
-                break
+        """Retag the visible lines and the line being edited."""
+        self._highlight_job = None
+        text = self.text_area
+        first = int(text.index("@0,0").split(".")[0])
+        last = int(text.index(f"@0,{text.winfo_height()}").split(".")[0])
+        self._highlighted_view = (first, last)
+        self._highlight_lines(first, last)
+        insert = int(text.index(tk.INSERT).split(".")[0])
+        if not first <= insert <= last:
+            self._highlight_lines(insert, insert)
+
+    def _highlight_lines(self, first, last):
+        text = self.text_area
+        start, end = f"{first}.0", f"{last}.end"
+        if first > 1:
+            before = text.get("1.0", start)
+            opened = open_string(before)
+            # A quote with another after it opens a string: lex from that line
+            if opened is not None and text.search('"', start, tk.END):
+                first = before.count("\n", 0, opened) + 1
+                start = f"{first}.0"
+        for tag in HIGHLIGHT_TAGS:
+            text.tag_remove(tag, start, end)
+        ranges = {tag: [] for tag in HIGHLIGHT_TAGS}
+        for tag, span_start, span_end in highlight_spans(text.get(start, end), first):
+            ranges[tag] += (span_start, span_end)
+        for tag, indices in ranges.items():
+            if indices:
+                text.tag_add(tag, *indices)
+
+    def schedule_highlight(self):
+        """Highlight once typing or scrolling pauses for HIGHLIGHT_DELAY_MS."""
+        if self.loading is not None:
+            # _finish_loading highlights once the whole file is in
+            return
+        if self._highlight_job is not None:
+            self.after_cancel(self._highlight_job)
+        self._highlight_job = self.after(HIGHLIGHT_DELAY_MS, self.highlight_syntax)
+
+    def schedule_analysis(self):
+        """Parse the buffer in the background once editing pauses for ANALYSIS_DELAY_MS."""
+        self._analysis_generation += 1
+        if self._analysis_job is not None:
+            self.after_cancel(self._analysis_job)
+            self._analysis_job = None
+        if self.loading is not None or self.large_file:
+            # Large files are not parsed on every pause; Run parses them
+            return
+        self._analysis_job = self.after(ANALYSIS_DELAY_MS, self.analyze)
 
-        # Comments
-        start = "1.0"
-        while True:
-            pos = self.text_area.search(r'//.*', start, stopindex=tk.END, regexp=True)
-            if not pos: break
-            # Find end of line
-            line_end = self.text_area.index(f"{pos} lineend")
-            self.text_area.tag_add("COMMENT", pos, line_end)
-            start = f"{pos}+1line"
-
-        # Numbers
-        start = "1.0"
-        while True:
-            pos = self.text_area.search(r'\d+', start, stopindex=tk.END, regexp=True)
-            if not pos: break
-            
-            # Hacky length check
-            # Real impl would do full regex scan of content and map indices
-            # Here we just highlight single digit sequences
-            # To fix length, we can check char by char
-            count = 0
-            while True:
-                char = self.text_area.get(f"{pos}+{count}c")
-                if char.isdigit() or char == '.':
-                    count += 1
-                else:
-                    break
-            
-            end = f"{pos}+{count}c"
-            self.text_area.tag_add("NUMBER", pos, end)
-            start = end
+    def analyze(self):
+        import threading
+        code = self.text_area.get("1.0", tk.END)
+        if self.analysis is not None and self.analysis[0] == code:
+            self._analysis_job = None
+            return
+        generation = self._analysis_generation
+        result = []
+        threading.Thread(target=lambda: result.append(analyze_source(code)), daemon=True).start()
+        self._analysis_job = self.after(ANALYSIS_POLL_MS, self._poll_analysis, generation, code, result)
+
+    def _poll_analysis(self, generation, code, result):
+        if generation != self._analysis_generation:
+            # Edited since; the job for the new text is already scheduled
+            return
+        if not result:
+            self._analysis_job = self.after(ANALYSIS_POLL_MS, self._poll_analysis, generation, code, result)
+            return
+        self._analysis_job = None
+        ast, error = result[0]
+        text = self.text_area
+        text.tag_remove("ERROR", "1.0", tk.END)
+        if error is None:
+            self.analysis = (code, ast)
+        else:
+            line = error.line if error.line is not None else text.index("end-1c").split(".")[0]
+            text.tag_add("ERROR", f"{line}.0", f"{line}.end")
+        if error is not None or self.diagnostic is not None:
+            self.diagnostic = error
+            self.event_generate("<<Diagnostics>>")
+
+    def parsed(self, code):
+        """Pickled AST of code if the background parse already has it, else None."""
+        if self.analysis is not None and self.analysis[0] == code:
+            return self.analysis[1]
+        return None
+
+    def destroy(self):
+        for job in (self._highlight_job, self._load_job, self._analysis_job):
+            if job is not None:
+                self.after_cancel(job)
+        self._highlight_job = self._load_job = self._analysis_job = None
+        super().destroy()
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.linenumbers.redraw()
+        # Newly exposed lines need tags; relayout after retagging reports the same view
+        top = int(self.text_area.index("@0,0").split(".")[0])
+        bottom = int(self.text_area.index(f"@0,{self.text_area.winfo_height()}").split(".")[0])
+        if (top, bottom) != self._highlighted_view:
+            self.schedule_highlight()
 
     def _on_change(self, event=None):
         self.linenumbers.redraw()
-        self.highlight_syntax()
+        self.schedule_highlight()
+        self.schedule_analysis()
         self.is_modified = True
 
     def _on_scroll(self, event=None):
@@ -194,7 +635,13 @@ class CodeEditor(tk.Frame):
         self.linenumbers.redraw()
 
     def load_file(self, path):
+        from tkinter import messagebox
         try:
+            self.large_file = os.path.getsize(path) > LARGE_FILE_BYTES
+            if self.large_file:
+                self.file_path = path
+                self._load_chunked(path)
+                return
             with open(path, 'r', encoding='utf-8') as f:
                 content = f.read()
                 self.text_area.delete("1.0", tk.END)
@@ -205,7 +652,66 @@ class CodeEditor(tk.Frame):
         except Exception as e:
             messagebox.showerror("Error", f"Could not read file: {e}")
 
+    def _load_chunked(self, path):
+        """Read path on a thread and insert it a slice at a time from the Tk loop."""
+        import threading
+        chunks = self.loading = collections.deque()
+
+        def read():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    while True:
+                        lines = f.readlines(LOAD_CHUNK_CHARS)
+                        if not lines:
+                            break
+                        chunks.append(''.join(lines))
+            except Exception as e:
+                chunks.append(e)
+            chunks.append(None)
+
+        text = self.text_area
+        text.configure(undo=False)
+        text.delete("1.0", tk.END)
+        text.configure(state='disabled')
+        threading.Thread(target=read, daemon=True).start()
+        self._load_job = self.after(0, self._insert_chunks)
+
+    def _insert_chunks(self):
+        chunks = self.loading
+        text = self.text_area
+        deadline = time.perf_counter() + LOAD_SLICE_SECONDS
+        text.configure(state='normal')
+        try:
+            while chunks and time.perf_counter() < deadline:
+                chunk = chunks.popleft()
+                if chunk is None or isinstance(chunk, Exception):
+                    self._finish_loading(chunk)
+                    return
+                text.insert("end-1c", chunk)
+        finally:
+            if self.loading is not None:
+                text.configure(state='disabled')
+        self.linenumbers.redraw()
+        self._load_job = self.after(1 if chunks else 20, self._insert_chunks)
+
+    def _finish_loading(self, error):
+        from tkinter import messagebox
+        self.loading = None
+        self._load_job = None
+        text = self.text_area
+        text.configure(undo=True)
+        text.edit_reset()
+        self.is_modified = False
+        self.linenumbers.redraw()
+        self.schedule_highlight()
+        if error is not None:
+            messagebox.showerror("Error", f"Could not read file: {error}")
+
     def save_file(self):
+        from tkinter import messagebox
+        if self.loading is not None:
+            # Saving now would truncate the file to what has been read so far
+            return False
         if not self.file_path:
             return self.save_as()
         
@@ -220,6 +726,7 @@ class CodeEditor(tk.Frame):
             return False
 
     def save_as(self):
+        from tkinter import filedialog
         path = filedialog.asksaveasfilename(defaultextension=".nl", filetypes=[("NovoLang Files", "*.nl"), ("All Files", "*.*")])
         if path:
             self.file_path = path
@@ -229,7 +736,7 @@ class CodeEditor(tk.Frame):
 TRANSLATIONS = {
     "zh": {
         "file": "文件(F)", "new": "新建", "open": "打开", "save": "保存", "exit": "退出",
-        "run_menu": "运行(E)", "run": "编译运行", "view": "视图(V)", "clear": "清空输出",
+        "run_menu": "运行(E)", "run": "编译运行", "profile": "性能分析运行", "debug": "调试 / 继续", "step_over": "单步跳过", "step_into": "单步进入", "step_out": "单步跳出", "breakpoint": "切换断点", "paused": "已暂停", "stop": "停止运行", "running": "该文件正在运行", "stopped": "已停止", "view": "视图(V)", "clear": "清空输出",
         "tools": "工具(T)", "shortcut": "创建桌面快捷方式",
         "help": "帮助(H)", "tutorial": "新手教程", "about": "关于", "lang": "语言(L)",
         "project": "项目资源管理器", "output": "编译/运行输出", "ready": "就绪",
@@ -239,7 +746,7 @@ TRANSLATIONS = {
     },
     "en": {
         "file": "File(F)", "new": "New", "open": "Open", "save": "Save", "exit": "Exit",
-        "run_menu": "Run(E)", "run": "Compile & Run", "view": "View(V)", "clear": "Clear Output",
+        "run_menu": "Run(E)", "run": "Compile & Run", "profile": "Run with Profiler", "debug": "Debug / Continue", "step_over": "Step Over", "step_into": "Step Into", "step_out": "Step Out", "breakpoint": "Toggle Breakpoint", "paused": "Paused", "stop": "Stop", "running": "This file is already running", "stopped": "Stopped", "view": "View(V)", "clear": "Clear Output",
         "tools": "Tools(T)", "shortcut": "Create Desktop Shortcut",
         "help": "Help(H)", "tutorial": "Tutorial", "about": "About", "lang": "Language(L)",
         "project": "Project Explorer", "output": "Output", "ready": "Ready",
@@ -249,7 +756,7 @@ TRANSLATIONS = {
     },
     "ja": {
         "file": "ファイル(F)", "new": "新規作成", "open": "開く", "save": "保存", "exit": "終了",
-        "run_menu": "実行(E)", "run": "コンパイルと実行", "view": "表示(V)", "clear": "出力をクリア",
+        "run_menu": "実行(E)", "run": "コンパイルと実行", "profile": "プロファイル付きで実行", "debug": "デバッグ / 続行", "step_over": "ステップオーバー", "step_into": "ステップイン", "step_out": "ステップアウト", "breakpoint": "ブレークポイントの切り替え", "paused": "一時停止中", "stop": "停止", "running": "このファイルは実行中です", "stopped": "停止しました", "view": "表示(V)", "clear": "出力をクリア",
         "tools": "ツール(T)", "shortcut": "デスクトップにショートカットを作成",
         "help": "ヘルプ(H)", "tutorial": "チュートリアル", "about": "バージョン情報", "lang": "言語(L)",
         "project": "プロジェクト", "output": "出力", "ready": "準備完了",
@@ -259,7 +766,7 @@ TRANSLATIONS = {
     },
     "ko": {
         "file": "파일(F)", "new": "새로 만들기", "open": "열기", "save": "저장", "exit": "종료",
-        "run_menu": "실행(E)", "run": "컴파일 및 실행", "view": "보기(V)", "clear": "출력 지우기",
+        "run_menu": "실행(E)", "run": "컴파일 및 실행", "profile": "프로파일러로 실행", "debug": "디버그 / 계속", "step_over": "프로시저 단위 실행", "step_into": "한 단계씩 코드 실행", "step_out": "프로시저 나가기", "breakpoint": "중단점 설정/해제", "paused": "일시 중지됨", "stop": "중지", "running": "이 파일은 이미 실행 중입니다", "stopped": "중지됨", "view": "보기(V)", "clear": "출력 지우기",
         "tools": "도구(T)", "shortcut": "바탕 화면 바로 가기 만들기",
         "help": "도움말(H)", "tutorial": "튜토리얼", "about": "정보", "lang": "언어(L)",
         "project": "프로젝트 탐색기", "output": "출력", "ready": "준비됨",
@@ -269,7 +776,7 @@ TRANSLATIONS = {
     },
     "ru": {
         "file": "Файл(F)", "new": "Новый", "open": "Открыть", "save": "Сохранить", "exit": "Выход",
-        "run_menu": "Запуск(E)", "run": "Компилировать и запустить", "view": "Вид(V)", "clear": "Очистить вывод",
+        "run_menu": "Запуск(E)", "run": "Компилировать и запустить", "profile": "Запустить с профилировщиком", "debug": "Отладка / Продолжить", "step_over": "Шаг с обходом", "step_into": "Шаг с заходом", "step_out": "Шаг с выходом", "breakpoint": "Точка останова", "paused": "Приостановлено", "stop": "Остановить", "running": "Этот файл уже выполняется", "stopped": "Остановлено", "view": "Вид(V)", "clear": "Очистить вывод",
         "tools": "Инструменты(T)", "shortcut": "Создать ярлык на рабочем столе",
         "help": "Справка(H)", "tutorial": "Учебник", "about": "О программе", "lang": "Язык(L)",
         "project": "Проводник проекта", "output": "Вывод", "ready": "Готов",
@@ -347,9 +854,6 @@ for (i = 0; i < 3; i = i + 1) {
 """
 }
 
-import subprocess
-import winreg
-
 class IDE(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -364,12 +868,17 @@ class IDE(tk.Tk):
         
         # Icons
         self.icons = {
-            "new": "📄", "open": "📂", "save": "💾", "run": "▶", "compile": "🔨"
+            "new": "📄", "open": "📂", "save": "💾", "run": "▶", "stop": "■", "compile": "🔨"
         }
 
         self.sidebar_label = None
         self.output_frame = None
         self.toolbar = None
+        # Editor tab -> Run, and the WorkerPool created by the first run
+        self.runs = {}
+        self.workers = None
+        # Whether the status bar shows a tab's syntax error
+        self.showing_diagnostic = False
         
         self.create_main_layout()
         self.create_statusbar()
@@ -380,10 +889,22 @@ class IDE(tk.Tk):
         self.bind("<Control-o>", lambda e: self.open_file())
         self.bind("<Control-s>", lambda e: self.save_current_file())
         self.bind("<F9>", lambda e: self.run_code())
+        self.bind("<Control-F9>", lambda e: self.run_code_profiled())
+        self.bind("<Control-F2>", lambda e: self.stop_code())
+        self.bind("<F5>", lambda e: self.debug_code())
+        self.bind("<F10>", lambda e: self.debug_command('next'))
+        self.bind("<F11>", lambda e: self.debug_command('step'))
+        self.bind("<Shift-F11>", lambda e: self.debug_command('out'))
+        self.bind("<F8>", lambda e: self.toggle_breakpoint())
+        self.bind_all("<<Diagnostics>>", self.show_diagnostic)
+        self.notebook.bind("<<NotebookTabChanged>>", self.show_diagnostic, add=True)
 
         # Load file tree
         self.refresh_file_tree(os.getcwd())
 
+        # Have a worker ready by the time the first script is run
+        self.after(2000, lambda: self.worker_pool().warm())
+
         # Open file from command line args
         if len(sys.argv) > 1 and os.path.isfile(sys.argv[1]):
             self.load_file_in_new_tab(sys.argv[1])
@@ -420,6 +941,8 @@ class IDE(tk.Tk):
         self.refresh_ui()
 
     def create_shortcut(self):
+        import subprocess
+        from tkinter import messagebox
         try:
             # Determine path to exe
             if getattr(sys, 'frozen', False):
@@ -443,6 +966,8 @@ class IDE(tk.Tk):
             messagebox.showerror(self.tr("tools"), f"{self.tr('shortcut_fail')}{e}")
 
     def register_association(self):
+        import winreg
+        from tkinter import messagebox
         try:
             # Determine path to exe
             if getattr(sys, 'frozen', False):
@@ -510,6 +1035,14 @@ class IDE(tk.Tk):
         exec_menu = tk.Menu(menu_bar, tearoff=0)
         menu_bar.add_cascade(label=self.tr("run_menu"), menu=exec_menu)
         exec_menu.add_command(label=self.tr("run"), accelerator="F9", command=self.run_code)
+        exec_menu.add_command(label=self.tr("profile"), accelerator="Ctrl+F9", command=self.run_code_profiled)
+        exec_menu.add_command(label=self.tr("stop"), accelerator="Ctrl+F2", command=self.stop_code)
+        exec_menu.add_separator()
+        exec_menu.add_command(label=self.tr("debug"), accelerator="F5", command=self.debug_code)
+        exec_menu.add_command(label=self.tr("step_over"), accelerator="F10", command=lambda: self.debug_command('next'))
+        exec_menu.add_command(label=self.tr("step_into"), accelerator="F11", command=lambda: self.debug_command('step'))
+        exec_menu.add_command(label=self.tr("step_out"), accelerator="Shift+F11", command=lambda: self.debug_command('out'))
+        exec_menu.add_command(label=self.tr("breakpoint"), accelerator="F8", command=self.toggle_breakpoint)
         
         # View Menu
         view_menu = tk.Menu(menu_bar, tearoff=0)
@@ -538,6 +1071,7 @@ class IDE(tk.Tk):
         help_menu.add_command(label=self.tr("about"), command=self.show_about)
 
     def show_about(self):
+        from tkinter import messagebox
         story = (
             "NovoLang IDE v1.0\n\n"
             "【开发者故事 / Developer Story】\n\n"
@@ -565,6 +1099,7 @@ class IDE(tk.Tk):
         add_btn(self.icons["save"], self.save_current_file)
         ttk.Separator(self.toolbar, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y, padx=5)
         add_btn(self.icons["run"], self.run_code)
+        add_btn(self.icons["stop"], self.stop_code)
 
     def create_main_layout(self):
         self.main_paned = tk.PanedWindow(self, orient=tk.HORIZONTAL, sashrelief=tk.RAISED)
@@ -577,7 +1112,7 @@ class IDE(tk.Tk):
         self.sidebar_label = ttk.Label(sidebar_frame, text="Project", font=("Arial", 9, "bold"))
         self.sidebar_label.pack(side=tk.TOP, fill=tk.X)
         
-        self.file_tree = ttk.Treeview(sidebar_frame)
+        self.file_tree = ProjectTree(sidebar_frame)
         self.file_tree.pack(fill=tk.BOTH, expand=True)
         self.file_tree.heading("#0", text="Files", anchor=tk.W)
         self.file_tree.bind("<Double-1>", self.on_tree_double_click)
@@ -597,6 +1132,7 @@ class IDE(tk.Tk):
         self.output_text = tk.Text(self.output_frame, height=10, bg="white", font=("Consolas", 10))
         self.output_text.pack(fill=tk.BOTH, expand=True)
         self.output_text.configure(state='disabled')
+        self.output = OutputPump(self.output_text)
 
     def create_statusbar(self):
         self.statusbar = ttk.Label(self, text="Ready", relief=tk.SUNKEN, anchor=tk.W)
@@ -606,35 +1142,18 @@ class IDE(tk.Tk):
         content = TUTORIALS.get(self.current_lang, TUTORIALS["zh"])
         editor = CodeEditor(self.notebook)
         editor.text_area.insert("1.0", content)
-        editor.highlight_syntax()
+        editor.schedule_highlight()
         self.notebook.add(editor, text=self.tr("tutorial"))
         self.notebook.select(editor)
 
     def refresh_file_tree(self, path):
-        for item in self.file_tree.get_children():
-            self.file_tree.delete(item)
-        
-        root_node = self.file_tree.insert("", "end", text=path, open=True)
-        
-        try:
-            for item in os.listdir(path):
-                full_path = os.path.join(path, item)
-                if os.path.isdir(full_path):
-                    self.file_tree.insert(root_node, "end", text=item, open=False)
-                elif item.endswith(".nl"):
-                    self.file_tree.insert(root_node, "end", text=item, values=[full_path])
-        except Exception as e:
-            print(e)
+        self.file_tree.set_root(path)
 
     def on_tree_double_click(self, event):
-        item_id = self.file_tree.selection()[0]
-        item_text = self.file_tree.item(item_id, "text")
-        
-        if item_text.endswith(".nl"):
-            cwd = os.getcwd()
-            full_path = os.path.join(cwd, item_text)
-            if os.path.exists(full_path):
-                self.open_file_by_path(full_path)
+        # Item ids are full paths
+        item = self.file_tree.focus()
+        if item and self.file_tree.tag_has("file", item) and os.path.isfile(item):
+            self.open_file_by_path(item)
 
     def new_file(self):
         editor = CodeEditor(self.notebook)
@@ -642,6 +1161,7 @@ class IDE(tk.Tk):
         self.notebook.select(editor)
 
     def open_file(self):
+        from tkinter import filedialog
         path = filedialog.askopenfilename(filetypes=[("NovoLang Files", "*.nl"), ("All Files", "*.*")])
         if path:
             self.open_file_by_path(path)
@@ -672,60 +1192,145 @@ class IDE(tk.Tk):
         return None
 
     def clear_output(self):
-        self.output_text.configure(state='normal')
-        self.output_text.delete(1.0, tk.END)
-        self.output_text.configure(state='disabled')
+        self.output.clear()
 
-    def run_code(self):
+    def show_diagnostic(self, event=None):
+        """Show the current tab's syntax error, if any, in the status bar."""
+        editor = self.get_current_editor()
+        if editor is None or (event is not None and event.widget not in (editor, self.notebook)):
+            return
+        if editor.diagnostic is not None:
+            self.statusbar.config(text=str(editor.diagnostic))
+            self.showing_diagnostic = True
+        elif self.showing_diagnostic:
+            self.statusbar.config(text=self.tr("ready"))
+            self.showing_diagnostic = False
+
+    def run_code(self, profile=False, debug=False):
+        import threading
         editor = self.get_current_editor()
         if not editor:
             return
+        if editor in self.runs:
+            self.statusbar.config(text=self.tr("running"))
+            return
+        if editor.loading is not None:
+            return
 
         code = editor.text_area.get("1.0", tk.END)
         if not code.strip():
             return
-        
-        self.clear_output()
-        self.output_text.configure(state='normal')
-        self.output_text.insert(tk.END, f"--------------------Configuration: NovoLang - Debug--------------------\n")
-        self.output_text.configure(state='disabled')
-
-        threading.Thread(target=self._execute_logic, args=(code,), daemon=True).start()
 
-    def _execute_logic(self, code):
-        old_stdout = sys.stdout
-        old_stderr = sys.stderr
-        
-        redirector = RedirectText(self.output_text)
-        sys.stdout = redirector
-        sys.stderr = redirector
+        # Other tabs may still be printing into the console
+        if not self.runs:
+            self.clear_output()
+        self.output.write("--------------------Configuration: NovoLang - Debug--------------------\n")
+        self.output.open()
+
+        name = os.path.basename(editor.file_path) if editor.file_path else self.tr("untitled")
+        request = {'code': code, 'name': name, 'path': editor.file_path, 'profile': profile,
+                   'debug': editor.breakpoints() if debug else None}
+        run = self.runs[editor] = Run(debug)
+        threading.Thread(target=self._execute_logic,
+                         args=(self.worker_pool(), editor, run, request, editor.parsed(code)),
+                         daemon=True).start()
+        if debug:
+            self._poll_debug(editor, run, None)
+
+    def run_code_profiled(self):
+        self.run_code(profile=True)
+
+    def debug_code(self):
+        """Start a debug run of the current tab, or continue its paused one."""
+        run = self.runs.get(self.get_current_editor())
+        if run is None:
+            self.run_code(debug=True)
+        else:
+            self.debug_command('continue')
+
+    def debug_command(self, command):
+        """Answer the current tab's paused script with a debugger command."""
+        editor = self.get_current_editor()
+        run = self.runs.get(editor)
+        if run is not None and run.paused is not None:
+            editor.show_paused(None)
+            self.statusbar.config(text=self.tr("ready"))
+            run.resume(command, editor.breakpoints())
 
+    def toggle_breakpoint(self):
+        editor = self.get_current_editor()
+        if editor:
+            editor.toggle_breakpoint()
+
+    def _poll_debug(self, editor, run, shown):
+        """Show each pause of a debug run: its line in the editor, its variables in the console."""
+        pause = run.paused
+        if pause is not None and pause is not shown:
+            editor.show_paused(pause['line'])
+            where = ''.join(f" < {name}() @ {line}" for name, line in reversed(pause['stack']))
+            self.statusbar.config(text=f"{self.tr('paused')}: {pause['line']}{where}")
+            lines = [f"[{self.tr('paused')}: {pause['line']}]"]
+            for label, variables in pause['scopes']:
+                if variables:
+                    lines.append(f"  {label}: " + ", ".join(f"{name} = {value}" for name, value in sorted(variables.items())))
+            self.output.write("\n".join(lines) + "\n")
+        if self.runs.get(editor) is run:
+            self.after(OUTPUT_INTERVAL_MS, self._poll_debug, editor, run, pause)
+        else:
+            editor.show_paused(None)
+
+    def stop_code(self):
+        """Stop the current tab's run, or every run if it has none."""
+        run = self.runs.get(self.get_current_editor())
+        for target in [run] if run else list(self.runs.values()):
+            target.stop()
+
+    def worker_pool(self):
+        if self.workers is None:
+            from worker import WorkerPool
+            self.workers = WorkerPool(worker_command())
+        return self.workers
+
+    def _execute_logic(self, pool, editor, run, request, ast=None):
+        # Runs on its own thread; talks to Tk only through self.output
+        import codecs
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
         try:
-            lexer = Lexer(code)
-            tokens = lexer.tokenize()
-            
-            parser = Parser(tokens)
-            ast = parser.parse()
-
-            if HAS_CPP:
-                print("Compiling with C++ Engine...")
-                executor = novolang_core.ASTExecutor()
-                executor.execute(ast)
+            run.worker = worker = pool.acquire()
+            if run.stopped:
+                worker.kill()
+            status = worker.run(request, lambda data: self.output.write(decoder.decode(data)), ast,
+                                run.pause if run.debug else None)
+            self.output.write(decoder.decode(b'', final=True))
+            if status is None:
+                worker.close()
+                self.output.write(f"\n[{self.tr('stopped')}]\n")
             else:
-                print("Compiling with Python Engine (Legacy)...")
-                executor = PyExecutor()
-                executor.execute(ast)
-            
-            print("\n--------------------------------")
-            print("Process exited with return value 0")
-            print("Press any key to continue . . .") 
-                
+                pool.release(worker)
+                self.output.write("\n--------------------------------\n")
+                self.output.write(f"Process exited with return value {status}\n")
+                self.output.write("Press any key to continue . . .\n")
         except Exception as e:
-            print(f"\n[Error] {e}")
+            self.output.write(f"\n[Error] {e}\n")
         finally:
-            sys.stdout = old_stdout
-            sys.stderr = old_stderr
+            self.runs.pop(editor, None)
+            self.output.close()
+
+    def shutdown(self):
+        """Stop running scripts and idle workers when the IDE exits."""
+        for run in list(self.runs.values()):
+            run.stop()
+        if self.workers is not None:
+            self.workers.shutdown()
 
 if __name__ == "__main__":
+    if getattr(sys, 'frozen', False):
+        # Parallel lexing (lexer.tokenize) starts process pool children from the exe
+        import multiprocessing
+        multiprocessing.freeze_support()
+    if "--nl-worker" in sys.argv[1:]:
+        import worker
+        sys.exit(worker.main())
     app = IDE()
     app.mainloop()
+    app.shutdown()
@@ -1,62 +1,259 @@
 import sys
 import os
-import json
+import argparse
+import functools
 
 # Add python directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'python'))
 
-from lexer import Lexer
-from parser import Parser
-from py_executor import PyExecutor
+# Everything below is imported on first use so that `--connect` and other
+# light commands do not pay for the lexer, the engines or the automation stack.
 
-# Try to import the C++ backend
-try:
-    import novolang_core
-    HAS_CPP = True
-except ImportError:
-    HAS_CPP = False
-    # print("Warning: 'novolang_core' module not found. C++ backend is not available.")
-    # print("Please compile the extension using 'python setup.py build_ext --inplace'")
+@functools.lru_cache(maxsize=None)
+def load_core():
+    """Return the C++ backend module, or None when the extension is not built."""
+    try:
+        import novolang_core
+        return novolang_core
+    except ImportError:
+        # print("Warning: 'novolang_core' module not found. C++ backend is not available.")
+        # print("Please compile the extension using 'python setup.py build_ext --inplace'")
+        return None
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python main.py <file.nl>")
-        return
+def run_file(filename, profile=None, limits=None, stream=False, snapshot_path=None, resume_path=None,
+             breakpoints=None):
+    """Lex, parse and execute a NovoLang file. Returns the process exit status.
 
-    filename = sys.argv[1]
+    profile: None to run normally, otherwise record per-statement timings,
+    print a report to stderr and, if profile is a non-empty path, write
+    collapsed stacks there for flamegraph tools.
+    limits: None, or a dict of Governor limits (max_steps, max_seconds,
+    max_memory); resource usage is then reported on stderr.
+    stream: run the file as it is read instead of parsing all of it first:
+    it is memory-mapped, lexed a block at a time and parsed and executed a
+    top-level statement at a time, so memory stays flat however long the
+    script is. A syntax error then stops the script where it occurs, after
+    the statements before it have run.
+    snapshot_path: write a snapshot there when the script reaches its first
+    top-level checkpoint (snapshot.py).
+    resume_path: resume from the snapshot there instead of running the
+    script's preamble; a snapshot of different source text is ignored.
+    breakpoints: None to run normally, otherwise run under the console
+    debugger (debugger.py), stopping at these lines, or at the first
+    statement if there are none.
+    """
     if not os.path.exists(filename):
         print(f"Error: File '{filename}' not found.")
-        return
+        return 1
 
-    with open(filename, 'r', encoding='utf-8') as f:
-        code = f.read()
+    code = None
+    if not stream:
+        with open(filename, 'r', encoding='utf-8') as f:
+            code = f.read()
 
     print(f"Running {filename}...")
-    
-    # 1. Lexer
-    lexer = Lexer(code)
-    tokens = lexer.tokenize()
-    # print("Tokens:", tokens)
-    
-    # 2. Parser
-    parser = Parser(tokens)
-    ast = parser.parse()
+
+    from lexer import NovoSyntaxError, source_blocks, stream_tokens, tokenize
+    from parser import Parser
+    # Imports are resolved relative to the script's directory
+    path = os.path.abspath(filename)
+    syntax_errors = []
+    saved = None
+
+    if stream:
+        def statements():
+            try:
+                yield from Parser(stream_tokens(source_blocks(filename))).statements()
+            except NovoSyntaxError as e:
+                syntax_errors.append(e)
+        run = lambda executor: executor.execute_stream(statements(), path)
+    else:
+        import snapshot
+        digest = snapshot.source_digest(code) if snapshot_path or resume_path else None
+        saved = snapshot.load(resume_path, digest) if resume_path else None
+        if resume_path and saved is None and os.path.exists(resume_path):
+            print(f"Snapshot {resume_path} does not match {filename}; running from the start", file=sys.stderr)
+
+    if saved is not None:
+        # Nothing to lex or parse: the snapshot holds the AST after the checkpoint
+        run = lambda executor: executor.execute(snapshot.restore(executor, saved, path))
+    elif not stream:
+        try:
+            # 1. Lexer (in parallel for very large sources)
+            tokens = tokenize(code)
+            # print("Tokens:", tokens)
+
+            # 2. Parser
+            parser = Parser(tokens)
+            ast = parser.parse()
+        except NovoSyntaxError as e:
+            print(e)
+            return 1
+        ast['file'] = path
+        del tokens, parser
+
+        def run(executor):
+            if snapshot_path:
+                executor.checkpoint_hook = snapshot.recorder(executor, ast, snapshot_path, digest)
+            executor.execute(ast)
     
     # 3. Execution
-    if HAS_CPP:
+    status = 0
+    novolang_core = load_core()
+    if novolang_core:
         print("Executing with C++ backend...")
         try:
             executor = novolang_core.ASTExecutor()
-            executor.execute(ast)
+            # Report runtime errors here, with the exit status, as for the Python engine
+            executor.raise_errors = True
+            if profile is not None:
+                executor.enable_profiling()
+            if limits is not None:
+                executor.set_limits(limits.get('max_steps') or 0, limits.get('max_seconds') or 0.0,
+                                    limits.get('max_memory') or 0)
+            if breakpoints is not None:
+                attach_debugger(executor, code, breakpoints)
+            run(executor)
         except Exception as e:
             print(f"Execution Error: {e}")
+            status = 1
     else:
         print("Executing with Python backend (C++ extension not found)...")
+        governor = None
+        if limits is not None:
+            from governor import Governor
+            governor = Governor(**limits)
         try:
-            executor = PyExecutor()
-            executor.execute(ast)
+            if profile is not None:
+                from profiler import Profile, ProfilingExecutor
+                executor = ProfilingExecutor(Profile(os.path.basename(filename), code), governor=governor)
+            elif breakpoints is not None:
+                from debugger import DebuggingExecutor
+                executor = DebuggingExecutor(governor=governor)
+                attach_debugger(executor, code, breakpoints)
+            else:
+                from py_executor import PyExecutor
+                executor = PyExecutor(governor=governor)
+            run(executor)
         except Exception as e:
             print(f"Execution Error: {e}")
+            status = 1
+
+    if syntax_errors:
+        sys.stdout.flush()
+        print(syntax_errors[0])
+        status = 1
+
+    if profile is not None:
+        report_profile(executor, filename, code, profile)
+    if limits is not None:
+        report_usage(executor)
+    return status
+
+def attach_debugger(executor, code, breakpoints):
+    from debugger import Console, Session
+    Session(executor, Console(code), breakpoints)
+
+def report_usage(executor):
+    usage = executor.usage() if hasattr(executor, 'usage') else executor.governor.usage()
+    sys.stdout.flush()
+    print(f"Resource usage: {usage.get('statements', 0)} statements, {usage.get('seconds', 0.0):.3f} s, "
+          f"peak variable memory {usage.get('peak_memory', 0)} bytes", file=sys.stderr)
+    memo = executor.memo_stats()
+    if memo:
+        from functions import format_memo_stats
+        print(format_memo_stats(memo), file=sys.stderr)
+    tiers = executor.tier_stats() if hasattr(executor, 'tier_stats') else None
+    if tiers:
+        from tiering import format_tier_stats
+        print(format_tier_stats(tiers), file=sys.stderr)
+
+def parse_size(text):
+    """'512', '64K', '16M' or '1G' -> bytes."""
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    text = text.strip().upper().rstrip('B')
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def report_profile(executor, filename, code, out_path):
+    from profiler import Profile
+    if hasattr(executor, 'profile_data'):
+        result = Profile.from_native(executor.profile_data(), os.path.basename(filename), code)
+    else:
+        result = executor.profile
+    sys.stdout.flush()
+    print(result.report(), file=sys.stderr)
+    if out_path:
+        result.write_collapsed(out_path)
+        print(f"Collapsed stacks written to {out_path}", file=sys.stderr)
+
+def warm_modules():
+    """Modules the resident server imports up front: the front end, both engines and AutoAPI targets."""
+    from auto_api import AutoAPI
+    automation = sorted({module for module, _ in AutoAPI.MAPPING.values()})
+    return ['lexer', 'parser', 'py_executor', 'modules', 'novolang_core'] + automation
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Run NovoLang scripts.")
+    arg_parser.add_argument('file', nargs='?', help="NovoLang source file (.nl)")
+    arg_parser.add_argument('--profile', action='store_true', help="Print per-statement timings to stderr")
+    arg_parser.add_argument('--profile-out', metavar='FOLDED',
+                            help="Profile, and also write collapsed stacks to FOLDED")
+    arg_parser.add_argument('--max-steps', type=int, metavar='N', help="Abort after N executed statements")
+    arg_parser.add_argument('--max-time', type=float, metavar='SECONDS', help="Abort after SECONDS of wall-clock time")
+    arg_parser.add_argument('--max-memory', type=parse_size, metavar='BYTES', help="Abort when variables hold more than BYTES (K/M/G suffixes)")
+    arg_parser.add_argument('-I', '--include', action='append', default=[], metavar='DIR',
+                            help="Also look for imported modules in DIR (repeatable)")
+    arg_parser.add_argument('--usage', action='store_true', help="Report resource usage on stderr")
+    arg_parser.add_argument('--stream', action='store_true',
+                            help="Run each top-level statement as soon as it is parsed, in constant memory; "
+                                 "a syntax error stops the script only when it is reached")
+    arg_parser.add_argument('--snapshot', metavar='FILE',
+                            help="Save the interpreter state at the script's first checkpoint to FILE")
+    arg_parser.add_argument('--resume', metavar='FILE',
+                            help="Start from the checkpoint saved in FILE, skipping the code before it")
+    arg_parser.add_argument('--debug', action='store_true',
+                            help="Run under the console debugger, stopping at the first statement")
+    arg_parser.add_argument('--break', dest='breakpoints', action='append', type=int, metavar='LINE',
+                            help="Run under the console debugger, stopping at LINE (repeatable)")
+    arg_parser.add_argument('--serve', nargs='?', const='', metavar='SOCKET',
+                            help="Keep the engines warm and accept run requests on a Unix socket")
+    arg_parser.add_argument('--connect', nargs='?', const='', metavar='SOCKET',
+                            help="Run FILE on a server started with --serve and exit with its status")
+    args = arg_parser.parse_args()
+
+    if args.include:
+        import modules
+        modules.add_search_path(args.include)
+
+    if args.serve is not None or args.connect is not None:
+        import daemon
+
+    if args.serve is not None:
+        daemon.serve(args.serve or daemon.default_socket_path(), run_file, warm_modules())
+        return 0
+
+    if not args.file:
+        print("Usage: python main.py <file.nl>")
+        return 1
+
+    if args.connect is not None:
+        return daemon.run_client(args.connect or daemon.default_socket_path(), args.file)
+
+    limits = None
+    if args.usage or args.max_steps or args.max_time or args.max_memory:
+        limits = {'max_steps': args.max_steps, 'max_seconds': args.max_time, 'max_memory': args.max_memory}
+    if args.stream and (args.snapshot or args.resume):
+        arg_parser.error("--snapshot and --resume cannot be combined with --stream")
+    profile = args.profile_out if args.profile_out else ('' if args.profile else None)
+    breakpoints = None
+    if args.debug or args.breakpoints:
+        if args.stream or profile is not None:
+            arg_parser.error("--debug and --break cannot be combined with --stream or --profile")
+        breakpoints = args.breakpoints or []
+    return run_file(args.file, profile=profile, limits=limits, stream=args.stream,
+                    snapshot_path=args.snapshot, resume_path=args.resume, breakpoints=breakpoints)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,7 +1,8 @@
 class ASTBuilder:
     @staticmethod
     def number(value):
-        return {"type": "NUMBER", "value": float(value)}
+        # value is already int or float (numeric.literal); keep its type
+        return {"type": "NUMBER", "value": value}
 
     @staticmethod
     def string(value):
@@ -15,6 +16,22 @@ class ASTBuilder:
     def null():
         return {"type": "NULL"}
 
+    @staticmethod
+    def array(elements):
+        return {"type": "ARRAY", "elements": elements}
+
+    @staticmethod
+    def index(target, index):
+        return {"type": "INDEX", "target": target, "index": index}
+
+    @staticmethod
+    def length(expr):
+        return {"type": "LEN", "expr": expr}
+
+    @staticmethod
+    def call(name, args):
+        return {"type": "CALL", "name": name, "args": args}
+
     @staticmethod
     def identifier(name):
         return {"type": "IDENTIFIER", "name": name}
@@ -36,6 +53,15 @@ class ASTBuilder:
             "value": value
         }
 
+    @staticmethod
+    def index_assignment(target, index, value):
+        return {
+            "type": "INDEX_ASSIGNMENT",
+            "target": target,
+            "index": index,
+            "value": value
+        }
+
     @staticmethod
     def if_stmt(condition, body, else_body=None):
         return {
@@ -60,6 +86,34 @@ class ASTBuilder:
             "expr": expr
         }
     
+    @staticmethod
+    def function_def(name, params, body, local_names, pure=False):
+        return {
+            "type": "FUNCTION_DEF",
+            "name": name,
+            "params": params,
+            "body": body,
+            "locals": local_names,
+            "slots": len(local_names),
+            "pure": pure
+        }
+
+    @staticmethod
+    def call_stmt(name, args):
+        return {"type": "CALL_STMT", "name": name, "args": args}
+
+    @staticmethod
+    def return_stmt(value):
+        return {"type": "RETURN", "value": value}
+
+    @staticmethod
+    def import_stmt(module):
+        return {"type": "IMPORT", "module": module}
+
+    @staticmethod
+    def checkpoint(name):
+        return {"type": "CHECKPOINT", "name": name}
+
     @staticmethod
     def auto_call(name, args):
         return {
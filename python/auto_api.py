@@ -1,28 +1,47 @@
 import importlib
 import sys
 
+# This package's own modules: python.x when imported from the repository root
+# (the C++ engine does), x when python/ is on sys.path
+_OWN = f"{__package__}." if __package__ else ''
+
+def value(result):
+    """An automation result as a NovoLang value: numbers, strings, booleans,
+    None, and lists or tuples of numbers (as a list); anything else is None."""
+    if result is None or isinstance(result, (bool, int, float, str)):
+        return result
+    if isinstance(result, (list, tuple)) and all(
+            isinstance(item, (int, float)) and not isinstance(item, bool) for item in result):
+        return list(result)
+    return None
+
 class AutoAPI:
-    def __init__(self):
-        # Map NL function names to (module, function)
-        self.mapping = {
-            # Chinese
-            '截图': ('pyautogui', 'screenshot'),
-            '点击': ('pyautogui', 'click'),
-            '移动': ('pyautogui', 'moveTo'),
-            '等待': ('time', 'sleep'),
-            '输入': ('pyautogui', 'write'),
-            '按键': ('pyautogui', 'press'),
-            '获取窗口': ('pygetwindow', 'getWindowsWithTitle'),
-            
-            # English
-            'screenshot': ('pyautogui', 'screenshot'),
-            'click': ('pyautogui', 'click'),
-            'move': ('pyautogui', 'moveTo'),
-            'wait': ('time', 'sleep'),
-            'type': ('pyautogui', 'write'),
-            'press': ('pyautogui', 'press'),
-            'get_window': ('pygetwindow', 'getWindowsWithTitle'),
-        }
+    # Map NL function names to (module, function). Built once at class creation,
+    # the target modules themselves are only imported when a script calls them.
+    MAPPING = {
+        # Chinese
+        '截图': ('pyautogui', 'screenshot'),
+        '点击': ('pyautogui', 'click'),
+        '移动': ('pyautogui', 'moveTo'),
+        '等待': ('time', 'sleep'),
+        '输入': ('pyautogui', 'write'),
+        '按键': ('pyautogui', 'press'),
+        '获取窗口': ('pygetwindow', 'getWindowsWithTitle'),
+        '查找图像': (_OWN + 'template_match', 'find_image'),
+        
+        # English
+        'screenshot': ('pyautogui', 'screenshot'),
+        'click': ('pyautogui', 'click'),
+        'move': ('pyautogui', 'moveTo'),
+        'wait': ('time', 'sleep'),
+        'type': ('pyautogui', 'write'),
+        'press': ('pyautogui', 'press'),
+        'get_window': ('pygetwindow', 'getWindowsWithTitle'),
+        'find_image': (_OWN + 'template_match', 'find_image'),
+    }
+
+    def __init__(self, mapping=None):
+        self.mapping = self.MAPPING if mapping is None else mapping
 
     def execute(self, func_name, args):
         if func_name not in self.mapping:
@@ -0,0 +1,224 @@
+import json
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+
+# Wire format: every message is a frame of (kind: 1 byte, length: uint32, payload).
+#   R  client -> server  JSON run request {"path", "cwd"}
+#   O  server -> client  raw script output (stdout and stderr, in order)
+#   X  server -> client  script exit status (int32), always the last frame
+#   A  client -> server  pickled AST following an R frame (IDE workers only)
+#   P  server -> client  JSON debugger pause; the script waits for a C frame (IDE workers only)
+#   C  client -> server  JSON debugger command answering a P frame (IDE workers only)
+FRAME_REQUEST = b'R'
+FRAME_OUTPUT = b'O'
+FRAME_EXIT = b'X'
+FRAME_AST = b'A'
+FRAME_PAUSE = b'P'
+FRAME_COMMAND = b'C'
+
+_HEADER = struct.Struct('!cI')
+_STATUS = struct.Struct('!i')
+
+
+def default_socket_path():
+    path = os.environ.get('NOVOLANG_SOCKET')
+    if path:
+        return path
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join('/tmp', f'novolang-{uid}.sock')
+
+
+def send_frame(sock, kind, payload=b''):
+    sock.sendall(_HEADER.pack(kind, len(payload)) + payload)
+
+
+def _recv_exact(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def recv_frame(sock):
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None, b''
+    kind, size = _HEADER.unpack(header)
+    payload = _recv_exact(sock, size) if size else b''
+    if payload is None:
+        return None, b''
+    return kind, payload
+
+
+def write_frame(stream, kind, payload=b''):
+    """send_frame for a binary file object such as a pipe."""
+    stream.write(_HEADER.pack(kind, len(payload)) + payload)
+    stream.flush()
+
+
+def read_frame(stream):
+    """recv_frame for a buffered binary file object; (None, b'') at end of stream."""
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None, b''
+    kind, size = _HEADER.unpack(header)
+    payload = stream.read(size) if size else b''
+    if len(payload) < size:
+        return None, b''
+    return kind, payload
+
+
+def encode_status(status):
+    return _STATUS.pack(status)
+
+
+def decode_status(payload):
+    return _STATUS.unpack(payload)[0]
+
+
+def _exit_status(exc):
+    # Mirror the interpreter: SystemExit(None) is success, a non-int code is failure
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    return 1
+
+
+def run_captured(func, sink):
+    """Run func() with file descriptors 1 and 2 redirected into sink(bytes).
+
+    Redirecting at the descriptor level also captures the C++ engine, which
+    writes to std::cout directly. Returns the status returned by func().
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    read_fd, write_fd = os.pipe()
+    saved_out, saved_err = os.dup(1), os.dup(2)
+    os.dup2(write_fd, 1)
+    os.dup2(write_fd, 2)
+    os.close(write_fd)
+
+    def pump():
+        while True:
+            data = os.read(read_fd, 65536)
+            if not data:
+                break
+            sink(data)
+
+    reader = threading.Thread(target=pump, daemon=True)
+    reader.start()
+    try:
+        status = func()
+    except SystemExit as e:
+        status = _exit_status(e)
+    except BaseException as e:
+        print(f"Execution Error: {e}")
+        status = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_out, 1)
+        os.dup2(saved_err, 2)
+        os.close(saved_out)
+        os.close(saved_err)
+        reader.join()
+        os.close(read_fd)
+    return status if isinstance(status, int) else 0
+
+
+class _RunHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        kind, payload = recv_frame(self.request)
+        if kind != FRAME_REQUEST:
+            return
+        request = json.loads(payload.decode('utf-8'))
+
+        def sink(data):
+            try:
+                send_frame(self.request, FRAME_OUTPUT, data)
+            except OSError:
+                # Client went away; keep draining so the script is not blocked
+                pass
+
+        cwd = request.get('cwd')
+        if cwd and os.path.isdir(cwd):
+            os.chdir(cwd)
+        # Each request runs in its own forked child, so stdout belongs to us alone
+        sys.stdout.reconfigure(line_buffering=True)
+        status = run_captured(lambda: self.server.run_file(request['path']), sink)
+        try:
+            send_frame(self.request, FRAME_EXIT, encode_status(status))
+        except OSError:
+            pass
+
+
+class NovoServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server that forks a pre-warmed child for every run request."""
+
+    def __init__(self, socket_path, run_file):
+        self.socket_path = socket_path
+        self.run_file = run_file
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _RunHandler)
+        os.chmod(socket_path, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def warm_up(modules=()):
+    """Import optional modules ahead of time so forked children inherit them."""
+    for name in modules:
+        try:
+            __import__(name)
+        except Exception:
+            # pyautogui and friends may fail without a display; scripts report it later
+            pass
+
+
+def serve(socket_path, run_file, warm_modules=()):
+    warm_up(warm_modules)
+    server = NovoServer(socket_path, run_file)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    print(f"NovoLang server listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def run_client(socket_path, path, out=None):
+    """Ask a running server to execute path; stream its output and return its exit status."""
+    out = out or sys.stdout.buffer
+    request = json.dumps({'path': os.path.abspath(path), 'cwd': os.getcwd()})
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        send_frame(sock, FRAME_REQUEST, request.encode('utf-8'))
+        while True:
+            kind, payload = recv_frame(sock)
+            if kind == FRAME_OUTPUT:
+                out.write(payload)
+                out.flush()
+            elif kind == FRAME_EXIT:
+                return decode_status(payload)
+            else:
+                print("Error: server closed the connection before the script finished.", file=sys.stderr)
+                return 1
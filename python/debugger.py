@@ -0,0 +1,249 @@
+"""Breakpoints, stepping and variable inspection for NovoLang scripts.
+
+    python main.py job.nl --debug                # stop at the first statement
+    python main.py job.nl --break 12 --break 30  # run to line 12 or 30
+
+In the IDE: F8 toggles a breakpoint on the cursor's line, F5 starts a
+debug run (and continues it), F10 steps over, F11 steps into and Shift+F11
+steps out.
+
+Nothing here costs a run that is not being debugged. The Python engine is
+debugged with DebuggingExecutor, a PyExecutor subclass like
+profiler.ProfilingExecutor, so PyExecutor has no debugging code at all.
+novolang_core switches to the instrumented dispatch profiling uses only
+while executor.debug_hook is set; its plain dispatch tests one flag, as it
+did before (see bench/debugger.py).
+
+Either engine calls debug_hook(stmt, depth) before each statement, depth
+being the number of statements it runs inside (blocks and calls alike), and
+reports the variables in scope with debug_scopes() and the calls in
+progress with debug_stack(). A Session turns that into a debugger:
+
+  step      stop at the next statement, going into blocks and calls
+  next      stop at the next statement not nested in this one (step over)
+  out       stop at the first statement after the current block or call
+  continue  run to the next breakpoint
+  quit      stop the script (DebuggerQuit)
+
+Each stop calls the session's front end with the Session and a Pause; it
+returns one of those commands. Console is the terminal front end; the
+IDE's run worker relays pauses and commands over its pipe (worker.py).
+Breakpoints are line numbers. Statements of imported modules are stepped
+through like the script's own, and a breakpoint matches their lines too.
+"""
+import sys
+from collections import namedtuple
+try:
+    from .numeric import to_display
+    from .py_executor import PyExecutor
+    from .rope import text_of
+except ImportError:
+    from numeric import to_display
+    from py_executor import PyExecutor
+    from rope import text_of
+
+COMMANDS = ('step', 'next', 'out', 'continue', 'quit')
+
+# Where a script stopped: reason is 'entry', 'step' or 'breakpoint'; stack
+# is [(function, call line)], outermost first; scopes [(label, {name: value})],
+# innermost first
+Pause = namedtuple('Pause', ('line', 'depth', 'reason', 'stack', 'scopes'))
+
+class DebuggerQuit(RuntimeError):
+    pass
+
+class DebuggingExecutor(PyExecutor):
+    """PyExecutor that calls debug_hook(stmt, depth) before each statement.
+
+    Instrumentation lives only in this subclass, so plain PyExecutor runs pay
+    nothing for it.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Compiled loops would bypass exec_stmt; debug the tree walker
+        self.tier_up = 0
+        self.debug_hook = None
+        self.depth = 0
+        self.calls = []   # (Function, call line), outermost first
+
+    def exec_stmt(self, stmt):
+        if self.debug_hook is not None:
+            self.debug_hook(stmt, self.depth)
+        self.depth += 1
+        try:
+            super().exec_stmt(stmt)
+        finally:
+            self.depth -= 1
+
+    def invoke(self, func, args, line=0):
+        self.calls.append((func, line))
+        try:
+            return super().invoke(func, args, line)
+        finally:
+            self.calls.pop()
+
+    def debug_scopes(self):
+        """Variables visible at the current statement, innermost first: [(label, {name: value})]."""
+        if self.calls and self.frame is not None:
+            # A function sees its slots and its file's top level, not its caller's blocks
+            func = self.calls[-1][0]
+            return [(f"{func.name}()", {name: text_of(value) for name, value in zip(func.locals, self.frame)}),
+                    ('globals', self._variables(self.global_scope))]
+        scopes = []
+        scope = self.current_scope
+        while scope is not None:
+            scopes.append(('globals' if scope is self.global_scope else 'block', self._variables(scope)))
+            scope = scope.parent
+        return scopes
+
+    def debug_stack(self):
+        """Calls in progress, outermost first: [(function, line of the call)]."""
+        return [(func.name, line) for func, line in self.calls]
+
+    @staticmethod
+    def _variables(scope):
+        return {name: text_of(value) for name, value in scope.variables.items()}
+
+class Session:
+    """Drives an executor's debug_hook: breakpoints and stepping.
+
+    front_end(session, pause) is called at every stop and returns a command
+    from COMMANDS. breakpoints is a set of line numbers the front end may
+    change while the script is stopped. With stop_on_entry (the default
+    when there are no breakpoints) the script stops before its first
+    statement.
+    """
+
+    def __init__(self, executor, front_end, breakpoints=(), stop_on_entry=None):
+        self.executor = executor
+        self.front_end = front_end
+        self.breakpoints = set(breakpoints)
+        if stop_on_entry is None:
+            stop_on_entry = not self.breakpoints
+        self.mode = 'entry' if stop_on_entry else 'continue'
+        self.depth = 0    # depth of the statement last stopped at
+        executor.debug_hook = self.hook
+
+    def hook(self, stmt, depth):
+        mode = self.mode
+        if mode == 'continue':
+            reason = 'breakpoint' if stmt.get('line', 0) in self.breakpoints else None
+        elif mode == 'next':
+            reason = 'step' if depth <= self.depth else None
+        elif mode == 'out':
+            reason = 'step' if depth < self.depth else None
+        else:
+            reason = mode   # 'entry' or 'step': stop at every statement
+        if reason is None and mode != 'continue' and stmt.get('line', 0) in self.breakpoints:
+            reason = 'breakpoint'
+        if reason is not None:
+            self.pause(stmt.get('line', 0), depth, reason)
+
+    def pause(self, line, depth, reason):
+        executor = self.executor
+        command = self.front_end(self, Pause(line, depth, reason, executor.debug_stack(), executor.debug_scopes()))
+        if command not in COMMANDS:
+            raise ValueError(f"unknown debugger command {command!r}")
+        if command == 'quit':
+            raise DebuggerQuit("Error: stopped by the debugger")
+        self.mode = command
+        self.depth = depth
+
+def format_value(value):
+    """A variable's value as the debugger shows it; strings are quoted."""
+    if isinstance(value, str):
+        return '"' + value.replace('"', '\\"') + '"'
+    return to_display(value)
+
+def lookup(scopes, name):
+    """(found, value) of name in the innermost scope that has it."""
+    for _, variables in scopes:
+        if name in variables:
+            return True, variables[name]
+    return False, None
+
+class Console:
+    """Terminal front end: prints where the script stopped and reads commands."""
+
+    HELP = """s(tep)       next statement, into blocks and calls
+n(ext)       next statement at this level or above (step over)
+o(ut)        run to the end of the current block or call
+c(ontinue)   run to the next breakpoint
+b(reak) N    set a breakpoint on line N; b alone lists them
+d(elete) N   remove the breakpoint on line N
+p(rint) NAME the value of a variable
+v(ars)       all variables in scope
+bt           calls in progress
+l(ist)       source around the current line
+q(uit)       stop the script
+An empty line repeats the last command."""
+
+    ALIASES = {'s': 'step', 'n': 'next', 'o': 'out', 'c': 'continue', 'cont': 'continue', 'q': 'quit',
+               'b': 'break', 'd': 'delete', 'p': 'print', 'v': 'vars', 'where': 'bt', 'l': 'list', 'h': 'help'}
+
+    def __init__(self, source=None, stdin=None, out=None):
+        self.lines = source.splitlines() if source else []
+        self.stdin = stdin or sys.stdin
+        # The prompt goes to stderr, so the script's own output stays clean
+        self.out = out or sys.stderr
+        self.last = 'step'
+
+    def __call__(self, session, pause):
+        sys.stdout.flush()
+        where = f" in {pause.stack[-1][0]}()" if pause.stack else ''
+        stopped = 'Breakpoint at' if pause.reason == 'breakpoint' else 'Stopped at'
+        self.write(f"{stopped} line {pause.line}{where}: {self.source_line(pause.line)}")
+        while True:
+            self.out.write('(nldb) ')
+            self.out.flush()
+            text = self.stdin.readline()
+            if not text:
+                return 'quit'
+            command, _, argument = text.strip().partition(' ')
+            command = self.ALIASES.get(command, command) if command else self.last
+            argument = argument.strip()
+            if command in COMMANDS:
+                self.last = command
+                return command
+            if command == 'break' and argument:
+                if argument.isdigit():
+                    session.breakpoints.add(int(argument))
+                    self.write(f"breakpoint on line {argument}")
+                else:
+                    self.write("usage: b LINE")
+            elif command == 'break':
+                self.write(', '.join(map(str, sorted(session.breakpoints))) or "no breakpoints")
+            elif command == 'delete':
+                if argument.isdigit() and int(argument) in session.breakpoints:
+                    session.breakpoints.discard(int(argument))
+                else:
+                    self.write(f"no breakpoint on line {argument}")
+            elif command == 'print':
+                found, value = lookup(pause.scopes, argument)
+                self.write(f"{argument} = {format_value(value)}" if found else f"{argument} is not defined here")
+            elif command == 'vars':
+                for label, variables in pause.scopes:
+                    if not variables and label == 'block':
+                        continue
+                    self.write(f"{label}:")
+                    for name, value in sorted(variables.items()):
+                        self.write(f"  {name} = {format_value(value)}")
+            elif command == 'bt':
+                self.write('\n'.join(f"  {name}() called from line {line}" for name, line in pause.stack)
+                           or "  (top level)")
+            elif command == 'list':
+                for number in range(max(1, pause.line - 3), min(len(self.lines), pause.line + 3) + 1):
+                    marker = '->' if number == pause.line else ('B ' if number in session.breakpoints else '  ')
+                    self.write(f"{marker}{number:4d}  {self.source_line(number)}")
+            elif command == 'help':
+                self.write(self.HELP)
+            else:
+                self.write(f"unknown command {command!r}; h for help")
+
+    def source_line(self, number):
+        return self.lines[number - 1].strip() if 0 < number <= len(self.lines) else ''
+
+    def write(self, text):
+        self.out.write(text + '\n')
+        self.out.flush()
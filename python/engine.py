@@ -0,0 +1,181 @@
+"""Embedding NovoLang in Python: compile once, run many times.
+
+    from engine import Engine
+
+    engine = Engine()
+    program = engine.compile('打印 greeting + name')
+    result = program.run(bindings={'greeting': 'hello ', 'name': 'Ann'})
+    result.output    # 'hello Ann\\n'
+    result.globals   # {'greeting': 'hello ', 'name': 'Ann'}
+
+Engine.compile() lexes and parses a source once and returns a Program.
+Programs are cached by source text (and path) in a per-engine LRU of
+COMPILE_CACHE_SIZE entries, so compiling the same source on every request
+costs a dictionary lookup. A Program is immutable and may be shared by any
+number of threads: each run() uses an executor of its own, new or reset,
+with its own variables and its own output, and the AST is only read: on
+novolang_core, compile() has already run type_inference.infer() on it. (The
+Python engine's loop counters live on the AST, see tiering.py; concurrent
+updates to them can only make a loop compile a little earlier or later.)
+
+run() defines the bindings as top-level variables before the script
+starts. Bindings are plain Python values: None, bool, int, float, str and
+lists or NLArrays of numbers, which are copied so runs never share an array.
+Printed output is captured and returned unless an output stream is given.
+Errors raise: NovoSyntaxError from compile(), RuntimeError (or
+LimitExceeded for `limits`) from run(), on either engine.
+
+Engine(backend='auto') runs programs on novolang_core when it is built and
+on the Python engine otherwise; 'python' or 'cpp' forces one.
+
+Engine(pool_size=N) builds N executors up front and runs every program on
+one leased from that pool (see pool.py): at most N runs at a time, each on
+an executor reset to a clean state. engine.pool.metrics() reports its
+occupancy and wait times; run(timeout=...) bounds the wait.
+"""
+import io
+import threading
+from collections import OrderedDict, namedtuple
+try:
+    from .lexer import tokenize
+    from .parser import Parser
+    from .py_executor import PyExecutor
+    from .governor import Governor
+    from .nl_array import NLArray
+    from .numeric import clamp_int
+    from .pool import ExecutorPool
+    from .type_inference import infer
+except ImportError:
+    from lexer import tokenize
+    from parser import Parser
+    from py_executor import PyExecutor
+    from governor import Governor
+    from nl_array import NLArray
+    from numeric import clamp_int
+    from pool import ExecutorPool
+    from type_inference import infer
+
+COMPILE_CACHE_SIZE = 256
+
+# output: the captured text, or None when an output stream was given
+RunResult = namedtuple('RunResult', ('output', 'globals'))
+
+def _core():
+    try:
+        import novolang_core
+        return novolang_core
+    except ImportError:
+        return None
+
+def _binding(name, value):
+    """value as a NovoLang value, with arrays copied."""
+    if value is None or isinstance(value, (bool, str, float)):
+        return value
+    if isinstance(value, int):
+        return clamp_int(value)
+    if isinstance(value, NLArray):
+        return NLArray.from_list(value.tolist())
+    if isinstance(value, (list, tuple)):
+        return NLArray.from_list(list(value))
+    raise TypeError(f"binding '{name}': unsupported type {type(value).__name__}")
+
+class Program:
+    """A compiled script; see Engine.compile()."""
+    __slots__ = ('engine', 'source', 'path', '_ast')
+
+    def __init__(self, engine, source, path, ast):
+        object.__setattr__(self, 'engine', engine)
+        object.__setattr__(self, 'source', source)
+        object.__setattr__(self, 'path', path)
+        object.__setattr__(self, '_ast', ast)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Program is immutable")
+
+    def run(self, bindings=None, output=None, limits=None, timeout=None):
+        """Run the program once; returns RunResult(output, globals).
+
+        output: a file-like object to print to instead of capturing.
+        limits: Governor limits (max_steps, max_seconds, max_memory).
+        timeout: seconds to wait for a pooled executor (PoolTimeout after).
+        """
+        variables = {name: _binding(name, value) for name, value in (bindings or {}).items()}
+        captured = io.StringIO() if output is None else None
+        executor = self.engine.acquire(captured or output, limits, timeout)
+        try:
+            if variables:
+                executor.set_global_variables(variables)
+            executor.execute(self._ast)
+            return RunResult(None if captured is None else captured.getvalue(), executor.global_variables())
+        finally:
+            self.engine.release(executor)
+
+class Engine:
+    def __init__(self, backend='auto', cache_size=COMPILE_CACHE_SIZE, pool_size=0):
+        if backend not in ('auto', 'python', 'cpp'):
+            raise ValueError(f"unknown backend {backend!r}")
+        core = _core() if backend in ('auto', 'cpp') else None
+        if backend == 'cpp' and core is None:
+            raise RuntimeError("Error: the C++ engine (novolang_core) is not built")
+        self.core = core
+        self.backend = 'cpp' if core is not None else 'python'
+        self.cache_size = cache_size
+        self._cache = OrderedDict()   # (source, path) -> Program, least recently used first
+        self._lock = threading.Lock()
+        self.pool = ExecutorPool(self._new_executor, pool_size) if pool_size else None
+
+    def compile(self, source, path=None):
+        """Program for source; path is its file, for resolving imports."""
+        key = (source, path)
+        with self._lock:
+            program = self._cache.get(key)
+            if program is not None:
+                self._cache.move_to_end(key)
+                return program
+        ast = Parser(tokenize(source)).parse()
+        ast['file'] = path
+        if self.core is not None:
+            # Typed-loop annotations, written before the AST is shared
+            infer(ast)
+        program = Program(self, source, path, ast)
+        with self._lock:
+            # Another thread may have compiled it meanwhile; keep the first
+            program = self._cache.setdefault(key, program)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return program
+
+    def _new_executor(self):
+        if self.core is not None:
+            executor = self.core.ASTExecutor()
+            executor.raise_errors = True
+            return executor
+        return PyExecutor()
+
+    def _configure(self, executor, output, limits):
+        executor.output = output
+        if limits:
+            if self.core is not None:
+                executor.set_limits(limits.get('max_steps') or 0, limits.get('max_seconds') or 0.0,
+                                    limits.get('max_memory') or 0)
+            else:
+                executor.governor = Governor(**limits)
+        return executor
+
+    def executor(self, output=None, limits=None):
+        """A fresh executor for one run, printing to output."""
+        return self._configure(self._new_executor(), output, limits)
+
+    def acquire(self, output=None, limits=None, timeout=None):
+        """An executor for one run: from the pool if the engine has one, else fresh.
+
+        Hand it back with release() when the run is over.
+        """
+        if self.pool is None:
+            return self.executor(output, limits)
+        return self._configure(self.pool.acquire(timeout), output, limits)
+
+    def release(self, executor):
+        if self.pool is not None:
+            self.pool.release(executor)
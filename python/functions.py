@@ -0,0 +1,135 @@
+"""User-defined functions: slot resolution and the memo cache.
+
+    定义 add(a, b) {          def add(a, b) {
+        返回 a + b               return a + b
+    }                         }
+    纯 定义 fib(n) { ... }     pure def fib(n) { ... }
+
+Both engines run a call in a flat frame of preallocated slots instead of a
+Scope chain. The parser calls resolve() on every function body, so the AST
+already says where each name lives:
+
+  * parameters and every name assigned anywhere in the body are locals;
+    IDENTIFIER/ASSIGNMENT nodes for them become SLOT/SLOT_ASSIGNMENT with a
+    fixed index, and INDEX_ASSIGNMENT gets a 'slot' key;
+  * any other name is a top-level (global) variable: IDENTIFIER becomes
+    GLOBAL and INDEX_ASSIGNMENT gets 'global': True.
+
+A function therefore reads globals but assigns only its own locals.
+Functions live in their own namespace and are looked up when called, so a
+function may call one defined later in the file. Globals and the function
+namespace are those of the file the function is defined in (see
+modules.py): a Function carries both, and calling it switches to them.
+
+`纯`/`pure` functions are memoized: results are cached per argument tuple
+(argument types included, so f(1) and f(1.0) are separate entries) in an
+LRU cache of MEMO_SIZE entries. Calls with array arguments or array
+results are not cached. Purity is the author's promise; nothing checks it.
+"""
+from collections import OrderedDict
+
+MEMO_SIZE = 1024
+# Deepest chain of nested calls before a script is stopped
+MAX_CALL_DEPTH = 1000
+
+def resolve(params, body):
+    """Rewrite a function body in place for slot frames; returns the local names."""
+    names = list(params)
+    _collect_locals(body, names)
+    slots = {name: index for index, name in enumerate(names)}
+    _rewrite(body, slots)
+    return names
+
+def _collect_locals(node, names):
+    if isinstance(node, list):
+        for item in node:
+            _collect_locals(item, names)
+    elif isinstance(node, dict):
+        if node.get('type') == 'ASSIGNMENT' and node['target'] not in names:
+            names.append(node['target'])
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                _collect_locals(value, names)
+
+def _rewrite(node, slots):
+    if isinstance(node, list):
+        for item in node:
+            _rewrite(item, slots)
+        return
+    if not isinstance(node, dict):
+        return
+    type_ = node.get('type')
+    if type_ == 'IDENTIFIER':
+        if node['name'] in slots:
+            node['type'] = 'SLOT'
+            node['slot'] = slots[node['name']]
+        else:
+            node['type'] = 'GLOBAL'
+    elif type_ == 'ASSIGNMENT':
+        node['type'] = 'SLOT_ASSIGNMENT'
+        node['slot'] = slots[node['target']]
+    elif type_ == 'INDEX_ASSIGNMENT':
+        if node['target'] in slots:
+            node['slot'] = slots[node['target']]
+        else:
+            node['global'] = True
+    for value in node.values():
+        if isinstance(value, (dict, list)):
+            _rewrite(value, slots)
+
+class MemoCache:
+    """LRU cache of results for one pure function."""
+
+    __slots__ = ('maxsize', 'entries', 'hits', 'misses', 'evictions')
+
+    def __init__(self, maxsize=MEMO_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        value = self.entries.get(key, default)
+        if value is default:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+        }
+
+class Function:
+    __slots__ = ('node', 'name', 'params', 'body', 'slots', 'locals', 'memo', 'globals', 'table')
+
+    def __init__(self, node, globals, table):
+        self.node = node        # the FUNCTION_DEF
+        self.name = node['name']
+        self.params = node['params']
+        self.body = node['body']
+        self.slots = node['slots']
+        self.locals = node['locals']   # slot names, for the debugger
+        self.memo = MemoCache() if node.get('pure') else None
+        self.globals = globals  # Scope of the defining file's top level
+        self.table = table      # name -> Function visible in that file
+
+def format_memo_stats(stats):
+    """One line per pure function, as printed by `main.py --usage`."""
+    return '\n'.join(
+        f"Memo cache {name}: {s['hits']} hits, {s['misses']} misses, "
+        f"{s['evictions']} evictions, {s['size']} entries"
+        for name, s in sorted(stats.items())
+    )
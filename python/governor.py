@@ -0,0 +1,95 @@
+import sys
+import time
+
+class LimitExceeded(RuntimeError):
+    """Raised inside the executor when a script exceeds a Governor limit."""
+
+    def __init__(self, resource, limit, used, line):
+        self.resource = resource
+        self.limit = limit
+        self.used = used
+        self.line = line
+        super().__init__(f"Error: {resource} limit exceeded at line {line} ({used} > {limit})")
+
+class Governor:
+    """Execution budget for one run: statements, wall-clock seconds and variable memory.
+
+    Executors call tick() at loop back-edges and whenever they create a
+    scope, passing the number of statements in the body about to run, the
+    current scope and the slot lists of the calls in progress. Step
+    counting is exact for code inside blocks; time and memory are sampled
+    every `check_interval` ticks to keep the per-iteration cost to a counter
+    update and a comparison, and memory is checked on every tick once it is
+    past half of its limit. A limit of None disables that check.
+    """
+
+    def __init__(self, max_steps=None, max_seconds=None, max_memory=None, check_interval=64):
+        self.max_steps = max_steps
+        self.max_seconds = max_seconds
+        self.max_memory = max_memory
+        self.check_interval = check_interval
+        self.reset()
+
+    def reset(self):
+        self.steps = 0
+        self.ticks = 0
+        self.peak_memory = 0
+        self.started = time.perf_counter()
+        self.finished = None
+        self._countdown = self.check_interval
+
+    def stop(self):
+        self.finished = time.perf_counter()
+
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def tick(self, steps, line, scope, frames=()):
+        self.steps += steps
+        self.ticks += 1
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise LimitExceeded('statement', self.max_steps, self.steps, line)
+        self._countdown -= 1
+        if self._countdown <= 0:
+            self._countdown = self.check_interval
+            self.check(line, scope, frames)
+
+    def check(self, line, scope, frames=()):
+        """Time and memory checks; also called directly at the end of a run."""
+        if self.max_seconds is not None:
+            elapsed = time.perf_counter() - self.started
+            if elapsed > self.max_seconds:
+                raise LimitExceeded('time', f"{self.max_seconds}s", f"{elapsed:.3f}s", line)
+        memory = scope_memory(scope, frames)
+        if memory > self.peak_memory:
+            self.peak_memory = memory
+        if self.max_memory is not None:
+            if memory > self.max_memory:
+                raise LimitExceeded('memory', f"{self.max_memory} bytes", f"{memory} bytes", line)
+            if memory * 2 > self.max_memory:
+                self._countdown = 1
+
+    def usage(self):
+        return {
+            'statements': self.steps,
+            'seconds': self.elapsed(),
+            'peak_memory': self.peak_memory,
+            'checks': self.ticks,
+        }
+
+    def format_usage(self):
+        u = self.usage()
+        return (f"Resource usage: {u['statements']} statements, {u['seconds']:.3f} s, "
+                f"peak variable memory {u['peak_memory']} bytes")
+
+def scope_memory(scope, frames=()):
+    """Approximate bytes held by the variables visible from scope and the slots of the calls in frames."""
+    total = 0
+    while scope is not None:
+        for name, value in scope.variables.items():
+            total += sys.getsizeof(name) + sys.getsizeof(value)
+        scope = scope.parent
+    for frame in frames:
+        for value in frame:
+            total += sys.getsizeof(value)
+    return total
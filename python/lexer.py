@@ -1,7 +1,149 @@
 import re
-import sys
+import os
+import gc
+import io
+import mmap
+import codecs
+import contextlib
+import functools
+try:
+    from .numeric import literal
+except ImportError:
+    from numeric import literal
+
+class NovoSyntaxError(Exception):
+    """A lexing or parsing error.
+
+    str() is the message scripts have always printed, prefixed with the
+    file name when the error is in an imported module. line is None at EOF.
+    """
+
+    def __init__(self, message, line=None, file=None):
+        super().__init__(message)
+        self.message = message
+        self.line = line
+        self.file = file
+
+    def __reduce__(self):
+        # Keep line and file when raised in a parallel lexing worker
+        return (NovoSyntaxError, (self.message, self.line, self.file))
+
+    def __str__(self):
+        if self.file:
+            return f"{os.path.basename(self.file)}: {self.message}"
+        return self.message
+
+# Keyword -> token type for every supported language
+KEYWORDS = {
+    # Chinese (Simplified)
+    '如果': 'IF',
+    '否则': 'ELSE',
+    '循环': 'LOOP',
+    '打印': 'PRINT',
+    '定义': 'DEF',
+    '返回': 'RETURN',
+    '当': 'WHILE',
+    '自动': 'AUTO',
+    '真': 'TRUE',
+    '假': 'FALSE',
+    '空': 'NULL',
+    '长度': 'LEN',
+    '纯': 'PURE',
+    '导入': 'IMPORT',
+    '检查点': 'CHECKPOINT',
+    
+    # English
+    'if': 'IF',
+    'else': 'ELSE',
+    'loop': 'LOOP',
+    'for': 'LOOP',
+    'print': 'PRINT',
+    'def': 'DEF',
+    'var': 'DEF',
+    'return': 'RETURN',
+    'while': 'WHILE',
+    'auto': 'AUTO',
+    'true': 'TRUE',
+    'false': 'FALSE',
+    'null': 'NULL',
+    'len': 'LEN',
+    'pure': 'PURE',
+    'import': 'IMPORT',
+    'checkpoint': 'CHECKPOINT',
+
+    # Japanese
+    'もし': 'IF',
+    'その他': 'ELSE',
+    '繰り返し': 'LOOP',
+    '表示': 'PRINT',
+    '定義': 'DEF',
+    '戻る': 'RETURN',
+    '間': 'WHILE',
+    '自動': 'AUTO',
+    '真': 'TRUE', # Same as Chinese often, but distinct in context
+    '偽': 'FALSE',
+    '無': 'NULL',
+    '長さ': 'LEN',
+    '純粋': 'PURE',
+    'インポート': 'IMPORT',
+    'チェックポイント': 'CHECKPOINT',
+
+    # Korean
+    '만약': 'IF',
+    '아니면': 'ELSE',
+    '반복': 'LOOP',
+    '출력': 'PRINT',
+    '정의': 'DEF',
+    '반환': 'RETURN',
+    '동안': 'WHILE',
+    '자동': 'AUTO',
+    '참': 'TRUE',
+    '거짓': 'FALSE',
+    '비어': 'NULL',
+    '길이': 'LEN',
+    '순수': 'PURE',
+    '가져오기': 'IMPORT',
+    '체크포인트': 'CHECKPOINT',
+
+    # Russian
+    'если': 'IF',
+    'иначе': 'ELSE',
+    'цикл': 'LOOP',
+    'печать': 'PRINT',
+    'определить': 'DEF',
+    'вернуть': 'RETURN',
+    'пока': 'WHILE',
+    'авто': 'AUTO',
+    'истина': 'TRUE',
+    'ложь': 'FALSE',
+    'ноль': 'NULL',
+    'длина': 'LEN',
+    'чистая': 'PURE',
+    'импорт': 'IMPORT',
+    'контрольная_точка': 'CHECKPOINT'
+}
+
+# Token patterns, tried in order
+TOKEN_SPEC = [
+    ('COMMENT', r'//.*'),
+    ('NUMBER',  r'\d+(\.\d+)?'),
+    ('STRING',  r'"[^"]*"'),
+    ('ID',      r'[a-zA-Z_\u4e00-\u9fa5][a-zA-Z0-9_\u4e00-\u9fa5]*'),
+    ('OP',      r'==|!=|<>|>=|<=|>|<|=|\+|\-|\*|/'),
+    ('PUNCT',   r'\(|\)|\[|\]|,|\{|\}|;'),
+    ('NEWLINE', r'\n'),
+    ('SKIP',    r'[ \t\r]+'),
+    ('MISMATCH',r'.'),
+]
+
+@functools.lru_cache(maxsize=None)
+def token_regex():
+    """Compiled master pattern, built on first tokenize rather than at import."""
+    return re.compile('|'.join('(?P<%s>%s)' % pair for pair in TOKEN_SPEC))
 
 class Token:
+    __slots__ = ('type', 'value', 'line')
+
     def __init__(self, type, value, line):
         self.type = type
         self.value = value
@@ -11,97 +153,17 @@ class Token:
         return f"Token({self.type}, {self.value}, {self.line})"
 
 class Lexer:
-    def __init__(self, code):
+    def __init__(self, code, line=1):
+        # line: line number of code's first line, when code is a chunk of a larger source
         self.code = code
         self.tokens = []
         self.pos = 0
-        self.line = 1
-        self.keywords = {
-            # Chinese (Simplified)
-            '如果': 'IF',
-            '否则': 'ELSE',
-            '循环': 'LOOP',
-            '打印': 'PRINT',
-            '定义': 'DEF',
-            '返回': 'RETURN',
-            '当': 'WHILE',
-            '自动': 'AUTO',
-            '真': 'TRUE',
-            '假': 'FALSE',
-            '空': 'NULL',
-            
-            # English
-            'if': 'IF',
-            'else': 'ELSE',
-            'loop': 'LOOP',
-            'for': 'LOOP',
-            'print': 'PRINT',
-            'def': 'DEF',
-            'var': 'DEF',
-            'return': 'RETURN',
-            'while': 'WHILE',
-            'auto': 'AUTO',
-            'true': 'TRUE',
-            'false': 'FALSE',
-            'null': 'NULL',
-
-            # Japanese
-            'もし': 'IF',
-            'その他': 'ELSE',
-            '繰り返し': 'LOOP',
-            '表示': 'PRINT',
-            '定義': 'DEF',
-            '戻る': 'RETURN',
-            '間': 'WHILE',
-            '自動': 'AUTO',
-            '真': 'TRUE', # Same as Chinese often, but distinct in context
-            '偽': 'FALSE',
-            '無': 'NULL',
-
-            # Korean
-            '만약': 'IF',
-            '아니면': 'ELSE',
-            '반복': 'LOOP',
-            '출력': 'PRINT',
-            '정의': 'DEF',
-            '반환': 'RETURN',
-            '동안': 'WHILE',
-            '자동': 'AUTO',
-            '참': 'TRUE',
-            '거짓': 'FALSE',
-            '비어': 'NULL',
-
-            # Russian
-            'если': 'IF',
-            'иначе': 'ELSE',
-            'цикл': 'LOOP',
-            'печать': 'PRINT',
-            'определить': 'DEF',
-            'вернуть': 'RETURN',
-            'пока': 'WHILE',
-            'авто': 'AUTO',
-            'истина': 'TRUE',
-            'ложь': 'FALSE',
-            'ноль': 'NULL'
-        }
+        self.line = line
+        # Shared, read-only keyword table (built once at import)
+        self.keywords = KEYWORDS
 
     def tokenize(self):
-        # Regex patterns
-        token_spec = [
-            ('COMMENT', r'//.*'),
-            ('NUMBER',  r'\d+(\.\d+)?'),
-            ('STRING',  r'"[^"]*"'),
-            ('ID',      r'[a-zA-Z_\u4e00-\u9fa5][a-zA-Z0-9_\u4e00-\u9fa5]*'),
-            ('OP',      r'==|!=|<>|>=|<=|>|<|=|\+|\-|\*|/'),
-            ('PUNCT',   r'\(|\)|,|\{|\}|;'),
-            ('NEWLINE', r'\n'),
-            ('SKIP',    r'[ \t\r]+'),
-            ('MISMATCH',r'.'),
-        ]
-        
-        tok_regex = '|'.join('(?P<%s>%s)' % pair for pair in token_spec)
-        
-        for mo in re.finditer(tok_regex, self.code):
+        for mo in token_regex().finditer(self.code):
             kind = mo.lastgroup
             value = mo.group()
             
@@ -116,13 +178,169 @@ class Lexer:
                     kind = self.keywords[value]
                 self.tokens.append(Token(kind, value, self.line))
             elif kind == 'MISMATCH':
-                # Simplified error handling as per requirements
-                # In a real compiler, we might throw an error here or accumulate it
-                print(f"Error: Unexpected character '{value}' at line {self.line}")
-                sys.exit(1)
+                raise NovoSyntaxError(f"Error: Unexpected character '{value}' at line {self.line}", self.line)
             else:
                 if kind == 'STRING':
                     value = value[1:-1] # Remove quotes
+                elif kind == 'NUMBER':
+                    value = literal(value) # int or float, see numeric.py
                 self.tokens.append(Token(kind, value, self.line))
                 
         return self.tokens
+
+# Sources at least this long are lexed in parallel by tokenize(); each
+# chunk handed to a worker is at least PARALLEL_CHUNK_CHARS long
+PARALLEL_MIN_CHARS = 8 << 20
+PARALLEL_CHUNK_CHARS = 1 << 20
+# Bytes of a memory-mapped source decoded and lexed at a time by the
+# streaming front end (source_blocks / stream_tokens)
+STREAM_BLOCK_BYTES = 1 << 20
+# The only tokens that can contain '//' or '"', found exactly where the
+# master pattern finds them: no other token can start with either
+_OPAQUE = re.compile(r'//[^\n]*|"[^"]*"')
+
+def split_source(code, parts):
+    """Cut code into at most parts (chunk, first line) pieces at safe line starts.
+
+    A cut is only made right after a newline that is not inside a string
+    (comments end at the newline), so lexing the chunks separately gives
+    the same tokens as lexing code whole. Like the lexer, line numbers do
+    not count newlines inside strings.
+    """
+    size = max(len(code) // max(parts, 1), 1)
+    spans = _OPAQUE.finditer(code)
+    span = next(spans, None)
+    chunks = []
+    start, line = 0, 1
+    while len(chunks) < parts - 1:
+        cut = code.find('\n', start + size) + 1
+        in_strings = 0
+        while cut:
+            while span is not None and span.end() <= cut:
+                in_strings += span.group().count('\n')
+                span = next(spans, None)
+            if span is None or span.start() >= cut:
+                break
+            # A multi-line string spans the cut: move past it
+            cut = code.find('\n', span.end()) + 1
+        if not cut:
+            break
+        chunks.append((code[start:cut], line))
+        line += code.count('\n', start, cut) - in_strings
+        start = cut
+    chunks.append((code[start:], line))
+    return chunks
+
+@contextlib.contextmanager
+def _gc_paused():
+    # Tokens hold no reference cycles, so collections triggered by
+    # allocating millions of them find nothing and only cost time
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def _stream_cut(text):
+    """Offset just past the last newline in text that no string spans, or 0.
+
+    text may end part way through a string, which then shows up as a '"'
+    outside every complete string and comment found before the cut.
+    """
+    cut = text.rfind('\n') + 1
+    while cut:
+        end = 0
+        for span in _OPAQUE.finditer(text, 0, cut):
+            quote = text.find('"', end, span.start())
+            if quote >= 0:
+                break
+            end = span.end()
+        else:
+            quote = text.find('"', end, cut)
+        if quote < 0:
+            return cut
+        cut = text.rfind('\n', 0, quote) + 1
+    return 0
+
+def source_blocks(path, block_bytes=STREAM_BLOCK_BYTES):
+    """Text of path in pieces of about block_bytes, read through a memory map.
+
+    Decoded as UTF-8 with newlines translated as open() does, so the pieces
+    join to exactly what open(path, encoding='utf-8').read() returns.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), True)
+            size = len(data)
+            # Drop pages already decoded, so resident memory does not grow with the file
+            release = hasattr(mmap, 'MADV_DONTNEED') and block_bytes % mmap.PAGESIZE == 0
+            for start in range(0, size, block_bytes):
+                end = min(start + block_bytes, size)
+                text = decoder.decode(data[start:end], final=end == size)
+                if release:
+                    data.madvise(mmap.MADV_DONTNEED, start, end - start)
+                if text:
+                    yield text
+
+def stream_tokens(blocks):
+    """Tokens of the text blocks joined together, produced lazily.
+
+    Each block is lexed up to its last newline outside a string and the
+    rest carried into the next, so only about one block's tokens exist at
+    a time; tokens, line numbers and errors equal those of lexing the
+    joined text in one go (an error is raised when it is reached).
+    """
+    carry, line = '', 1
+    for block in blocks:
+        text = carry + block
+        cut = _stream_cut(text)
+        if not cut:
+            carry = text
+            continue
+        lexer = Lexer(text[:cut], line)
+        yield from lexer.tokenize()
+        line = lexer.line
+        carry = text[cut:]
+    if carry:
+        yield from Lexer(carry, line).tokenize()
+
+def _tokenize_chunk(chunk):
+    # Columns pickle far faster than Token objects on the way back
+    with _gc_paused():
+        tokens = Lexer(*chunk).tokenize()
+    return [t.type for t in tokens], [t.value for t in tokens], [t.line for t in tokens]
+
+def lex_workers():
+    """Parallel lexing workers: $NOVOLANG_LEX_WORKERS, else one per CPU."""
+    value = os.environ.get('NOVOLANG_LEX_WORKERS')
+    return int(value) if value else (os.cpu_count() or 1)
+
+def tokenize(code, workers=None):
+    """Tokens of code, as Lexer(code).tokenize() returns them.
+
+    Sources of PARALLEL_MIN_CHARS or more are split with split_source and
+    lexed by a pool of workers (default lex_workers()) processes; the chunk
+    token lists are concatenated in order, and an error is raised for the
+    first chunk that has one, so the result is identical to lexing in one go.
+    The garbage collector is paused while tokens of sources of
+    PARALLEL_CHUNK_CHARS or more are built.
+    """
+    if len(code) < PARALLEL_CHUNK_CHARS:
+        return Lexer(code).tokenize()
+    if workers is None:
+        workers = lex_workers() if len(code) >= PARALLEL_MIN_CHARS else 1
+    parts = min(workers * 4, len(code) // PARALLEL_CHUNK_CHARS)
+    if workers <= 1 or parts <= 1:
+        with _gc_paused():
+            return Lexer(code).tokenize()
+    from concurrent.futures import ProcessPoolExecutor
+    tokens = []
+    with ProcessPoolExecutor(workers) as pool:
+        for types, values, lines in pool.map(_tokenize_chunk, split_source(code, parts)):
+            with _gc_paused():
+                tokens.extend(map(Token, types, values, lines))
+    return tokens
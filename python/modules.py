@@ -0,0 +1,161 @@
+"""NovoLang modules: `导入 name` / `import name`.
+
+A module is another .nl file. Importing it runs its top-level code once per
+process and binds its exports in the importing scope: every top-level
+variable and function (including ones it imported itself) whose name does
+not start with '_'. Each module has its own namespace, so a module's
+functions read that module's variables and call that module's functions,
+whatever the importer defines.
+
+The process-wide loader caches the compiled AST and the resulting bindings
+of every module it has run, keyed by absolute path; a module is compiled and
+run again only when its own file's modification time changes. Long-lived
+processes (the editor, --serve workers) therefore parse a shared library
+once however many scripts import it. The record is engine neutral:
+top-level variables as plain Python values, the module's own FUNCTION_DEF
+nodes and the modules it imported, from which either engine rebuilds the
+namespace; engines may also keep their own bound form in Module.cache.
+The loader is shared by all threads: modules are compiled and run one at a
+time, and a thread that needs a module another is loading waits for it.
+
+`name` is a module name or relative path, with or without the .nl suffix.
+It is looked up in the importing file's directory, then in each directory
+added with `main.py -I DIR`, then in $NOVOLANG_PATH (os.pathsep separated).
+Importing a module that is still being loaded is a circular import and an
+error.
+"""
+import os
+import threading
+try:
+    from .lexer import NovoSyntaxError, tokenize
+    from .parser import Parser
+except ImportError:
+    from lexer import NovoSyntaxError, tokenize
+    from parser import Parser
+
+class Module:
+    __slots__ = ('path', 'mtime', 'ast', 'variables', 'functions', 'imports', 'cache')
+
+    def __init__(self, path, mtime, ast):
+        self.path = path
+        self.mtime = mtime
+        self.ast = ast
+        self.variables = {}   # top-level name -> value, after running the module
+        self.functions = function_defs(ast['statements'])  # name -> FUNCTION_DEF node
+        self.imports = []     # paths of the modules it imported
+        self.cache = {}       # per-engine bound namespaces
+
+def exported(name):
+    return not name.startswith('_')
+
+def function_defs(statements, found=None):
+    """FUNCTION_DEF nodes defined at the top level (or in top-level blocks)."""
+    found = {} if found is None else found
+    for node in statements:
+        if isinstance(node, list):
+            function_defs(node, found)
+        elif isinstance(node, dict):
+            if node.get('type') == 'FUNCTION_DEF':
+                found[node['name']] = node
+                continue
+            for value in node.values():
+                if isinstance(value, (dict, list)):
+                    function_defs([value], found)
+    return found
+
+class ModuleLoader:
+    def __init__(self, search_path=None):
+        self.search_path = list(search_path or [])
+        self.modules = {}     # absolute path -> Module
+        self._local = threading.local()
+        # Held while a module is compiled and run, so threads never load the
+        # same module twice or see one half-run. One lock, not one per path:
+        # two threads loading modules that import each other would deadlock.
+        # Re-entrant for the imports a module makes.
+        self._lock = threading.RLock()
+
+    @property
+    def loading(self):
+        """Modules the calling thread is loading, outermost first."""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def directories(self, base_dir):
+        dirs = [os.path.abspath(base_dir or os.getcwd())] + self.search_path
+        env = os.environ.get('NOVOLANG_PATH')
+        if env:
+            dirs.extend(os.path.abspath(d) for d in env.split(os.pathsep) if d)
+        return list(dict.fromkeys(dirs))
+
+    def resolve(self, name, base_dir=None):
+        filename = name if name.endswith('.nl') else name + '.nl'
+        dirs = self.directories(base_dir)
+        for directory in dirs:
+            path = os.path.join(directory, filename)
+            if os.path.isfile(path):
+                return os.path.abspath(path)
+        raise RuntimeError(f"Error: module '{name}' not found (searched {os.pathsep.join(dirs)})")
+
+    def compile(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            code = f.read()
+        try:
+            ast = Parser(tokenize(code)).parse()
+        except NovoSyntaxError as e:
+            e.file = path
+            raise
+        ast['file'] = path
+        return ast
+
+    def load(self, name, base_dir, run):
+        """Module for name, compiling and running it first if needed.
+
+        run(module) executes module.ast's top level on the importing engine
+        and returns its top-level variables as Python values.
+        """
+        path = self.resolve(name, base_dir)
+        loading = self.loading
+        paths = [m.path for m in loading]
+        if path in paths:
+            chain = paths[paths.index(path):] + [path]
+            raise RuntimeError("Error: circular import: " + ' -> '.join(os.path.basename(p) for p in chain))
+        if loading:
+            loading[-1].imports.append(path)
+
+        mtime = os.path.getmtime(path)
+        module = self.modules.get(path)
+        if module is not None and module.mtime == mtime:
+            return module
+
+        with self._lock:
+            # Another thread may have loaded it while this one waited
+            module = self.modules.get(path)
+            if module is not None and module.mtime == mtime:
+                return module
+            module = Module(path, mtime, self.compile(path))
+            loading.append(module)
+            try:
+                module.variables = run(module)
+            finally:
+                loading.pop()
+            self.modules[path] = module
+        return module
+
+_loader = ModuleLoader()
+
+def loader():
+    """The process-wide ModuleLoader."""
+    return _loader
+
+def add_search_path(directories):
+    for directory in directories:
+        path = os.path.abspath(directory)
+        if path not in _loader.search_path:
+            _loader.search_path.append(path)
+
+def base_dir(ast):
+    """Directory imports in ast are resolved against (its file's, else the cwd)."""
+    path = ast.get('file')
+    return os.path.dirname(path) if path else None
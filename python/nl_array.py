@@ -0,0 +1,193 @@
+"""NovoLang array values.
+
+An array is a one-dimensional, homogeneous sequence of numbers: all INT
+(int64) or all FLOAT (float64). Storage is a NumPy array when NumPy is
+installed and an `array.array` ('q' or 'd') otherwise; NumPy is imported on
+first use so scripts without arrays do not pay for it. Set
+NOVOLANG_NO_NUMPY=1 to force the fallback.
+
+Operators broadcast elementwise (array op array of equal length, or array
+op number) following the scalar rules in numeric.py. The result is an INT
+array when every element result is an INT under those rules, otherwise a
+FLOAT array. Comparisons give an INT array of 1 (true) and 0 (false),
+except that == and != against null test for null (the executors decide
+that before calling elementwise()).
+Both engines use this module, so arrays behave the same under PyExecutor
+and novolang_core.
+"""
+import array
+import functools
+import os
+try:
+    from .numeric import INT_MIN, clamp_int, divide, format_float
+except ImportError:
+    from numeric import INT_MIN, clamp_int, divide, format_float
+
+@functools.lru_cache(maxsize=None)
+def numpy():
+    """The numpy module, or None when it is missing or disabled."""
+    if os.environ.get('NOVOLANG_NO_NUMPY'):
+        return None
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+def _check_number(value):
+    if value.__class__ is not int and value.__class__ is not float:
+        raise RuntimeError(f"Error: array elements must be numbers, got {value!r}")
+
+class NLArray:
+    __slots__ = ('data', 'is_int')
+
+    def __init__(self, data, is_int):
+        self.data = data      # numpy.ndarray or array.array
+        self.is_int = is_int  # int64 elements, else float64
+
+    @classmethod
+    def from_list(cls, values):
+        for value in values:
+            _check_number(value)
+        is_int = all(value.__class__ is int for value in values)
+        np = numpy()
+        if np is not None:
+            return cls(np.array(values, dtype=np.int64 if is_int else np.float64), is_int)
+        return cls(array.array('q' if is_int else 'd', values), is_int)
+
+    def _index(self, index):
+        if index.__class__ is not int:
+            raise RuntimeError(f"Error: array index must be an integer, got {index!r}")
+        if not 0 <= index < len(self.data):
+            raise RuntimeError(f"Error: array index {index} out of range (length {len(self.data)})")
+        return index
+
+    def get(self, index):
+        value = self.data[self._index(index)]
+        return int(value) if self.is_int else float(value)
+
+    def set(self, index, value):
+        index = self._index(index)
+        _check_number(value)
+        if self.is_int and value.__class__ is float:
+            # Storing a float turns the whole array into a FLOAT array
+            np = numpy()
+            self.data = self.data.astype(np.float64) if np is not None else array.array('d', self.data)
+            self.is_int = False
+        self.data[index] = value
+
+    def tolist(self):
+        return self.data.tolist()
+
+    def __len__(self):
+        return len(self.data)
+
+    def __bool__(self):
+        return len(self.data) > 0
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + len(self.data) * self.data.itemsize
+
+    def __str__(self):
+        if self.is_int:
+            return '[' + ', '.join(map(str, self.tolist())) + ']'
+        return '[' + ', '.join(map(format_float, self.tolist())) + ']'
+
+    def __repr__(self):
+        return f"NLArray({self})"
+
+# Scalar rules applied per element by the array.array fallback
+_SCALAR_OPS = {
+    '+': lambda a, b: clamp_int(a + b),
+    '-': lambda a, b: clamp_int(a - b),
+    '*': lambda a, b: clamp_int(a * b),
+    '/': divide,
+    '<': lambda a, b: int(a < b),
+    '>': lambda a, b: int(a > b),
+    '<=': lambda a, b: int(a <= b),
+    '>=': lambda a, b: int(a >= b),
+    '==': lambda a, b: int(a == b),
+    '!=': lambda a, b: int(a != b),
+    '<>': lambda a, b: int(a != b),
+}
+
+_COMPARE_UFUNCS = {
+    '<': 'less', '>': 'greater', '<=': 'less_equal', '>=': 'greater_equal',
+    '==': 'equal', '!=': 'not_equal', '<>': 'not_equal',
+}
+
+def elementwise(op, left, right):
+    """left op right where at least one side is an NLArray."""
+    if op not in _SCALAR_OPS:
+        raise RuntimeError(f"Error: unsupported array operator '{op}'")
+    length = None
+    for side in (left, right):
+        if isinstance(side, NLArray):
+            if length is not None and len(side) != length:
+                raise RuntimeError(f"Error: array length mismatch ({length} vs {len(side)})")
+            length = len(side)
+        else:
+            _check_number(side)
+    np = numpy()
+    if np is None:
+        return _python_op(op, left, right, length)
+    return _numpy_op(np, op, left, right)
+
+def _python_op(op, left, right, length):
+    func = _SCALAR_OPS[op]
+    lhs = left.data if isinstance(left, NLArray) else [left] * length
+    rhs = right.data if isinstance(right, NLArray) else [right] * length
+    return NLArray.from_list([func(a, b) for a, b in zip(lhs, rhs)])
+
+def _operand(side):
+    if isinstance(side, NLArray):
+        return side.data, side.is_int
+    return side, side.__class__ is int
+
+def _numpy_op(np, op, left, right):
+    lhs, left_int = _operand(left)
+    rhs, right_int = _operand(right)
+    with np.errstate(all='ignore'):
+        ufunc = _COMPARE_UFUNCS.get(op)
+        if ufunc is not None:
+            return NLArray(getattr(np, ufunc)(lhs, rhs).astype(np.int64), True)
+        if op == '/':
+            return _numpy_divide(np, lhs, rhs, left_int and right_int)
+        if left_int and right_int:
+            result = _numpy_int_op(np, op, lhs, rhs)
+            if result is not None:
+                return NLArray(result, True)
+        lhs = np.asarray(lhs, dtype=np.float64)
+        if op == '+':
+            result = np.add(lhs, rhs)
+        elif op == '-':
+            result = np.subtract(lhs, rhs)
+        else:
+            result = np.multiply(lhs, rhs)
+        return NLArray(result.astype(np.float64, copy=False), False)
+
+def _numpy_int_op(np, op, lhs, rhs):
+    """int64 result, or None if any element leaves the 64-bit range."""
+    if op == '+':
+        result = np.add(lhs, rhs, dtype=np.int64)
+        overflow = ((lhs ^ result) & (rhs ^ result)) < 0
+    elif op == '-':
+        result = np.subtract(lhs, rhs, dtype=np.int64)
+        overflow = ((lhs ^ rhs) & (lhs ^ result)) < 0
+    else:
+        result = np.multiply(lhs, rhs, dtype=np.int64)
+        overflow = np.abs(np.multiply(lhs, rhs, dtype=np.float64)) >= 2.0 ** 63
+    if np.any(overflow):
+        return None
+    return result
+
+def _numpy_divide(np, lhs, rhs, both_int):
+    zero = np.equal(rhs, 0)
+    if both_int:
+        safe = np.where(zero, 1, rhs)
+        quotient, remainder = np.divmod(lhs, safe)
+        exact = not np.any(remainder) and not np.any(np.equal(lhs, INT_MIN) & np.equal(safe, -1))
+        if exact:
+            return NLArray(np.where(zero, 0, quotient).astype(np.int64), True)
+    result = np.where(zero, 0.0, np.true_divide(lhs, rhs))
+    return NLArray(result.astype(np.float64, copy=False), False)
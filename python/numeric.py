@@ -0,0 +1,79 @@
+"""NovoLang numeric tower, shared by both engines.
+
+This module is the reference specification; c++/src/numeric.cpp implements
+the same rules for novolang_core and must be kept in step with it.
+
+Literals
+    `123` is an INT, `1.5` is a FLOAT. The lexer converts NUMBER tokens to
+    Python int/float and the AST carries that type, so engines never
+    re-derive it at run time. An integer literal outside the 64-bit range
+    becomes a FLOAT.
+
+Arithmetic (+ - * /)
+    INT op INT stays INT. If either operand is FLOAT the result is FLOAT.
+    An INT result outside the signed 64-bit range is promoted to FLOAT.
+    `/` is exact division: INT / INT gives an INT when the division is
+    exact and a FLOAT otherwise. Division by zero yields INT 0. true and
+    false count as INT 1 and 0, so `(x > 3) * 255` is 0 or 255.
+
+Comparison (< > <= >= == != <>)
+    INT and FLOAT compare by numeric value, so `1 == 1.0` is true.
+
+Truthiness
+    null, false, 0, 0.0, "" and an empty array are false; everything else
+    is true.
+
+Arrays
+    nl_array.py applies the arithmetic and comparison rules elementwise.
+
+Display (print and string concatenation)
+    INT prints in decimal. FLOAT prints with up to 15 significant digits
+    (C's %.15g) and keeps a trailing ".0" when integral, e.g. 5.0, 0.1,
+    1e+20. true/false/null print as 真/假/空. Arrays print as [1, 2, 3] or
+    [1.0, 2.5].
+"""
+
+INT_MIN = -0x8000000000000000
+INT_MAX = 0x7fffffffffffffff
+
+def literal(text):
+    """Value of a NUMBER token's text."""
+    if '.' in text:
+        return float(text)
+    value = int(text)
+    if value > INT_MAX:
+        return float(value)
+    return value
+
+def clamp_int(value):
+    """Promote an int result outside the 64-bit range to float."""
+    if value.__class__ is int and (value > INT_MAX or value < INT_MIN):
+        return float(value)
+    return value
+
+def divide(left, right):
+    if right == 0:
+        return 0
+    if isinstance(left, int) and isinstance(right, int):  # bools included
+        quotient, remainder = divmod(left, right)
+        if remainder == 0:
+            return clamp_int(quotient)
+    return left / right
+
+def format_float(value):
+    text = '%.15g' % value
+    if '.' not in text and 'e' not in text and 'n' not in text:
+        text += '.0'
+    return text
+
+def to_display(value):
+    """Text of a value as print and string concatenation show it."""
+    if value is True:
+        return "真"
+    if value is False:
+        return "假"
+    if value is None:
+        return "空"
+    if value.__class__ is float:
+        return format_float(value)
+    return str(value)
@@ -1,16 +1,32 @@
 try:
-    from .lexer import Lexer
+    from .lexer import Lexer, NovoSyntaxError
     from .ast_builder import ASTBuilder
+    from .functions import resolve
 except ImportError:
-    from lexer import Lexer
+    from lexer import Lexer, NovoSyntaxError
     from ast_builder import ASTBuilder
-import sys
+    from functions import resolve
+
+class _EndOfInput:
+    """current_token after the last token: false, and matches no token type or value."""
+    type = 'EOF'
+    value = None
+    line = None
+
+    def __bool__(self):
+        return False
+
+EOF = _EndOfInput()
 
 class Parser:
     def __init__(self, tokens):
-        self.tokens = tokens
-        self.pos = 0
-        self.current_token = self.tokens[0] if self.tokens else None
+        # tokens is any iterable (a list, or lexer.stream_tokens); the parser
+        # looks at most one token ahead
+        self.tokens = iter(tokens)
+        self.current_token = next(self.tokens, EOF)
+        self.next_token = next(self.tokens, None)
+        self.in_function = False
+        self.depth = 0  # nesting of the block being parsed; 0 at the top level
 
     def eat(self, type):
         if self.current_token and self.current_token.type == type:
@@ -18,25 +34,40 @@ class Parser:
         else:
             self.error(f"Expected token {type}, got {self.current_token.type if self.current_token else 'EOF'}")
 
-    def advance(self):
-        self.pos += 1
-        if self.pos < len(self.tokens):
-            self.current_token = self.tokens[self.pos]
+    def expect_punct(self, value):
+        if self.current_token and self.current_token.type == 'PUNCT' and self.current_token.value == value:
+            self.advance()
         else:
-            self.current_token = None
+            self.error(f"Expected '{value}', got {self.current_token.value if self.current_token else 'EOF'}")
+
+    def advance(self):
+        self.current_token = self.next_token or EOF
+        self.next_token = next(self.tokens, None) if self.current_token else None
+
+    def peek_value(self):
+        return self.next_token.value if self.next_token else None
 
     def error(self, msg):
-        line = self.current_token.line if self.current_token else "EOF"
-        print(f"Syntax Error at line {line}: {msg}")
-        sys.exit(1)
+        line = self.current_token.line if self.current_token else None
+        raise NovoSyntaxError(f"Syntax Error at line {'EOF' if line is None else line}: {msg}", line)
 
     def parse(self):
-        statements = []
+        return ASTBuilder.block(list(self.statements()))
+
+    def statements(self):
+        """Yield top-level statements as they are parsed (for streaming execution)."""
         while self.current_token:
-            statements.append(self.statement())
-        return ASTBuilder.block(statements)
+            yield self.statement()
 
     def statement(self):
+        # Every statement node carries the source line it starts on, for
+        # error messages and the profiler
+        line = self.current_token.line
+        node = self.statement_node()
+        node['line'] = line
+        return node
+
+    def statement_node(self):
         if self.current_token.type == 'IF':
             return self.if_statement()
         elif self.current_token.type == 'LOOP':
@@ -45,13 +76,30 @@ class Parser:
             return self.print_statement()
         elif self.current_token.type == 'DEF':
             return self.def_statement()
+        elif self.current_token.type == 'PURE':
+            self.eat('PURE')
+            if not self.current_token or self.current_token.type != 'DEF':
+                self.error("Expected a function definition after 'pure'")
+            return self.def_statement(pure=True)
+        elif self.current_token.type == 'RETURN':
+            return self.return_statement()
+        elif self.current_token.type == 'IMPORT':
+            return self.import_statement()
+        elif self.current_token.type == 'CHECKPOINT':
+            return self.checkpoint_statement()
         elif self.current_token.type == 'AUTO':
-            return self.auto_statement()
+            return self.auto_call()
         elif self.current_token.type == 'ID':
             # Could be assignment or function call (if we had them as stmt)
             # Check lookahead
-            if self.pos + 1 < len(self.tokens) and self.tokens[self.pos + 1].value == '=':
+            if self.peek_value() == '=':
                 return self.assign_statement()
+            elif self.peek_value() == '[':
+                return self.index_assign_statement()
+            elif self.peek_value() == '(':
+                name = self.current_token.value
+                self.eat('ID')
+                return ASTBuilder.call_stmt(name, self.call_args())
             else:
                  self.error(f"Unexpected identifier {self.current_token.value}")
         else:
@@ -72,6 +120,7 @@ class Parser:
         return ASTBuilder.if_stmt(condition, body, else_body)
 
     def loop_statement(self):
+        line = self.current_token.line
         self.eat('LOOP')
         self.eat('PUNCT') # (
         
@@ -79,7 +128,7 @@ class Parser:
         is_for_loop = False
         if self.current_token.type == 'ID':
             # Lookahead for assignment '='
-            if self.pos + 1 < len(self.tokens) and self.tokens[self.pos + 1].value == '=':
+            if self.peek_value() == '=':
                 is_for_loop = True
         
         if is_for_loop:
@@ -113,6 +162,7 @@ class Parser:
             body_stmts.append(step_stmt)
             
             loop_node = ASTBuilder.loop_stmt(condition, body_stmts)
+            loop_node['line'] = line
             
             # Wrap init and loop in a block to scope the loop var (if we had block scope)
             # or just to execute sequentially
@@ -130,22 +180,106 @@ class Parser:
         val = self.expr()
         return ASTBuilder.print_stmt(val)
 
-    def def_statement(self):
+    def def_statement(self, pure=False):
         self.eat('DEF')
         var_name = self.current_token.value
         self.eat('ID')
+        if self.current_token and self.current_token.value == '(':
+            return self.function_def(var_name, pure)
+        if pure:
+            self.error("Only functions can be pure")
         self.eat('OP') # Expect '='
         val = self.expr()
         return ASTBuilder.assignment(var_name, val)
 
+    def function_def(self, name, pure):
+        # 定义 name(a, b) { ... }
+        if self.in_function:
+            self.error("Functions can only be defined at the top level")
+        self.expect_punct('(')
+        params = []
+        if self.current_token.value != ')':
+            params.append(self.current_token.value)
+            self.eat('ID')
+            while self.current_token.value == ',':
+                self.eat('PUNCT')
+                params.append(self.current_token.value)
+                self.eat('ID')
+        self.expect_punct(')')
+        if len(set(params)) != len(params):
+            self.error(f"Duplicate parameter name in function '{name}'")
+        self.in_function = True
+        try:
+            body = self.block()
+        finally:
+            self.in_function = False
+        return ASTBuilder.function_def(name, params, body, resolve(params, body), pure)
+
+    def return_statement(self):
+        if not self.in_function:
+            self.error("'return' outside a function")
+        self.eat('RETURN')
+        # Bare `return` only directly before the closing brace
+        if not self.current_token or self.current_token.value == '}':
+            return ASTBuilder.return_stmt(None)
+        return ASTBuilder.return_stmt(self.expr())
+
+    def import_statement(self):
+        # 导入 name / 导入 "lib/util.nl"
+        if self.in_function:
+            self.error("'import' inside a function")
+        self.eat('IMPORT')
+        token = self.current_token
+        if token.type not in ('ID', 'STRING'):
+            self.error("Expected a module name after 'import'")
+        self.eat(token.type)
+        return ASTBuilder.import_stmt(token.value)
+
+    def checkpoint_statement(self):
+        # 检查点 name: where a snapshot is taken and resumed (snapshot.py)
+        if self.depth:
+            self.error("'checkpoint' must be at the top level")
+        self.eat('CHECKPOINT')
+        token = self.current_token
+        if token.type != 'ID':
+            self.error("Expected a name after 'checkpoint'")
+        self.eat('ID')
+        return ASTBuilder.checkpoint(token.value)
+
+    def call_args(self):
+        self.expect_punct('(')
+        args = []
+        if self.current_token.value != ')':
+            args.append(self.expr())
+            while self.current_token.type == 'PUNCT' and self.current_token.value == ',':
+                self.eat('PUNCT')
+                args.append(self.expr())
+        self.expect_punct(')')
+        return args
+
     def assign_statement(self):
+        line = self.current_token.line
         var_name = self.current_token.value
         self.eat('ID')
         self.eat('OP') # Expect '='
         val = self.expr()
-        return ASTBuilder.assignment(var_name, val)
+        node = ASTBuilder.assignment(var_name, val)
+        node['line'] = line
+        return node
 
-    def auto_statement(self):
+    def index_assign_statement(self):
+        # a[i] = value
+        var_name = self.current_token.value
+        self.eat('ID')
+        self.eat('PUNCT') # [
+        index = self.expr()
+        self.expect_punct(']')
+        self.eat('OP') # Expect '='
+        val = self.expr()
+        return ASTBuilder.index_assignment(var_name, index, val)
+
+    def auto_call(self):
+        # A statement, or an expression whose value is the function's result
         self.eat('AUTO')
         func_name = self.current_token.value
         self.eat('ID')
@@ -160,16 +294,18 @@ class Parser:
         return ASTBuilder.auto_call(func_name, args)
 
     def block(self):
+        self.depth += 1
         if self.current_token.value == '{':
             self.eat('PUNCT')
             stmts = []
             while self.current_token.value != '}':
                 stmts.append(self.statement())
             self.eat('PUNCT')
-            return stmts
         else:
             # Allow single statement without braces
-            return [self.statement()]
+            stmts = [self.statement()]
+        self.depth -= 1
+        return stmts
 
     def expr(self):
         # Simple expression parser handling + -
@@ -198,7 +334,19 @@ class Parser:
         return node
 
     def factor(self):
+        node = self.primary()
+        # Postfix indexing: a[i], a[i][j] (once arrays can nest)
+        while self.current_token and self.current_token.type == 'PUNCT' and self.current_token.value == '[':
+            self.eat('PUNCT')
+            index = self.expr()
+            self.expect_punct(']')
+            node = ASTBuilder.index(node, index)
+        return node
+
+    def primary(self):
         token = self.current_token
+        if not token:
+            self.error("Unexpected end of input")
         if token.type == 'NUMBER':
             self.eat('NUMBER')
             return ASTBuilder.number(token.value)
@@ -207,6 +355,10 @@ class Parser:
             return ASTBuilder.string(token.value)
         elif token.type == 'ID':
             self.eat('ID')
+            if self.current_token and self.current_token.type == 'PUNCT' and self.current_token.value == '(':
+                node = ASTBuilder.call(token.value, self.call_args())
+                node['line'] = token.line # for limit errors inside the call
+                return node
             return ASTBuilder.identifier(token.value)
         elif token.type == 'TRUE':
             self.eat('TRUE')
@@ -217,6 +369,24 @@ class Parser:
         elif token.type == 'NULL':
             self.eat('NULL')
             return ASTBuilder.null()
+        elif token.type == 'AUTO':
+            return self.auto_call()
+        elif token.type == 'LEN':
+            self.eat('LEN')
+            self.expect_punct('(')
+            node = self.expr()
+            self.expect_punct(')')
+            return ASTBuilder.length(node)
+        elif token.type == 'PUNCT' and token.value == '[':
+            self.eat('PUNCT')
+            elements = []
+            if self.current_token.value != ']':
+                elements.append(self.expr())
+                while self.current_token.type == 'PUNCT' and self.current_token.value == ',':
+                    self.eat('PUNCT')
+                    elements.append(self.expr())
+            self.expect_punct(']')
+            return ASTBuilder.array(elements)
         elif token.type == 'PUNCT' and token.value == '(':
             self.eat('PUNCT')
             node = self.expr()
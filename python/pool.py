@@ -0,0 +1,102 @@
+"""A bounded pool of pre-initialized executors for multi-tenant hosts.
+
+    pool = ExecutorPool(PyExecutor, size=8)
+    with pool.lease(timeout=1.0) as executor:
+        executor.execute(ast)
+
+All `size` executors are built when the pool is, so no request pays for a
+global scope, function table or (on novolang_core) the AutoAPI bridge.
+lease() hands out an idle executor, waiting up to `timeout` seconds (None
+waits for ever) and raising PoolTimeout if none comes free. When the lease
+ends, normally or by an exception, the executor is reset() before anyone
+else can lease it: its variables, functions, limits, hooks and output are
+cleared in place, so a lease never sees what an earlier one left behind.
+Modules stay cached by the loader, as in any long-lived process.
+
+metrics() reports occupancy (in_use of size, and the peak) and how long
+leases waited for an executor.
+"""
+import contextlib
+import threading
+import time
+
+class PoolTimeout(RuntimeError):
+    pass
+
+class ExecutorPool:
+    def __init__(self, factory, size=4):
+        """size executors made by calling factory()."""
+        if size < 1:
+            raise ValueError("pool size must be at least 1")
+        self.size = size
+        self._idle = [factory() for _ in range(size)]
+        self._leased = set()      # ids of the executors out on lease
+        self._available = threading.Condition(threading.Lock())
+        self._waiting = 0
+        self._leases = 0
+        self._waited = 0          # leases that found no idle executor
+        self._wait_seconds = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+        self._peak = 0
+
+    def acquire(self, timeout=None):
+        """An idle executor; give it back with release()."""
+        with self._available:
+            start = None
+            if not self._idle:
+                start = time.perf_counter()
+                self._waited += 1
+                self._waiting += 1
+                try:
+                    if not self._available.wait_for(lambda: self._idle, timeout):
+                        self._timeouts += 1
+                        raise PoolTimeout(f"Error: no executor free after {timeout}s ({self.size} in use)")
+                finally:
+                    self._waiting -= 1
+            executor = self._idle.pop()
+            self._leased.add(id(executor))
+            self._leases += 1
+            if start is not None:
+                waited = time.perf_counter() - start
+                self._wait_seconds += waited
+                self._max_wait = max(self._max_wait, waited)
+            if self.size - len(self._idle) > self._peak:
+                self._peak = self.size - len(self._idle)
+            return executor
+
+    def release(self, executor):
+        """Reset executor and make it available to the next lease."""
+        executor.reset()
+        with self._available:
+            if id(executor) not in self._leased:
+                raise ValueError("executor is not leased from this pool")
+            self._leased.discard(id(executor))
+            self._idle.append(executor)
+            if self._waiting:
+                self._available.notify()
+
+    @contextlib.contextmanager
+    def lease(self, timeout=None):
+        executor = self.acquire(timeout)
+        try:
+            yield executor
+        finally:
+            self.release(executor)
+
+    def metrics(self):
+        with self._available:
+            in_use = self.size - len(self._idle)
+            return {
+                'size': self.size,
+                'in_use': in_use,
+                'idle': len(self._idle),
+                'occupancy': in_use / self.size,
+                'peak_in_use': self._peak,
+                'leases': self._leases,
+                'waited': self._waited,
+                'timeouts': self._timeouts,
+                'wait_seconds_total': self._wait_seconds,
+                'wait_seconds_max': self._max_wait,
+                'wait_seconds_mean': self._wait_seconds / self._leases if self._leases else 0.0,
+            }
@@ -0,0 +1,175 @@
+import time
+try:
+    from .py_executor import PyExecutor
+except ImportError:
+    from py_executor import PyExecutor
+
+class StmtStat:
+    __slots__ = ('count', 'total', 'self_time')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0      # inclusive wall time (s), recursion counted once
+        self.self_time = 0.0  # exclusive wall time (s)
+
+class Profile:
+    """Per-statement timings of one NovoLang run.
+
+    Statements are keyed by (line, kind), where kind is the AST node type or
+    'auto:<function>' for time spent inside an AutoAPI call. Stacks are kept
+    in collapsed ("folded") form for flamegraph.pl / speedscope / inferno.
+    """
+
+    def __init__(self, filename='<script>', source=None):
+        self.filename = filename
+        self.source_lines = source.splitlines() if source else []
+        self.stats = {}
+        self.stacks = {}
+        self.wall = 0.0
+        self._labels = [filename]
+        self._keys = []
+        self._child_time = [0.0]
+        self._active = {}
+
+    # Recording (used by ProfilingExecutor)
+
+    def enter(self, line, kind):
+        key = (line, kind)
+        self._keys.append(key)
+        self._labels.append(f"{kind}@{line}")
+        self._child_time.append(0.0)
+        self._active[key] = self._active.get(key, 0) + 1
+
+    def leave(self, elapsed):
+        key = self._keys.pop()
+        child = self._child_time.pop()
+        self._child_time[-1] += elapsed
+        self_time = elapsed - child
+
+        stat = self.stats.get(key)
+        if stat is None:
+            stat = self.stats[key] = StmtStat()
+        stat.count += 1
+        stat.self_time += self_time
+        self._active[key] -= 1
+        if not self._active[key]:
+            stat.total += elapsed
+
+        stack = ';'.join(self._labels)
+        self.stacks[stack] = self.stacks.get(stack, 0.0) + self_time
+        self._labels.pop()
+
+    @classmethod
+    def from_native(cls, data, filename='<script>', source=None):
+        """Build a Profile from novolang_core.ASTExecutor.profile_data()."""
+        profile = cls(filename, source)
+        for line, kind, count, total, self_time in data['stats']:
+            stat = profile.stats[(line, kind)] = StmtStat()
+            stat.count, stat.total, stat.self_time = count, total, self_time
+        for stack, seconds in data['stacks'].items():
+            profile.stacks[f"{filename};{stack}"] = seconds
+        profile.wall = data.get('wall', 0.0)
+        return profile
+
+    # Output
+
+    def collapsed(self):
+        """Collapsed stacks, one 'frame;frame;... microseconds' line per stack."""
+        lines = []
+        for stack, seconds in sorted(self.stacks.items()):
+            us = int(round(seconds * 1e6))
+            if us > 0:
+                lines.append(f"{stack} {us}")
+        return '\n'.join(lines) + '\n'
+
+    def write_collapsed(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed())
+
+    def report(self, limit=25):
+        """Text table of statements sorted by self time."""
+        rows = sorted(self.stats.items(), key=lambda item: item[1].self_time, reverse=True)
+        wall = self.wall or sum(s.self_time for s in self.stats.values()) or 1e-9
+        out = [
+            f"Profile of {self.filename}: {wall * 1000:.2f} ms wall",
+            f"{'line':>6} {'statement':<18} {'count':>9} {'total ms':>10} {'self ms':>10} {'self %':>7}  source",
+        ]
+        for (line, kind), stat in rows[:limit]:
+            text = ''
+            if 0 < line <= len(self.source_lines):
+                text = self.source_lines[line - 1].strip()
+            out.append(
+                f"{line:>6} {kind:<18} {stat.count:>9} {stat.total * 1000:>10.3f} "
+                f"{stat.self_time * 1000:>10.3f} {100 * stat.self_time / wall:>6.1f}%  {text}"
+            )
+        if len(rows) > limit:
+            out.append(f"... {len(rows) - limit} more statements")
+        return '\n'.join(out)
+
+class _TimedAutoAPI:
+    """Wraps AutoAPI so each automation call shows up as its own frame."""
+
+    def __init__(self, api, executor):
+        self._api = api
+        self._executor = executor
+
+    def __getattr__(self, name):
+        return getattr(self._api, name)
+
+    def execute(self, func_name, args):
+        profile = self._executor.profile
+        profile.enter(self._executor.current_line, f"auto:{func_name}")
+        start = time.perf_counter()
+        try:
+            return self._api.execute(func_name, args)
+        finally:
+            profile.leave(time.perf_counter() - start)
+
+class ProfilingExecutor(PyExecutor):
+    """PyExecutor with per-statement timing.
+
+    Instrumentation lives only in this subclass, so plain PyExecutor runs pay
+    nothing for it.
+    """
+
+    def __init__(self, profile=None, **kwargs):
+        super().__init__(**kwargs)
+        # Compiled loops would bypass exec_stmt; profile the tree walker
+        self.tier_up = 0
+        self.profile = profile or Profile()
+        self.current_line = 0
+        self.auto_api = _TimedAutoAPI(self.auto_api, self)
+
+    def execute(self, ast):
+        start = time.perf_counter()
+        try:
+            super().execute(ast)
+        finally:
+            self.profile.wall += time.perf_counter() - start
+
+    def execute_stream(self, statements, path=None):
+        start = time.perf_counter()
+        try:
+            super().execute_stream(statements, path)
+        finally:
+            self.profile.wall += time.perf_counter() - start
+
+    def invoke(self, func, args, line=0):
+        self.profile.enter(self.current_line, f"call:{func.name}")
+        start = time.perf_counter()
+        try:
+            return super().invoke(func, args, line)
+        finally:
+            self.profile.leave(time.perf_counter() - start)
+
+    def exec_stmt(self, stmt):
+        line = stmt.get('line', 0)
+        outer_line = self.current_line
+        self.current_line = line
+        self.profile.enter(line, stmt['type'])
+        start = time.perf_counter()
+        try:
+            super().exec_stmt(stmt)
+        finally:
+            self.profile.leave(time.perf_counter() - start)
+            self.current_line = outer_line
@@ -1,8 +1,32 @@
+import os
 import sys
+import time
 try:
-    from .auto_api import AutoAPI
+    from .auto_api import AutoAPI, value as auto_value
+    from .rope import Rope, concat, text_of
+    from .numeric import INT_MAX, INT_MIN, clamp_int, divide, to_display
+    from .nl_array import NLArray, elementwise
+    from .functions import MAX_CALL_DEPTH, Function
+    from .modules import base_dir, exported, loader
+    from .tiering import LoopTier, tier_up_threshold
 except ImportError:
-    from auto_api import AutoAPI
+    from auto_api import AutoAPI, value as auto_value
+    from rope import Rope, concat, text_of
+    from numeric import INT_MAX, INT_MIN, clamp_int, divide, to_display
+    from nl_array import NLArray, elementwise
+    from functions import MAX_CALL_DEPTH, Function
+    from modules import base_dir, exported, loader
+    from tiering import LoopTier, tier_up_threshold
+
+# Each NovoLang call nests about a dozen Python frames
+RECURSION_LIMIT = MAX_CALL_DEPTH * 16 + 1000
+_MISSING = object()
+
+class _Return(Exception):
+    """Unwinds a function body at `return`."""
+
+    def __init__(self, value):
+        self.value = value
 
 class Scope:
     def __init__(self, parent=None):
@@ -31,15 +55,89 @@ class Scope:
     def exists_local(self, name):
         return name in self.variables
 
+def module_namespace(module):
+    """(globals Scope, function table) of a loaded module for this engine.
+
+    Built once per module from its engine-neutral record unless the module
+    was run by a PyExecutor, which stores the live namespace.
+    """
+    namespace = module.cache.get('py')
+    if namespace is None:
+        scope = Scope()
+        scope.variables.update(module.variables)
+        table = {}
+        for path in module.imports:
+            _, imported = module_namespace(loader().modules[path])
+            table.update((name, func) for name, func in imported.items() if exported(name))
+        for name, node in module.functions.items():
+            table[name] = Function(node, scope, table)
+        namespace = module.cache['py'] = (scope, table)
+    return namespace
+
 class PyExecutor:
-    def __init__(self):
+    def __init__(self, governor=None, tier_up=None, output=None):
         self.global_scope = Scope()
         self.current_scope = self.global_scope
         self.auto_api = AutoAPI()
+        # Optional governor.Governor; checked at loop back-edges and scope creation
+        self.governor = governor
+        self.functions = {}
+        # Slot list of the running function call; None at top level
+        self.frame = None
+        # Slot lists of every call in progress, for the governor's memory check
+        self.frames = []
+        self.call_depth = 0
+        # Directory imports are resolved against (the running file's)
+        self.module_dir = None
+        # Back-edges before a loop is compiled (tiering.py); 0 interprets everything
+        self.tier_up = tier_up_threshold() if tier_up is None else tier_up
+        self.promoted = set()
+        # Called with each CHECKPOINT statement executed (snapshot.py); None to ignore them
+        self.checkpoint_hook = None
+        # File-like object print writes to; None for sys.stdout
+        self.output = output
 
     def execute(self, ast):
+        if sys.getrecursionlimit() < RECURSION_LIMIT:
+            sys.setrecursionlimit(RECURSION_LIMIT)
+        self.module_dir = base_dir(ast)
         if ast['type'] == 'BLOCK':
-            self.exec_block(ast['statements'])
+            if self.governor is not None:
+                self.governor.reset()
+                self.governor.tick(len(ast['statements']), 0, self.current_scope, self.frames)
+            try:
+                self.exec_block(ast['statements'])
+            finally:
+                if self.governor is not None:
+                    self.governor.stop()
+
+    def execute_stream(self, statements, path=None):
+        """Execute top-level statements as they arrive (Parser.statements()).
+
+        Each statement is charged to the governor when it starts rather than
+        all of them up front, and is dropped once it has run; only function
+        definitions stay alive, through the functions they define. path is
+        the script's file, for resolving imports.
+        """
+        if sys.getrecursionlimit() < RECURSION_LIMIT:
+            sys.setrecursionlimit(RECURSION_LIMIT)
+        self.module_dir = os.path.dirname(path) if path else None
+        if self.governor is not None:
+            self.governor.reset()
+        try:
+            for stmt in statements:
+                if self.governor is not None:
+                    self.governor.tick(1, stmt.get('line', 0), self.current_scope, self.frames)
+                self.exec_stmt(stmt)
+        finally:
+            if self.governor is not None:
+                self.governor.stop()
+
+    def enter_scope(self, body, line):
+        """Push a new scope for body, charging its statements to the governor."""
+        if self.governor is not None:
+            self.governor.tick(len(body) if isinstance(body, list) else 1, line, self.current_scope, self.frames)
+        self.current_scope = Scope(self.current_scope)
 
     def exec_block(self, stmts):
         for stmt in stmts:
@@ -57,10 +155,26 @@ class PyExecutor:
             self.exec_assign(stmt)
         elif type_ == 'AUTO_CALL':
             self.exec_auto(stmt)
+        elif type_ == 'SLOT_ASSIGNMENT':
+            self.frame[stmt['slot']] = self.eval_expr(stmt['value'])
+        elif type_ == 'RETURN':
+            value = stmt['value']
+            raise _Return(None if value is None else self.eval_expr(value))
+        elif type_ == 'CALL_STMT':
+            self.call(stmt)
+        elif type_ == 'FUNCTION_DEF':
+            self.functions[stmt['name']] = Function(stmt, self.global_scope, self.functions)
+        elif type_ == 'IMPORT':
+            self.exec_import(stmt)
+        elif type_ == 'INDEX_ASSIGNMENT':
+            self.exec_index_assign(stmt)
+        elif type_ == 'CHECKPOINT':
+            if self.checkpoint_hook is not None:
+                self.checkpoint_hook(stmt)
         elif type_ == 'BLOCK':
             # Create new scope
             old_scope = self.current_scope
-            self.current_scope = Scope(old_scope)
+            self.enter_scope(stmt['statements'], stmt.get('line', 0))
             self.exec_block(stmt['statements'])
             self.current_scope = old_scope
 
@@ -68,9 +182,9 @@ class PyExecutor:
         cond = self.eval_expr(stmt['condition'])
         if cond:
             old_scope = self.current_scope
-            self.current_scope = Scope(old_scope)
-            
             body = stmt['body']
+            self.enter_scope(body, stmt.get('line', 0))
+            
             if isinstance(body, list): # It's a list of stmts from parser block
                 self.exec_block(body)
             elif body['type'] == 'BLOCK':
@@ -81,9 +195,9 @@ class PyExecutor:
             self.current_scope = old_scope
         elif stmt.get('else_body'):
             old_scope = self.current_scope
-            self.current_scope = Scope(old_scope)
-            
             else_body = stmt['else_body']
+            self.enter_scope(else_body, stmt.get('line', 0))
+            
             if isinstance(else_body, list):
                 self.exec_block(else_body)
             elif else_body['type'] == 'BLOCK':
@@ -94,15 +208,26 @@ class PyExecutor:
             self.current_scope = old_scope
 
     def exec_loop(self, stmt):
+        tier = None
+        if self.tier_up:
+            tier = stmt.get('tier')
+            if tier is None:
+                tier = stmt['tier'] = LoopTier(stmt.get('line', 0))
+            if tier.code is not None:
+                self.promoted.add(tier)
+                tier.run(self)
+                return
+            started = time.perf_counter()
         while True:
             cond = self.eval_expr(stmt['condition'])
             if not cond:
                 break
             
+            # Loop back-edge: every iteration gets a fresh scope
             old_scope = self.current_scope
-            self.current_scope = Scope(old_scope)
-            
             body = stmt['body']
+            self.enter_scope(body, stmt.get('line', 0))
+            
             if isinstance(body, list):
                 self.exec_block(body)
             elif body['type'] == 'BLOCK':
@@ -111,18 +236,22 @@ class PyExecutor:
                  self.exec_stmt(body)
             
             self.current_scope = old_scope
+            if tier is not None:
+                tier.iterations += 1
+                if tier.iterations >= self.tier_up:
+                    # Hot: the remaining iterations run compiled
+                    tier.seconds += time.perf_counter() - started
+                    tier.promote(stmt)
+                    self.promoted.add(tier)
+                    tier.run(self)
+                    return
+        if tier is not None:
+            tier.seconds += time.perf_counter() - started
 
     def exec_print(self, stmt):
         val = self.eval_expr(stmt['expr'])
-        # Handle boolean/null print formatting to match C++ spec
-        if val is True:
-            print("真")
-        elif val is False:
-            print("假")
-        elif val is None:
-            print("空")
-        else:
-            print(val)
+        # Same display rules as the C++ engine (numeric.py)
+        print(to_display(val), file=self.output)
 
     def exec_assign(self, stmt):
         name = stmt['target']
@@ -134,13 +263,150 @@ class PyExecutor:
         except RuntimeError:
             self.current_scope.define(name, val)
 
+    def exec_index_assign(self, stmt):
+        if 'slot' in stmt:
+            target = self.frame[stmt['slot']]
+        elif stmt.get('global'):
+            target = self.global_scope.get(stmt['target'])
+        else:
+            target = self.current_scope.get(stmt['target'])
+        if not isinstance(target, NLArray):
+            raise RuntimeError(f"Error: '{stmt['target']}' is not an array")
+        index = self.eval_expr(stmt['index'])
+        target.set(index, self.eval_expr(stmt['value']))
+
     def exec_auto(self, stmt):
         func_name = stmt['function']
-        args = [self.eval_expr(arg) for arg in stmt['args']]
-        self.auto_api.execute(func_name, args)
+        # Automation functions expect real str arguments, not Ropes
+        args = [text_of(self.eval_expr(arg)) for arg in stmt['args']]
+        return self.auto_api.execute(func_name, args)
+
+    def exec_import(self, stmt):
+        module = loader().load(stmt['module'], self.module_dir, self.run_module)
+        scope, table = module_namespace(module)
+        for name, value in scope.variables.items():
+            if exported(name):
+                self.current_scope.define(name, value)
+        for name, func in table.items():
+            if exported(name):
+                self.functions[name] = func
+
+    def run_module(self, module):
+        """Run a module's top level in a namespace of its own (ModuleLoader callback)."""
+        saved = self.global_scope, self.current_scope, self.functions, self.module_dir
+        scope = self.global_scope = self.current_scope = Scope()
+        table = self.functions = {}
+        self.module_dir = base_dir(module.ast)
+        try:
+            if self.governor is not None:
+                self.governor.tick(len(module.ast['statements']), 0, scope, self.frames)
+            self.exec_block(module.ast['statements'])
+        finally:
+            self.global_scope, self.current_scope, self.functions, self.module_dir = saved
+        module.cache['py'] = (scope, table)
+        return {name: text_of(value) for name, value in scope.variables.items()}
+
+    def call(self, node):
+        """Call a user function; node is a CALL expression or CALL_STMT."""
+        func = self.functions.get(node['name'])
+        if func is None:
+            raise RuntimeError(f"Error: function '{node['name']}' not defined")
+        args = [self.eval_expr(arg) for arg in node['args']]
+        if len(args) != len(func.params):
+            raise RuntimeError(f"Error: {func.name}() takes {len(func.params)} arguments, got {len(args)}")
+
+        memo = func.memo
+        if memo is not None:
+            if any(isinstance(arg, NLArray) for arg in args):
+                memo = None
+            else:
+                key = tuple((arg.__class__, arg) for arg in args)
+                result = memo.get(key, _MISSING)
+                if result is not _MISSING:
+                    return result
+
+        result = self.invoke(func, args, node.get('line', 0))
+        if memo is not None and not isinstance(result, NLArray):
+            memo.put(key, result)
+        return result
+
+    def invoke(self, func, args, line=0):
+        """Run func's body in a fresh slot frame and return its result."""
+        if self.call_depth >= MAX_CALL_DEPTH:
+            raise RuntimeError(f"Error: maximum call depth ({MAX_CALL_DEPTH}) exceeded in {func.name}()")
+        if self.governor is not None:
+            self.governor.tick(len(func.body), line, self.current_scope, self.frames)
+        frame = args + [None] * (func.slots - len(args))
+        outer = self.frame, self.global_scope, self.functions
+        self.frame = frame
+        self.frames.append(frame)
+        self.global_scope = func.globals
+        self.functions = func.table
+        self.call_depth += 1
+        try:
+            self.exec_block(func.body)
+            return None
+        except _Return as ret:
+            return ret.value
+        finally:
+            self.frame, self.global_scope, self.functions = outer
+            self.frames.pop()
+            self.call_depth -= 1
+
+    def global_variables(self):
+        """Top-level variables as plain Python values (snapshot.py)."""
+        return {name: text_of(value) for name, value in self.global_scope.variables.items()}
+
+    def reset(self):
+        """Back to the state of a new executor, keeping its objects (see pool.py)."""
+        self.global_scope.variables.clear()
+        self.current_scope = self.global_scope
+        self.governor = None
+        self.functions.clear()
+        self.frame = None
+        self.frames.clear()
+        self.call_depth = 0
+        self.module_dir = None
+        self.promoted.clear()
+        self.checkpoint_hook = None
+        self.output = None
+
+    def set_global_variables(self, variables):
+        """Replace the top-level variables with plain Python values."""
+        self.global_scope.variables.clear()
+        self.global_scope.variables.update(variables)
+
+    def global_functions(self):
+        """Top-level functions: {name: (FUNCTION_DEF node, defining module's path or None)} (snapshot.py)."""
+        paths = {id(module.cache['py'][0]): path for path, module in loader().modules.items() if 'py' in module.cache}
+        return {name: (func.node, None if func.globals is self.global_scope else paths.get(id(func.globals)))
+                for name, func in self.functions.items()}
+
+    def set_global_functions(self, functions):
+        """Replace the top-level functions, loading the modules that define imported ones."""
+        self.functions.clear()
+        for name, (node, path) in functions.items():
+            if path is None:
+                self.functions[name] = Function(node, self.global_scope, self.functions)
+                continue
+            _, table = module_namespace(loader().load(path, None, self.run_module))
+            func = table.get(node['name'])
+            if func is None:
+                raise RuntimeError(f"Error: function '{name}' not defined")
+            self.functions[name] = func
+
+    def memo_stats(self):
+        """Hit/miss counts of every pure function's cache, by name."""
+        return {name: func.memo.stats() for name, func in self.functions.items() if func.memo is not None}
+
+    def tier_stats(self):
+        """Counters of the loops this executor ran compiled, by line."""
+        return [tier.stats() for tier in sorted(self.promoted, key=lambda tier: tier.line)]
 
     def eval_expr(self, expr):
         type_ = expr['type']
+        if type_ == 'SLOT':
+            return self.frame[expr['slot']]
         if type_ == 'NUMBER':
             return expr['value']
         elif type_ == 'STRING':
@@ -153,35 +419,77 @@ class PyExecutor:
             return self.current_scope.get(expr['name'])
         elif type_ == 'BINARY_OP':
             return self.eval_bin_op(expr)
+        elif type_ == 'CALL':
+            return self.call(expr)
+        elif type_ == 'GLOBAL':
+            return self.global_scope.get(expr['name'])
+        elif type_ == 'INDEX':
+            target = self.eval_expr(expr['target'])
+            if not isinstance(target, NLArray):
+                raise RuntimeError("Error: only arrays can be indexed")
+            return target.get(self.eval_expr(expr['index']))
+        elif type_ == 'ARRAY':
+            return NLArray.from_list([self.eval_expr(e) for e in expr['elements']])
+        elif type_ == 'LEN':
+            value = self.eval_expr(expr['expr'])
+            if not isinstance(value, (NLArray, str, Rope)):
+                raise RuntimeError("Error: len() expects an array or a string")
+            return len(value)
+        elif type_ == 'AUTO_CALL':
+            result = auto_value(self.exec_auto(expr))
+            return NLArray.from_list(result) if isinstance(result, list) else result
         return None
 
     def eval_bin_op(self, expr):
         left = self.eval_expr(expr['left'])
         right = self.eval_expr(expr['right'])
-        op = expr['op']
-        
-        if op == '+': 
-            # String concatenation if either is string
-            if isinstance(left, str) or isinstance(right, str):
-                # Handle None/True/False string conversion if needed, 
-                # but str() handles them (None->'None', True->'True')
-                # For numbers, 10.0 -> '10.0'. 
-                # If we want integer-like display:
-                if isinstance(left, float) and left.is_integer():
-                    left = int(left)
-                if isinstance(right, float) and right.is_integer():
-                    right = int(right)
-                return str(left) + str(right)
-            return left + right
-        if op == '-': return left - right
-        if op == '*': return left * right
-        if op == '/': return left / right if right != 0 else 0
-        if op == '>': return left > right
-        if op == '<': return left < right
-        if op == '>=': return left >= right
-        if op == '<=': return left <= right
-        if op == '==': return left == right
-        if op == '!=': return left != right
-        if op == '<>': return left != right
-        
-        return None
+        return binary_op(expr['op'], left, right)
+
+def binary_op(op, left, right):
+    """Value of `left op right` (numeric.py); shared with compiled loops."""
+    # Integer fast path: counters and indices never leave int
+    if left.__class__ is int and right.__class__ is int:
+        if op == '+': result = left + right
+        elif op == '-': result = left - right
+        elif op == '<': return left < right
+        elif op == '>': return left > right
+        elif op == '*': result = left * right
+        elif op == '/': return divide(left, right)
+        elif op == '<=': return left <= right
+        elif op == '>=': return left >= right
+        elif op == '==': return left == right
+        elif op == '!=' or op == '<>': return left != right
+        else: return None
+        if INT_MIN <= result <= INT_MAX:
+            return result
+        return float(result)
+    
+    if op == '+': 
+        # String concatenation if either is string
+        if isinstance(left, (str, Rope)) or isinstance(right, (str, Rope)):
+            # Non-string operands are shown exactly as print shows them
+            if not isinstance(left, (str, Rope)):
+                left = to_display(left)
+            if not isinstance(right, (str, Rope)):
+                right = to_display(right)
+            # Long results become Ropes so repeated `s = s + ...` stays linear
+            return concat(left, right)
+    if isinstance(left, NLArray) or isinstance(right, NLArray):
+        # Against null, == and != ask whether the value is null: an array never is
+        if (left is None or right is None) and op in ('==', '!=', '<>'):
+            return op != '=='
+        # One vectorized call for the whole array
+        return elementwise(op, left, right)
+    if op == '+': return clamp_int(left + right)
+    if op == '-': return clamp_int(left - right)
+    if op == '*': return clamp_int(left * right)
+    if op == '/': return divide(left, right)
+    if op == '>': return left > right
+    if op == '<': return left < right
+    if op == '>=': return left >= right
+    if op == '<=': return left <= right
+    if op == '==': return left == right
+    if op == '!=': return left != right
+    if op == '<>': return left != right
+    
+    return None
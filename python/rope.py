@@ -0,0 +1,88 @@
+# Concatenations shorter than this stay plain str; the builder only pays off
+# once copying the left operand starts to dominate.
+ROPE_THRESHOLD = 256
+
+class Rope:
+    """String value built by repeated `+`, flattened lazily.
+
+    A Rope owns the first `count` pieces of a piece list that may be shared
+    with other Ropes. Appending to the Rope that owns the whole list extends
+    the list in place, so `s = s + "..."` in a loop is amortised O(1) per
+    step instead of copying s every time; appending to an older Rope copies
+    its pieces first, so earlier values never change. The text is joined on
+    first use (printing, comparison, AutoAPI arguments) and cached.
+    """
+
+    __slots__ = ('_pieces', '_count', '_length', '_flat')
+
+    def __init__(self, pieces, count, length):
+        self._pieces = pieces
+        self._count = count
+        self._length = length
+        self._flat = None
+
+    def append(self, text):
+        """Return a new Rope with text appended; self is unchanged."""
+        pieces = self._pieces
+        if self._count == len(pieces):
+            pieces.append(text)
+        else:
+            pieces = pieces[:self._count]
+            pieces.append(text)
+        return Rope(pieces, self._count + 1, self._length + len(text))
+
+    def flatten(self):
+        if self._flat is None:
+            self._flat = ''.join(self._pieces[:self._count])
+        return self._flat
+
+    __str__ = flatten
+
+    def __repr__(self):
+        return f"Rope({self.flatten()!r})"
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + self._length
+
+    def __hash__(self):
+        return hash(self.flatten())
+
+    def __eq__(self, other):
+        return self.flatten() == text_of(other)
+
+    def __ne__(self, other):
+        return self.flatten() != text_of(other)
+
+    def __lt__(self, other):
+        return self.flatten() < text_of(other)
+
+    def __le__(self, other):
+        return self.flatten() <= text_of(other)
+
+    def __gt__(self, other):
+        return self.flatten() > text_of(other)
+
+    def __ge__(self, other):
+        return self.flatten() >= text_of(other)
+
+def text_of(value):
+    """Flatten a Rope; any other value is returned unchanged."""
+    if isinstance(value, Rope):
+        return value.flatten()
+    return value
+
+def concat(left, right):
+    """left + right for str/Rope operands, returning str or Rope."""
+    if isinstance(right, Rope):
+        right = right.flatten()
+    if isinstance(left, Rope):
+        return left.append(right)
+    if len(left) + len(right) < ROPE_THRESHOLD:
+        return left + right
+    return Rope([left, right], 2, len(left) + len(right))
@@ -0,0 +1,116 @@
+"""Interpreter snapshots: resume a script after its preamble.
+
+    定义 table = build_table()      // long setup
+    检查点 ready                     // checkpoint ready
+    ...                             // the real work
+
+`main.py job.nl --snapshot job.nls` runs the script and, when it reaches a
+top-level `检查点` / `checkpoint`, writes a snapshot of the interpreter at
+that point: the top-level variables, the function table (each function's
+definition, or the module that defines it) and the parsed statements after
+it.
+`main.py job.nl --resume job.nls` restores that into a fresh executor and
+runs only the statements after the checkpoint: nothing is lexed or parsed
+and the preamble does not run. Give both flags for warm starts that take a
+new snapshot whenever the old one no longer applies.
+
+A snapshot belongs to the exact source text it was taken from (SHA-256);
+for a script that has changed since, load() returns None and the script
+runs from the start. On restore the saved functions and variables replace
+the executor's top level, so exactly what the run had defined by the
+checkpoint is back. Imported functions are rebound from the loader records
+of their modules, saved with the snapshot, so module top levels do not run
+again; a module whose file has changed since is loaded afresh. The file is a zlib-compressed pickle of plain values and
+AST nodes, so it is engine neutral: either engine resumes a snapshot the
+other wrote. Only the first
+checkpoint reached is recorded; checkpoints do nothing in a normal run.
+"""
+import hashlib
+import os
+import pickle
+import zlib
+try:
+    from .modules import Module, loader
+except ImportError:
+    from modules import Module, loader
+
+FORMAT = 2
+
+def source_digest(code):
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+def modules(paths):
+    """Loader records of the modules at paths and those they import: {path: (mtime, ast, variables, imports)}."""
+    found = {}
+    pending = list(paths)
+    while pending:
+        path = pending.pop()
+        module = loader().modules.get(path)
+        if path in found or module is None:
+            continue
+        found[path] = (module.mtime, module.ast, module.variables, module.imports)
+        pending.extend(module.imports)
+    return found
+
+def take(executor, ast, checkpoint, digest):
+    """Snapshot of executor stopped at checkpoint, a top-level statement of ast."""
+    statements = ast['statements']
+    functions = executor.global_functions()
+    index = next(i for i, stmt in enumerate(statements) if stmt is checkpoint)
+    return {
+        'format': FORMAT,
+        'digest': digest,
+        'checkpoint': checkpoint['name'],
+        'functions': functions,
+        'modules': modules(path for _, path in functions.values() if path),
+        'statements': statements[index + 1:],
+        'variables': executor.global_variables(),
+    }
+
+def save(snapshot, path):
+    data = zlib.compress(pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL))
+    partial = path + '.tmp'
+    with open(partial, 'wb') as f:
+        f.write(data)
+    os.replace(partial, path)
+
+def load(path, digest):
+    """The snapshot at path if it was taken from source with this digest, else None."""
+    try:
+        with open(path, 'rb') as f:
+            snapshot = pickle.loads(zlib.decompress(f.read()))
+    except (OSError, zlib.error, pickle.UnpicklingError, EOFError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get('format') != FORMAT or snapshot.get('digest') != digest:
+        return None
+    return snapshot
+
+def recorder(executor, ast, path, digest):
+    """A checkpoint_hook for executor that saves a snapshot at ast's first checkpoint."""
+    top_level = {id(stmt) for stmt in ast['statements']}
+
+    def hook(stmt):
+        # Checkpoints in imported modules are not this script's
+        if id(stmt) in top_level:
+            executor.checkpoint_hook = None
+            save(take(executor, ast, stmt, digest), path)
+    return hook
+
+def restore(executor, snapshot, path=None):
+    """Put snapshot's state into executor; returns the AST that resumes the script.
+
+    path is the script's file, for resolving imports.
+    """
+    modules = loader().modules
+    missing = {module_path: record for module_path, record in snapshot['modules'].items()
+               if module_path not in modules}
+    # As if loaded earlier in this process, unless a file has changed since
+    if all(os.path.isfile(module_path) and os.path.getmtime(module_path) == record[0]
+           for module_path, record in missing.items()):
+        for module_path, (mtime, ast, variables, imports) in missing.items():
+            module = modules[module_path] = Module(module_path, mtime, ast)
+            module.variables = variables
+            module.imports = imports
+    executor.set_global_functions(snapshot['functions'])
+    executor.set_global_variables(snapshot['variables'])
+    return {'type': 'BLOCK', 'statements': snapshot['statements'], 'file': path}
@@ -0,0 +1,280 @@
+"""Finding a template image inside a screenshot or an image file.
+
+    定义 hit = 自动 查找图像("ok_button.png")          // on the screen
+    定义 hit = 自动 find_image("ok.png", "frame.ppm", 0.9)
+    如果 (hit != 空) {
+        自动 点击(hit[0], hit[1])                       // [center x, center y, score]
+    }
+
+Matching is normalized cross-correlation (NCC) on grayscale pixels, so a
+score is between -1 and 1 and does not change with brightness or contrast.
+The search runs coarse to fine on an image pyramid of 2x2 block means.
+First the whole image is correlated with the template at the coarsest
+level where the template is still MIN_SIDE pixels on its shorter side, in
+one FFT. Then the best CANDIDATES peaks are refined one level at a time,
+each within RADIUS pixels of where the level above put it, and those
+scoring MARGIN below the best at a level go no further. Finer levels are
+never built for the whole image: only the few pixels around each candidate
+are shrunk. Everything is vectorized NumPy; numpy is required.
+
+Templates are files (or arrays). Their pyramids, already zero-mean with
+their norms, are kept in an LRU of TEMPLATE_CACHE_SIZE entries keyed by path,
+modification time and size, so polling for the same button does not
+prepare it again. Binary PGM and PPM files are read directly. Other formats
+(PNG, BMP, ...) need Pillow, as screenshots do through pyautogui, so
+everything here can be tested offline against .pgm/.ppm files.
+"""
+import os
+import threading
+from collections import OrderedDict, namedtuple
+try:
+    from .nl_array import numpy as _numpy_module
+except ImportError:
+    from nl_array import numpy as _numpy_module
+
+MIN_SIDE = 8          # template pixels, shorter side, at the coarsest level
+MAX_LEVELS = 5
+CANDIDATES = 8        # coarse peaks refined down to full resolution
+RADIUS = 2            # search radius, in pixels of the level being refined
+MARGIN = 0.2          # candidates this far below a level's best are dropped
+THRESHOLD = 0.8
+TEMPLATE_CACHE_SIZE = 32
+
+# Position of the template's top-left pixel in the image, its size, and the NCC score
+Match = namedtuple('Match', ('left', 'top', 'width', 'height', 'score'))
+
+def _numpy():
+    np = _numpy_module()
+    if np is None:
+        raise RuntimeError("Error: image matching needs numpy")
+    return np
+
+def _gray(np, pixels):
+    """2-D pixels; gray ones keep their dtype, since converting a 4K frame costs more than matching."""
+    pixels = np.asarray(pixels)
+    if pixels.ndim == 3:
+        pixels = pixels[..., :3] @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    if pixels.ndim != 2:
+        raise RuntimeError("Error: an image must be a 2-D (gray) or 3-D (color) array")
+    return pixels
+
+def _netpbm(np, data):
+    """Pixels of a binary PGM (P5) or PPM (P6) file's contents."""
+    fields, pos = [], 2
+    while len(fields) < 3:
+        while data[pos:pos + 1].isspace():
+            pos += 1
+        if data[pos:pos + 1] == b'#':
+            pos = data.index(b'\n', pos)
+            continue
+        start = pos
+        while pos < len(data) and not data[pos:pos + 1].isspace():
+            pos += 1
+        fields.append(int(data[start:pos]))
+    width, height, maxval = fields
+    channels = 3 if data[:2] == b'P6' else 1
+    pixels = np.frombuffer(data, dtype='>u2' if maxval > 255 else np.uint8,
+                           count=width * height * channels, offset=pos + 1)
+    return pixels.reshape((height, width, 3) if channels == 3 else (height, width))
+
+def load_image(path):
+    """Grayscale pixels of the image file at path (uint8 for 8-bit gray files)."""
+    np = _numpy()
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:2] in (b'P5', b'P6'):
+        try:
+            return _gray(np, _netpbm(np, data))
+        except ValueError:
+            raise RuntimeError(f"Error: {path} is not a valid PGM/PPM image") from None
+    try:
+        from PIL import Image
+    except ImportError:
+        raise RuntimeError(f"Error: reading {os.path.basename(path)} needs Pillow (PGM and PPM files do not)") from None
+    with Image.open(path) as image:
+        return _gray(np, image.convert('L'))
+
+def screenshot():
+    """Grayscale pixels of the screen."""
+    import pyautogui
+    return _gray(_numpy(), pyautogui.screenshot().convert('L'))
+
+def _shrink(np, pixels, factor):
+    """Means of factor x factor blocks; a partial last row or column is dropped."""
+    if factor == 1:
+        return pixels
+    height, width = pixels.shape[0] // factor, pixels.shape[1] // factor
+    # Rows first, straight from uint8: a reduction over contiguous rows, then
+    # strided column slices, is several times faster than mean(axis=(1, 3))
+    rows = pixels[:height * factor].reshape(height, factor, pixels.shape[1]).sum(axis=1, dtype=np.float32)
+    blocks = rows[:, 0:width * factor:factor].copy()
+    for offset in range(1, factor):
+        blocks += rows[:, offset:width * factor:factor]
+    return blocks / (factor * factor)
+
+def _window_sums(np, pixels, height, width):
+    """Sum and sum of squares of every height x width window of pixels."""
+    def box(values):
+        table = np.zeros((values.shape[0] + 1, values.shape[1] + 1))
+        np.cumsum(np.cumsum(values, axis=0, dtype=np.float64), axis=1, out=table[1:, 1:])
+        return table[height:, width:] - table[:-height, width:] - table[height:, :-width] + table[:-height, :-width]
+    return box(pixels), box(np.square(pixels, dtype=np.float64))
+
+def _local_sums(np, values, height, width):
+    """_window_sums for a region only a few windows wider than the template."""
+    rows = values.shape[0] - height + 1
+    columns = np.empty((rows, values.shape[1]))
+    columns[0] = values[:height].sum(axis=0)
+    for row in range(1, rows):
+        columns[row] = columns[row - 1] + values[row + height - 1] - values[row - 1]
+    table = np.zeros((rows, values.shape[1] + 1))
+    np.cumsum(columns, axis=1, out=table[:, 1:])
+    return table[:, width:] - table[:, :-width]
+
+def _ncc(np, numerator, sums, squares, level):
+    """NCC scores from raw correlations with level's zero-mean template."""
+    zero_mean, norm = level
+    variance = squares - sums * sums / zero_mean.size
+    # A window of one flat color matches nothing (and rounding leaves it a little variance)
+    flat = variance < 1e-4 * zero_mean.size
+    scores = numerator / np.where(flat, 1.0, np.sqrt(variance) * norm)
+    scores[flat] = 0.0
+    return np.clip(scores, -1.0, 1.0, out=scores)
+
+class Template:
+    """A template's pyramid: (zero-mean pixels, norm) per level, finest first."""
+    __slots__ = ('width', 'height', 'levels')
+
+    def __init__(self, pixels):
+        np = _numpy()
+        pixels = _gray(np, pixels)
+        self.height, self.width = pixels.shape
+        self.levels = []
+        factor = 1
+        while len(self.levels) <= MAX_LEVELS:
+            shrunk = _shrink(np, pixels, factor).astype(np.float64)
+            zero_mean = shrunk - shrunk.mean()
+            norm = float(np.sqrt(np.square(zero_mean).sum()))
+            if norm < 1e-6 * max(1.0, float(np.abs(shrunk).max())):
+                if factor == 1:
+                    raise RuntimeError("Error: the template image is a single flat color")
+                break
+            self.levels.append((zero_mean, norm))
+            factor *= 2
+            if min(self.height, self.width) // factor < MIN_SIDE:
+                break
+
+class TemplateCache:
+    """Templates prepared from files, least recently used first."""
+    def __init__(self, size=TEMPLATE_CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # (path, mtime_ns, size) -> Template
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        info = os.stat(path)
+        key = (os.path.abspath(path), info.st_mtime_ns, info.st_size)
+        with self._lock:
+            template = self._entries.get(key)
+            if template is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return template
+            self.misses += 1
+        template = Template(load_image(path))
+        with self._lock:
+            self._entries[key] = template
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return template
+
+templates = TemplateCache()
+
+def _peaks(np, scores, count, height, width):
+    """(row, column) of up to count highest scores, at least a template apart."""
+    scores = scores.copy()
+    found = []
+    for _ in range(count):
+        index = int(np.argmax(scores))
+        row, column = divmod(index, scores.shape[1])
+        if scores[row, column] == -np.inf:
+            break
+        found.append((row, column))
+        scores[max(0, row - height // 2):row + height // 2 + 1,
+               max(0, column - width // 2):column + width // 2 + 1] = -np.inf
+    return found
+
+def _refine(np, pixels, template, index, row, column):
+    """Best (score, row, column) at template.levels[index] near (row, column)."""
+    zero_mean, _ = level = template.levels[index]
+    factor = 1 << index
+    height, width = zero_mean.shape
+    rows = pixels.shape[0] // factor - height + 1
+    columns = pixels.shape[1] // factor - width + 1
+    top, bottom = max(0, row - RADIUS), min(rows - 1, row + RADIUS)
+    left, right = max(0, column - RADIUS), min(columns - 1, column + RADIUS)
+    region = pixels[top * factor:(bottom + height) * factor, left * factor:(right + width) * factor]
+    region = _shrink(np, region, factor).astype(np.float64)
+    # At most (2 * RADIUS + 1) ** 2 offsets: a strided product per offset
+    # beats copying every window out for one tensordot
+    numerator = np.empty((bottom - top + 1, right - left + 1))
+    for r in range(numerator.shape[0]):
+        for c in range(numerator.shape[1]):
+            numerator[r, c] = np.einsum('ij,ij->', region[r:r + height, c:c + width], zero_mean)
+    sums = _local_sums(np, region, height, width)
+    squares = _local_sums(np, np.square(region), height, width)
+    scores = _ncc(np, numerator, sums, squares, level)
+    best = int(np.argmax(scores))
+    r, c = divmod(best, scores.shape[1])
+    return float(scores[r, c]), top + r, left + c
+
+def match(pixels, template):
+    """Best Match of template (a Template) in pixels (a grayscale array)."""
+    np = _numpy()
+    if pixels.shape[0] < template.height or pixels.shape[1] < template.width:
+        raise RuntimeError("Error: the template is larger than the image")
+    coarsest = len(template.levels) - 1
+    zero_mean, _ = level = template.levels[coarsest]
+    height, width = zero_mean.shape
+    image = _shrink(np, pixels, 1 << coarsest).astype(np.float64)
+    # Correlation as a product of spectra; the valid part does not wrap around
+    spectrum = np.fft.rfft2(image) * np.fft.rfft2(zero_mean[::-1, ::-1], s=image.shape)
+    numerator = np.fft.irfft2(spectrum, s=image.shape)[height - 1:, width - 1:]
+    scores = _ncc(np, numerator, *_window_sums(np, image, height, width), level)
+
+    candidates = [(float(scores[row, column]), row, column)
+                  for row, column in _peaks(np, scores, CANDIDATES, height, width)]
+    for index in range(coarsest - 1, -1, -1):
+        candidates = [_refine(np, pixels, template, index, row * 2, column * 2) for _, row, column in candidates]
+        best = max(candidates)[0]
+        candidates = [candidate for candidate in candidates if candidate[0] >= best - MARGIN]
+    score, row, column = max(candidates)
+    return Match(column, row, template.width, template.height, score)
+
+def locate(template, image=None, threshold=THRESHOLD):
+    """Match of template in image, or None if its score is below threshold.
+
+    template: an image file path (prepared once, see TemplateCache) or pixels.
+    image: an image file path, pixels, or None for a screenshot.
+    """
+    template = templates.get(template) if isinstance(template, str) else Template(template)
+    if image is None:
+        pixels = screenshot()
+    elif isinstance(image, str):
+        pixels = load_image(image)
+    else:
+        pixels = _gray(_numpy(), image)
+    found = match(pixels, template)
+    return found if found.score >= threshold else None
+
+def find_image(template, image='', threshold=THRESHOLD):
+    """AutoAPI entry point: [center x, center y, score] of template, or None.
+
+    An empty image searches a screenshot.
+    """
+    found = locate(template, image or None, threshold)
+    if found is None:
+        return None
+    return [found.left + found.width // 2, found.top + found.height // 2, round(found.score, 4)]
@@ -0,0 +1,297 @@
+"""Tiered execution for PyExecutor: cold code is interpreted, hot loops compiled.
+
+PyExecutor walks the AST. That is the right trade for straight-line code,
+which runs once, but a loop pays the tree walker's dispatch on every
+iteration. So each LOOP node counts its back-edges in a LoopTier stored on
+the node (key 'tier'). Once a loop has run TIER_UP_ITERATIONS iterations,
+over all its executions, compile_loop() turns it into a Python function and
+the loop, from its next condition check on and every later time it runs,
+executes as that function.
+
+The generated code performs the tree walker's steps in the tree walker's
+order, with the dispatch resolved at compile time: each iteration and each
+taken `if` gets a fresh Scope and is charged to the governor, names are
+looked up through the scope chain, integer arithmetic takes the same fast
+path with the same overflow rule and everything else goes through
+py_executor.binary_op. Calls, imports, function definitions and nested
+blocks are handed back to the executor, so any loop can be promoted and
+results are identical to the tree walker's. Nested loops are compiled
+inline into the loop that contains them.
+
+Counters: every LoopTier records the time and iterations spent in each
+tier, from which stats() estimates the time compilation saved;
+PyExecutor.tier_stats() lists the loops a run promoted and `main.py
+--usage` prints them. $NOVOLANG_TIER_UP overrides the threshold; 0
+disables tiering. The C++ engine has no tiers: when it is present it
+runs the whole program natively, and the loops python/type_inference.py
+annotates on unboxed locals.
+"""
+import os
+import time
+
+TIER_UP_ITERATIONS = 1000
+
+def tier_up_threshold():
+    """Back-edges before a loop is compiled ($NOVOLANG_TIER_UP), 0 for never."""
+    value = os.environ.get('NOVOLANG_TIER_UP')
+    return TIER_UP_ITERATIONS if value is None else max(0, int(value))
+
+class LoopTier:
+    __slots__ = ('line', 'iterations', 'seconds', 'code', 'compiled_iterations', 'compiled_seconds')
+
+    def __init__(self, line):
+        self.line = line
+        self.iterations = 0           # back-edges taken by the tree walker
+        self.seconds = 0.0            # wall time of those iterations
+        self.code = None              # compiled loop, once promoted
+        self.compiled_iterations = 0
+        self.compiled_seconds = 0.0
+
+    def __reduce__(self):
+        # Generated code does not pickle; a copied AST starts cold again
+        return (LoopTier, (self.line,))
+
+    def promote(self, stmt):
+        self.code = compile_loop(stmt)
+
+    def run(self, executor):
+        """Run the loop from its condition check on as compiled code."""
+        started = time.perf_counter()
+        try:
+            self.code(executor, executor.governor, self)
+        finally:
+            self.compiled_seconds += time.perf_counter() - started
+
+    def stats(self):
+        interpreted = self.seconds / self.iterations if self.iterations else 0.0
+        compiled = self.compiled_seconds / self.compiled_iterations if self.compiled_iterations else 0.0
+        return {
+            'line': self.line,
+            'promoted_after': self.iterations,
+            'compiled_iterations': self.compiled_iterations,
+            'saved_seconds': max(0.0, (interpreted - compiled) * self.compiled_iterations),
+            'speedup': interpreted / compiled if compiled else 0.0,
+        }
+
+def format_tier_stats(stats):
+    """One line per promoted loop, as printed by `main.py --usage`."""
+    return '\n'.join(
+        f"Hot loop at line {s['line']}: compiled after {s['promoted_after']} iterations, "
+        f"{s['compiled_iterations']} compiled iterations, "
+        f"~{s['saved_seconds']:.3f} s saved ({s['speedup']:.1f}x)"
+        for s in stats
+    )
+
+def lookup(scope, name):
+    """Scope.get without the recursion."""
+    while scope is not None:
+        variables = scope.variables
+        if name in variables:
+            return variables[name]
+        scope = scope.parent
+    raise RuntimeError(f"Error: Variable '{name}' not defined")
+
+def assign(scope, name, value):
+    """PyExecutor.exec_assign: update the nearest definition, else define in scope."""
+    target = scope
+    while target is not None:
+        if name in target.variables:
+            target.variables[name] = value
+            return
+        target = target.parent
+    scope.variables[name] = value
+
+def body_statements(body):
+    """The statements a LOOP/IF body runs (a list, a BLOCK or one statement)."""
+    if isinstance(body, list):
+        return body
+    if body['type'] == 'BLOCK':
+        return body['statements']
+    return [body]
+
+_ARITHMETIC = ('+', '-', '*')
+_COMPARISONS = {'<': '<', '>': '>', '<=': '<=', '>=': '>=', '==': '==', '!=': '!=', '<>': '!='}
+
+class _LoopCompiler:
+    """Python source for one LOOP node; see compile_loop()."""
+
+    def __init__(self):
+        self.lines = []
+        self.constants = []   # values without a Python literal (strings, floats)
+        self.nodes = []       # nodes the generated code hands to the executor
+        self.temps = 0
+
+    def emit(self, depth, text):
+        self.lines.append('    ' * depth + text)
+
+    def temp(self, prefix='t'):
+        self.temps += 1
+        return f"{prefix}{self.temps}"
+
+    def node(self, node):
+        self.nodes.append(node)
+        return f"N[{len(self.nodes) - 1}]"
+
+    def constant(self, value):
+        if value is None or value.__class__ in (int, bool):
+            return repr(value)
+        self.constants.append(value)
+        return f"K[{len(self.constants) - 1}]"
+
+    def block(self, body, line, depth):
+        """PyExecutor.enter_scope + the body + restoring the scope."""
+        saved = self.temp('s')
+        steps = len(body) if isinstance(body, list) else 1
+        self.emit(depth, f"{saved} = ex.current_scope")
+        self.emit(depth, f"if gov is not None: gov.tick({steps}, {line!r}, {saved}, ex.frames)")
+        self.emit(depth, f"ex.current_scope = Scope({saved})")
+        for stmt in body_statements(body):
+            self.stmt(stmt, depth)
+        self.emit(depth, f"ex.current_scope = {saved}")
+
+    def loop(self, stmt, depth, counter=None):
+        self.emit(depth, "while True:")
+        cond = self.expr(stmt['condition'], depth + 1)
+        self.emit(depth + 1, f"if not {cond}: break")
+        self.block(stmt['body'], stmt.get('line', 0), depth + 1)
+        if counter:
+            self.emit(depth + 1, f"{counter} += 1")
+
+    def stmt(self, stmt, depth):
+        type_ = stmt['type']
+        if type_ == 'IF':
+            cond = self.expr(stmt['condition'], depth)
+            self.emit(depth, f"if {cond}:")
+            self.block(stmt['body'], stmt.get('line', 0), depth + 1)
+            if stmt.get('else_body'):
+                self.emit(depth, "else:")
+                self.block(stmt['else_body'], stmt.get('line', 0), depth + 1)
+        elif type_ == 'LOOP':
+            self.loop(stmt, depth)
+        elif type_ == 'PRINT':
+            self.emit(depth, f"print(to_display({self.expr(stmt['expr'], depth)}), file=ex.output)")
+        elif type_ == 'ASSIGNMENT':
+            value = self.expr(stmt['value'], depth)
+            self.emit(depth, f"assign(ex.current_scope, {stmt['target']!r}, {value})")
+        elif type_ == 'SLOT_ASSIGNMENT':
+            self.emit(depth, f"frame[{stmt['slot']}] = {self.expr(stmt['value'], depth)}")
+        elif type_ == 'AUTO_CALL':
+            args = [f"text_of({self.expr(arg, depth)})" for arg in stmt['args']]
+            self.emit(depth, f"ex.auto_api.execute({stmt['function']!r}, [{', '.join(args)}])")
+        elif type_ == 'RETURN':
+            value = 'None' if stmt['value'] is None else self.expr(stmt['value'], depth)
+            self.emit(depth, f"raise _Return({value})")
+        elif type_ == 'CALL_STMT':
+            self.emit(depth, f"ex.call({self.node(stmt)})")
+        elif type_ == 'INDEX_ASSIGNMENT':
+            target = self.temp()
+            if 'slot' in stmt:
+                self.emit(depth, f"{target} = frame[{stmt['slot']}]")
+            else:
+                scope = 'ex.global_scope' if stmt.get('global') else 'ex.current_scope'
+                self.emit(depth, f"{target} = lookup({scope}, {stmt['target']!r})")
+            message = f"Error: '{stmt['target']}' is not an array"
+            self.emit(depth, f"if not isinstance({target}, NLArray): raise RuntimeError({message!r})")
+            index = self.expr(stmt['index'], depth)
+            value = self.expr(stmt['value'], depth)
+            self.emit(depth, f"{target}.set({index}, {value})")
+        else:
+            # FUNCTION_DEF, IMPORT, BLOCK: rare inside loops
+            self.emit(depth, f"ex.exec_stmt({self.node(stmt)})")
+
+    def expr(self, expr, depth):
+        """Emit code computing expr; returns a local name or literal holding it."""
+        type_ = expr['type']
+        if type_ in ('NUMBER', 'STRING', 'BOOL'):
+            return self.constant(expr['value'])
+        if type_ == 'NULL':
+            return 'None'
+        if type_ == 'BINARY_OP':
+            return self.binary(expr, depth)
+        result = self.temp()
+        if type_ == 'SLOT':
+            self.emit(depth, f"{result} = frame[{expr['slot']}]")
+        elif type_ == 'IDENTIFIER':
+            self.emit(depth, f"{result} = lookup(ex.current_scope, {expr['name']!r})")
+        elif type_ == 'GLOBAL':
+            self.emit(depth, f"{result} = lookup(ex.global_scope, {expr['name']!r})")
+        elif type_ == 'CALL':
+            self.emit(depth, f"{result} = ex.call({self.node(expr)})")
+        elif type_ == 'INDEX':
+            target = self.expr(expr['target'], depth)
+            self.emit(depth, f"if not isinstance({target}, NLArray): "
+                             f"raise RuntimeError('Error: only arrays can be indexed')")
+            self.emit(depth, f"{result} = {target}.get({self.expr(expr['index'], depth)})")
+        elif type_ == 'ARRAY':
+            elements = [self.expr(e, depth) for e in expr['elements']]
+            self.emit(depth, f"{result} = NLArray.from_list([{', '.join(elements)}])")
+        elif type_ == 'LEN':
+            value = self.expr(expr['expr'], depth)
+            self.emit(depth, f"if not isinstance({value}, (NLArray, str, Rope)): "
+                             f"raise RuntimeError('Error: len() expects an array or a string')")
+            self.emit(depth, f"{result} = len({value})")
+        else:
+            self.emit(depth, f"{result} = ex.eval_expr({self.node(expr)})")
+        return result
+
+    def binary(self, expr, depth):
+        left = self.expr(expr['left'], depth)
+        right = self.expr(expr['right'], depth)
+        op = expr['op']
+        result = self.temp()
+        general = f"{result} = binary_op({op!r}, {left}, {right})"
+        if op not in _ARITHMETIC and op not in _COMPARISONS:
+            self.emit(depth, general)
+            return result
+        # PyExecutor's integer fast path, minus the checks literals make moot
+        checks = [f"{atom}.__class__ is int" for atom in (left, right) if not _is_int_literal(atom)]
+        if checks:
+            self.emit(depth, f"if {' and '.join(checks)}:")
+        inner = depth + 1 if checks else depth
+        if op in _ARITHMETIC:
+            self.emit(inner, f"{result} = {left} {op} {right}")
+            self.emit(inner, f"if not INT_MIN <= {result} <= INT_MAX: {result} = float({result})")
+        else:
+            self.emit(inner, f"{result} = {left} {_COMPARISONS[op]} {right}")
+        if checks:
+            self.emit(depth, "else:")
+            self.emit(depth + 1, general)
+        return result
+
+def _is_int_literal(atom):
+    return atom.lstrip('-').isdigit()
+
+def compile_loop(stmt):
+    """Compile a LOOP node into a function f(executor, governor, tier).
+
+    f runs the loop from its condition check to the end on the executor's
+    current state, adding the iterations it runs to tier.compiled_iterations.
+    """
+    try:
+        from .py_executor import Scope, _Return, binary_op
+        from .numeric import INT_MAX, INT_MIN, to_display
+        from .nl_array import NLArray
+        from .rope import Rope, text_of
+    except ImportError:
+        from py_executor import Scope, _Return, binary_op
+        from numeric import INT_MAX, INT_MIN, to_display
+        from nl_array import NLArray
+        from rope import Rope, text_of
+
+    compiler = _LoopCompiler()
+    compiler.emit(0, "def loop(ex, gov, tier):")
+    compiler.emit(1, "frame = ex.frame")
+    compiler.emit(1, "n = 0")
+    compiler.emit(1, "try:")
+    compiler.loop(stmt, 2, counter='n')
+    compiler.emit(1, "finally:")
+    compiler.emit(2, "tier.compiled_iterations += n")
+    namespace = {
+        'Scope': Scope, '_Return': _Return, 'binary_op': binary_op, 'NLArray': NLArray,
+        'Rope': Rope, 'text_of': text_of, 'to_display': to_display,
+        'INT_MIN': INT_MIN, 'INT_MAX': INT_MAX, 'lookup': lookup, 'assign': assign,
+        'K': compiler.constants, 'N': compiler.nodes,
+    }
+    source = '\n'.join(compiler.lines) + '\n'
+    exec(compile(source, f"<loop at line {stmt.get('line', 0)}>", 'exec'), namespace)
+    return namespace['loop']
@@ -0,0 +1,200 @@
+"""Static type inference: which variables a loop can keep unboxed.
+
+    定义 total = 0.0
+    循环 (i = 0; i < 1000000; i = i + 1) {   // i is always long,
+        total = total + i * 0.5              // total always double
+    }
+
+novolang_core runs infer() on each file it executes or imports, once per
+AST and only when typed loops can run. Each namespace (a file's top level,
+and each function's slots) is solved on its own, flow-insensitively: a variable's kind is the join of the kinds of every
+value assigned to it anywhere in the namespace.
+
+  long    integer literals; + - * of longs and booleans; len()
+  double  float literals; + - * with a double operand
+  number  long or double, not known which: division (long only when
+          exact), and a name assigned both
+  bool    true and false; comparisons of numbers, or of two strings
+  string  string literals; + with a string operand
+
+Anything else is unproven: parameters, calls, indexing, arrays, null,
+names the file reads but never assigns (an import's, say) and names
+assigned values of different kinds otherwise. Every LOOP
+gets 'types': {name: kind} for the proven variables it uses (GLOBAL reads in
+a function take the top level's kinds).
+
+novolang_core runs annotated loops on unboxed native locals (see
+c++/include/typed_loop.h); the Python engine never needs the key. The proof
+holds for the file as parsed, while imports, set_global_variables() and the
+REPL can bind a name to anything. A long can also overflow into a double.
+So the C++ engine checks each variable's kind when a loop starts, re-checks
+the loop's own assignments when it compiles it, and falls back to boxed
+execution where either disagrees. Statements run by execute_stream() arrive
+one at a time and are not annotated.
+"""
+
+LONG = 'long'
+DOUBLE = 'double'
+NUMBER = 'number'
+BOOL = 'bool'
+STRING = 'string'
+PROVEN = (LONG, DOUBLE, NUMBER, BOOL, STRING)
+
+_MIXED = 'mixed'
+_NUMERIC = (LONG, DOUBLE, BOOL, NUMBER)
+_COMPARISONS = ('<', '>', '<=', '>=', '==', '!=', '<>')
+_EQUALITY = ('==', '!=', '<>')
+
+def infer(ast):
+    """Annotate every LOOP in ast (a BLOCK) with the kinds of its variables; returns ast."""
+    statements = ast.get('statements', [])
+    top = _solve(_collect(statements, 'ASSIGNMENT', 'IDENTIFIER'), (), {})
+    _annotate(statements, top)
+    for func in _functions(statements):
+        kinds = _solve(_collect(func['body'], 'SLOT_ASSIGNMENT', 'SLOT'), func['params'], top)
+        _annotate(func['body'], kinds, top)
+    ast['inferred'] = True
+    return ast
+
+def _functions(node, found=None):
+    """FUNCTION_DEF nodes under node (functions may be defined in top-level blocks)."""
+    found = [] if found is None else found
+    if isinstance(node, list):
+        for item in node:
+            _functions(item, found)
+    elif isinstance(node, dict):
+        if node.get('type') == 'FUNCTION_DEF':
+            found.append(node)
+            return found
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                _functions(value, found)
+    return found
+
+def _collect(node, assign_type, read_type, found=None):
+    """([(target, value node)], names read) in node, not looking into function bodies."""
+    if found is None:
+        found = ([], set())
+    if isinstance(node, list):
+        for item in node:
+            _collect(item, assign_type, read_type, found)
+    elif isinstance(node, dict):
+        type_ = node.get('type')
+        if type_ == 'FUNCTION_DEF':
+            return found
+        if type_ == assign_type:
+            found[0].append((node['target'], node['value']))
+        elif type_ == read_type:
+            found[1].add(node['name'])
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                _collect(value, assign_type, read_type, found)
+    return found
+
+def _solve(found, params, outer):
+    """{name: kind} of a namespace's variables, the least fixpoint over its assignments."""
+    assignments, reads = found
+    assigned = {target for target, _ in assignments}
+    kinds = {name: _MIXED for name in reads if name not in assigned}
+    kinds.update((name, _MIXED) for name in params)
+    changed = True
+    while changed:
+        changed = False
+        for target, value in assignments:
+            old = kinds.get(target)
+            new = _join(old, _kind(value, kinds, outer))
+            if new != old:
+                kinds[target] = new
+                changed = True
+    # Assigned only values that read themselves (x = x + 1): never proven
+    kinds.update((name, _MIXED) for name in assigned if kinds.get(name) is None)
+    return kinds
+
+def _join(a, b):
+    if a is None or a == b:
+        return b
+    if b is None:
+        return a
+    if a in _NUMERIC and b in _NUMERIC and BOOL not in (a, b):
+        return NUMBER
+    return _MIXED
+
+def _kind(node, kinds, outer):
+    """Kind of an expression's value; None while the variables it reads are unsolved."""
+    type_ = node.get('type')
+    if type_ == 'NUMBER':
+        return LONG if isinstance(node['value'], int) else DOUBLE
+    if type_ == 'STRING':
+        return STRING
+    if type_ == 'BOOL':
+        return BOOL
+    if type_ in ('IDENTIFIER', 'SLOT'):
+        return kinds.get(node['name'])
+    if type_ == 'GLOBAL':
+        return outer.get(node['name'], _MIXED)
+    if type_ == 'LEN':
+        return LONG
+    if type_ == 'BINARY_OP':
+        left = _kind(node['left'], kinds, outer)
+        right = _kind(node['right'], kinds, outer)
+        if left is None or right is None:
+            return None
+        return _binary(node['op'], left, right)
+    return _MIXED
+
+def _binary(op, left, right):
+    numeric = left in _NUMERIC and right in _NUMERIC
+    if op == '+' and STRING in (left, right):
+        return STRING
+    if op in _COMPARISONS:
+        if numeric or left == right == STRING:
+            return BOOL
+        if op in _EQUALITY and _MIXED not in (left, right):
+            return BOOL
+        return _MIXED
+    if not numeric:
+        return _MIXED
+    if op == '/':
+        return NUMBER
+    if DOUBLE in (left, right):
+        return DOUBLE
+    if NUMBER in (left, right):
+        return NUMBER
+    return LONG
+
+def _annotate(node, kinds, outer=None):
+    """Set 'types' on every LOOP under node, not looking into function bodies."""
+    if isinstance(node, list):
+        for item in node:
+            _annotate(item, kinds, outer)
+        return
+    if not isinstance(node, dict) or node.get('type') == 'FUNCTION_DEF':
+        return
+    if node.get('type') == 'LOOP':
+        names = set()
+        _names(node, names)
+        types = {}
+        for name in names:
+            kind = kinds.get(name)
+            if kind is None and outer is not None:
+                kind = outer.get(name)   # a GLOBAL read inside a function
+            if kind in PROVEN:
+                types[name] = kind
+        node['types'] = types
+    for value in node.values():
+        if isinstance(value, (dict, list)):
+            _annotate(value, kinds, outer)
+
+def _names(node, names):
+    if isinstance(node, list):
+        for item in node:
+            _names(item, names)
+    elif isinstance(node, dict):
+        type_ = node.get('type')
+        if type_ in ('IDENTIFIER', 'SLOT', 'GLOBAL'):
+            names.add(node['name'])
+        elif type_ in ('ASSIGNMENT', 'SLOT_ASSIGNMENT'):
+            names.add(node['target'])
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                _names(value, names)
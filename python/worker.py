@@ -0,0 +1,252 @@
+"""Out-of-process script runs for the IDE.
+
+The IDE runs every script in a worker subprocess (`editor.py --nl-worker`)
+instead of a thread of its own, so an endless `循环` cannot freeze the GUI,
+a CPU-heavy script does not compete with Tk for the GIL, and Stop simply
+kills the worker. Workers speak daemon.py's frame format over their
+stdin/stdout pipes:
+
+  R  IDE -> worker  JSON run request {"code", "name", "path", "profile", "ast", "debug"}
+  A  IDE -> worker  pickled AST of code, sent right after R when "ast" is true
+  O  worker -> IDE  script output (stdout and stderr of both engines)
+  P  worker -> IDE  JSON debugger pause {"line", "reason", "stack", "scopes"}
+  C  IDE -> worker  JSON answer to a P frame {"command", "breakpoints"}
+  X  worker -> IDE  exit status; the worker then waits for the next R
+
+"debug" is null for a plain run, or the breakpoint lines of a debug run
+(debugger.py). The script then stops at each breakpoint, or at its first
+statement if there are none, and waits for the IDE's command.
+
+A worker that finishes a run goes back to the WorkerPool and serves the
+next one with its engines (and module cache) already loaded. Each run
+holds its own worker, so several tabs can run at once.
+
+The editor parses each buffer in the background as it is edited (for live
+diagnostics); when that parse is of the exact code being run, the IDE
+passes its AST along and the worker skips lexing and parsing.
+"""
+import json
+import os
+import pickle
+import subprocess
+import sys
+import threading
+try:
+    from .daemon import (FRAME_AST, FRAME_COMMAND, FRAME_EXIT, FRAME_OUTPUT, FRAME_PAUSE, FRAME_REQUEST,
+                         decode_status, encode_status, read_frame, run_captured, warm_up, write_frame)
+except ImportError:
+    from daemon import (FRAME_AST, FRAME_COMMAND, FRAME_EXIT, FRAME_OUTPUT, FRAME_PAUSE, FRAME_REQUEST,
+                        decode_status, encode_status, read_frame, run_captured, warm_up, write_frame)
+
+WORKER_FLAG = '--nl-worker'
+# Workers kept warm between runs
+MAX_IDLE_WORKERS = 2
+
+def run_request(request, ast=None, front_end=None):
+    """Execute one IDE run request, printing as the IDE console expects.
+
+    ast is the pickled AST of request['code'] if the IDE already parsed it;
+    otherwise the code is lexed and parsed here. front_end is the debugger
+    front end (debugger.Session) for a request with "debug" set.
+    """
+    from lexer import NovoSyntaxError, tokenize
+    from parser import Parser
+    from py_executor import PyExecutor
+    try:
+        import novolang_core
+    except ImportError:
+        novolang_core = None
+
+    code = request['code']
+    name = request.get('name') or 'untitled'
+    try:
+        if ast is not None:
+            ast = pickle.loads(ast)
+        else:
+            ast = Parser(tokenize(code)).parse()
+        if request.get('path'):
+            # Imports are resolved relative to the open file
+            ast['file'] = os.path.abspath(request['path'])
+
+        profile = request.get('profile')
+        breakpoints = request.get('debug') if front_end else None
+        if novolang_core:
+            print("Compiling with C++ Engine...")
+            executor = novolang_core.ASTExecutor()
+            executor.raise_errors = True
+            if profile:
+                executor.enable_profiling()
+        else:
+            print("Compiling with Python Engine (Legacy)...")
+            if profile:
+                from profiler import Profile, ProfilingExecutor
+                executor = ProfilingExecutor(Profile(name, code))
+            elif breakpoints is not None:
+                from debugger import DebuggingExecutor
+                executor = DebuggingExecutor()
+            else:
+                executor = PyExecutor()
+        if breakpoints is not None:
+            from debugger import Session
+            Session(executor, front_end, breakpoints)
+        executor.execute(ast)
+
+        if profile:
+            from profiler import Profile
+            if novolang_core:
+                result = Profile.from_native(executor.profile_data(), name, code)
+            else:
+                result = executor.profile
+            print("\n" + result.report())
+    except NovoSyntaxError as e:
+        print(e)
+        return 1
+    except Exception as e:
+        print(f"\n[Error] {e}")
+        return 1
+    return 0
+
+def relay_pauses(channel_in, channel_out):
+    """Debugger front end that sends each pause to the IDE and waits for its command."""
+    from debugger import format_value
+
+    def front_end(session, pause):
+        sys.stdout.flush()
+        scopes = [(label, {name: format_value(value) for name, value in variables.items()})
+                  for label, variables in pause.scopes]
+        message = {'line': pause.line, 'reason': pause.reason, 'stack': pause.stack, 'scopes': scopes}
+        write_frame(channel_out, FRAME_PAUSE, json.dumps(message).encode('utf-8'))
+        kind, payload = read_frame(channel_in)
+        if kind != FRAME_COMMAND:
+            return 'quit'
+        answer = json.loads(payload.decode('utf-8'))
+        if answer.get('breakpoints') is not None:
+            session.breakpoints = set(answer['breakpoints'])
+        return answer['command']
+    return front_end
+
+def main():
+    """Worker process: serve run requests from stdin until it closes."""
+    channel_in = sys.stdin.buffer
+    channel_out = os.fdopen(os.dup(1), 'wb')
+    # Anything printed between runs goes to stderr, never into the frames
+    os.dup2(2, 1)
+    sys.stdout.reconfigure(line_buffering=True)
+    warm_up(['lexer', 'parser', 'py_executor', 'novolang_core'])
+
+    while True:
+        kind, payload = read_frame(channel_in)
+        if kind != FRAME_REQUEST:
+            return 0
+        request = json.loads(payload.decode('utf-8'))
+        ast = None
+        if request.get('ast'):
+            kind, ast = read_frame(channel_in)
+            if kind != FRAME_AST:
+                return 0
+        front_end = relay_pauses(channel_in, channel_out)
+        status = run_captured(lambda: run_request(request, ast, front_end),
+                              lambda data: write_frame(channel_out, FRAME_OUTPUT, data))
+        write_frame(channel_out, FRAME_EXIT, encode_status(status))
+
+class Worker:
+    """A worker process; runs one request at a time."""
+
+    def __init__(self, command):
+        self.process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+        # Set by kill(): the process may still poll as alive for a moment
+        self.killed = False
+
+    def run(self, request, sink, ast=None, on_pause=None):
+        """Run request, passing output bytes to sink as they arrive.
+
+        ast, if given, is the pickled AST of request['code'] to run as is.
+        on_pause(pause) is called with each debugger pause (a dict, see
+        above) and returns the answer, {"command", "breakpoints"}; without
+        it a debug run just continues.
+        Returns the script's exit status, or None if the worker died first
+        (killed by Stop, or crashed).
+        """
+        try:
+            request = dict(request, ast=ast is not None)
+            write_frame(self.process.stdin, FRAME_REQUEST, json.dumps(request).encode('utf-8'))
+            if ast is not None:
+                write_frame(self.process.stdin, FRAME_AST, ast)
+            while True:
+                kind, payload = read_frame(self.process.stdout)
+                if kind == FRAME_OUTPUT:
+                    sink(payload)
+                elif kind == FRAME_PAUSE:
+                    pause = json.loads(payload.decode('utf-8'))
+                    answer = on_pause(pause) if on_pause else {'command': 'continue'}
+                    write_frame(self.process.stdin, FRAME_COMMAND, json.dumps(answer).encode('utf-8'))
+                elif kind == FRAME_EXIT:
+                    return decode_status(payload)
+                else:
+                    return None
+        except (OSError, ValueError):
+            # Pipe broken or closed under us by kill()
+            return None
+
+    def alive(self):
+        return not self.killed and self.process.poll() is None
+
+    def kill(self):
+        """Stop the worker immediately, whatever it is running. Any thread."""
+        if self.alive():
+            self.killed = True
+            self.process.kill()
+
+    def close(self):
+        """Let an idle worker exit, killing it if it does not."""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.process.stdout.close()
+
+class WorkerPool:
+    """Workers for IDE runs: a run takes an idle worker or starts a new one."""
+
+    def __init__(self, command, max_idle=MAX_IDLE_WORKERS):
+        self.command = command
+        self.max_idle = max_idle
+        self.idle = []
+        self.lock = threading.Lock()
+
+    def warm(self):
+        """Start an idle worker ahead of the first run."""
+        with self.lock:
+            if self.idle:
+                return
+        self.release(Worker(self.command))
+
+    def acquire(self):
+        with self.lock:
+            while self.idle:
+                worker = self.idle.pop()
+                if worker.alive():
+                    return worker
+        return Worker(self.command)
+
+    def release(self, worker):
+        """Return a worker after a completed run; dead or surplus ones are closed."""
+        if worker.alive():
+            with self.lock:
+                if len(self.idle) < self.max_idle:
+                    self.idle.append(worker)
+                    return
+        worker.close()
+
+    def shutdown(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for worker in idle:
+            worker.close()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,17 +2,23 @@ from setuptools import setup, Extension
 import pybind11
 import sys
 
-cpp_args = ['-std=c++11']
+cpp_args = ['-std=c++17', '-fvisibility=hidden'] # std::variant in scope.h; hidden as pybind11 recommends
 if sys.platform == 'win32':
-    cpp_args = ['/std:c++14'] # MSVC flag
+    cpp_args = ['/std:c++17'] # MSVC flag
 
 ext_modules = [
     Extension(
         'novolang_core',
         sources=[
             'c++/src/scope.cpp',
+            'c++/src/numeric.cpp',
+            'c++/src/array.cpp',
+            'c++/src/functions.cpp',
             'c++/src/ast_exec.cpp',
+            'c++/src/typed_loop.cpp',
             'c++/src/io.cpp',
+            'c++/src/profiler.cpp',
+            'c++/src/governor.cpp',
             'c++/src/py_bind.cpp',
         ],
         include_dirs=[